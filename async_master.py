@@ -0,0 +1,294 @@
+import time
+import copy
+import random
+import struct
+import asyncio
+
+from .modbus_poll import AREA_FC, AREAS, ModbusReadError
+from .read_planner import TagReadGroup
+
+MBAP = struct.Struct(">HHHB")  # 트랜잭션 ID, 프로토콜 ID(0), 길이, 국번
+
+
+class AsyncModbusTcpMaster:
+    """
+    asyncio 기반 Modbus TCP 마스터.
+    트랜잭션 ID로 응답을 매칭하므로 한 연결에서 여러 요청을 동시에 보낼 수 있습니다 (최대 depth개).
+    요청마다 timeout을 적용하며, 연결이 끊기면 다음 요청 시 다시 연결합니다.
+    ManagedConnection과 같이 연결 실패 시 지수 백오프 + 지터 간격으로 재시도하고 (그동안 요청은 대기),
+    응답 없음이 max_silent회 연속되면 반쯤 끊긴 연결로 보고 다시 연결합니다.
+    on_state(master, msg)로 상태 변화를 알리고 health()는 ManagedConnection.health()와 같은 형식입니다.
+    """
+    def __init__(self, host, port=502, depth=4, timeout=1.0, base_delay=0.5, max_delay=30.0, jitter=0.3,
+                 max_silent=3, on_state=None):
+        self.host = host
+        self.port = port
+        self.name = f"TCP:{host}:{port}"
+        self.depth = max(1, int(depth))
+        self.timeout = timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.max_silent = max_silent
+        self.on_state = on_state
+        self.reader = None
+        self.writer = None
+        self.rx_task = None
+        self.pending = {}  # tid -> Future
+        self.tid = 0
+        self.slots = None
+        self.connect_lock = None
+        self.closing = False
+        self.attempt = 0      # 연속 연결 실패 횟수
+        self.next_try = 0.0
+        self.silent = 0       # 연속 응답 없음 횟수
+        # 상태 지표
+        self.connects = 0
+        self.connect_failures = 0
+        self.drops = 0
+        self.last_error = ""
+        self.up_since = None
+        self.down_time = 0.0
+        self.down_since = time.monotonic()
+
+    @property
+    def connected(self):
+        return self.up_since is not None and self.rx_task is not None and not self.rx_task.done()
+
+    def _notify(self, msg):
+        if self.on_state: self.on_state(self, msg)
+
+    async def connect(self):
+        """ 연결될 때까지 백오프하며 재시도 (다른 요청들은 connect_lock에서 기다림) """
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.depth)
+            self.connect_lock = asyncio.Lock()
+        async with self.connect_lock:
+            while not self.connected:
+                delay = self.next_try - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
+                if self.rx_task is not None and not self.rx_task.done():
+                    self.rx_task.cancel()  # 이전 연결의 수신 태스크가 정리를 마칠 때까지 기다림
+                    await asyncio.gather(self.rx_task, return_exceptions=True)
+                try:
+                    self.reader, self.writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+                except (OSError, asyncio.TimeoutError) as e:
+                    self.last_error = str(e) or "연결 시간 초과"
+                    self.connect_failures += 1
+                    self.attempt += 1
+                    wait = min(self.max_delay, self.base_delay * 2 ** (self.attempt - 1))
+                    wait *= 1 + random.uniform(-self.jitter, self.jitter)  # 여러 장치가 동시에 재접속하지 않도록 분산
+                    self.next_try = time.monotonic() + wait
+                    self._notify(f"연결 실패 ({self.last_error}), {wait:.1f}초 후 재시도 [{self.attempt}회째]")
+                    continue
+                now = time.monotonic()
+                self.down_time += now - self.down_since
+                self.up_since, self.attempt, self.silent = now, 0, 0
+                self.connects += 1
+                self.rx_task = asyncio.get_running_loop().create_task(self._rx_loop())
+                self._notify("연결됨" if self.connects == 1 else f"재연결됨 (누적 끊김 {self.drops}회)")
+
+    def mark_down(self, err):
+        """ 연결 끊김 기록 후 소켓을 닫음 (대기 중인 요청은 ConnectionError) """
+        if self.up_since is None: return
+        self.up_since = None
+        self.drops += 1
+        self.last_error = str(err)
+        self.down_since = time.monotonic()
+        self.next_try = 0.0  # 첫 재시도는 바로
+        if self.rx_task and self.rx_task is not asyncio.current_task(): self.rx_task.cancel()
+        self._notify(f"연결 끊김: {err}")
+
+    def health(self):
+        now = time.monotonic()
+        connected = self.up_since is not None
+        down = self.down_time + (0 if connected else now - self.down_since)
+        return {
+            "name": self.name, "connected": connected, "connects": self.connects,
+            "connect_failures": self.connect_failures, "drops": self.drops, "last_error": self.last_error,
+            "uptime": round(now - self.up_since, 1) if connected else 0.0, "downtime": round(down, 1),
+        }
+
+    async def close(self):
+        self.closing = True
+        if self.up_since is not None: self.up_since, self.down_since = None, time.monotonic()
+        if self.rx_task: self.rx_task.cancel()
+        if self.writer:
+            self.writer.close()
+            try: await self.writer.wait_closed()
+            except OSError: pass
+
+    async def _rx_loop(self):
+        reason = "상대가 연결을 닫음"
+        try:
+            while True:
+                tid, pid, length, _ = MBAP.unpack(await self.reader.readexactly(MBAP.size))
+                if pid != 0 or not 2 <= length <= 254:  # Modbus 프레임이 아니면 연결을 끊고 다시 연결
+                    reason = f"잘못된 MBAP 헤더 (프로토콜 {pid}, 길이 {length})"
+                    break
+                pdu = await self.reader.readexactly(length - 1)
+                self.silent = 0
+                fut = self.pending.pop(tid, None)
+                if fut and not fut.done(): fut.set_result(pdu)  # 시간 초과로 포기한 요청의 응답은 버림
+        except (asyncio.IncompleteReadError, OSError) as e:
+            if isinstance(e, OSError): reason = str(e)
+        finally:
+            if not self.closing: self.mark_down(reason)
+            for fut in self.pending.values():
+                if not fut.done(): fut.set_exception(ConnectionError(f"{self.host}:{self.port} 연결 끊김"))
+            self.pending.clear()
+            self.writer.close()
+
+    def _next_tid(self):
+        while True:
+            self.tid = self.tid % 0xFFFF + 1
+            if self.tid not in self.pending: return self.tid
+
+    async def read(self, area, address, count, unit):
+        if not self.connected: await self.connect()
+        fc = AREA_FC[area]
+        async with self.slots:
+            if not self.connected: raise ConnectionError(f"{self.host}:{self.port} 연결 끊김")
+            tid = self._next_tid()
+            fut = asyncio.get_running_loop().create_future()
+            self.pending[tid] = fut
+            pdu = struct.pack(">BHH", fc, address, count)
+            self.writer.write(MBAP.pack(tid, 0, len(pdu) + 1, unit) + pdu)
+            try:
+                resp = await asyncio.wait_for(fut, self.timeout)
+            except asyncio.TimeoutError:
+                self.silent += 1
+                if self.silent >= self.max_silent: self.mark_down(f"응답 없음 {self.silent}회 연속 (half-open 의심)")
+                raise
+            finally:
+                self.pending.pop(tid, None)
+        if resp[0] == fc | 0x80 and len(resp) >= 2:
+            raise ModbusReadError(f"예외 응답 (FC{fc:02d}, 코드 {resp[1]})", code=resp[1])
+        # 기능 코드 / 바이트 수가 요청과 맞지 않는 응답은 값으로 쓰지 않음
+        expected = (count + 7) // 8 if AREAS[area][2] else 2 * count
+        if resp[0] != fc or len(resp) < 2 or resp[1] != expected or len(resp) - 2 != expected:
+            raise ModbusReadError(f"잘못된 응답 (FC{fc:02d} {count}개 요청, 응답 FC{resp[0]:02d} {len(resp) - 2}바이트)")
+        data = resp[2:]
+        if AREAS[area][2]:
+            return [bool(data[i >> 3] >> (i & 7) & 1) for i in range(count)]
+        return list(struct.unpack(f">{count}H", data))
+
+
+async def read_group(master, group):
+    """ 폴링 그룹 하나 읽기. 태그 그룹은 병합된 요청들을 동시에(파이프라인) 보냅니다. """
+    if not isinstance(group, TagReadGroup):
+        return await master.read(group.area, group.address, group.count, group.unit)
+    values = {}
+    todo = list(group.spans)
+    while todo:
+        results = await asyncio.gather(*(master.read(group.area, s, c, group.unit) for s, c in todo), return_exceptions=True)
+        retry = []
+        for span, r in zip(todo, results):
+            if isinstance(r, ModbusReadError):
+                parts = group.reject(span, r)
+                if not parts: raise r
+                retry += parts
+            elif isinstance(r, BaseException):
+                raise r
+            else:
+                group.collect(span, r, values)
+        todo = retry
+    return [values[a] for a in group.addresses]
+
+
+class AsyncPollRunner:
+    """
+    여러 PLC의 폴링 그룹을 하나의 이벤트 루프에서 실행합니다. (장치마다 스레드를 만들지 않음)
+    endpoints: [(host, port, groups), ...] - 그룹마다 독립 태스크로 주기 실행되므로
+    같은 연결의 그룹들은 파이프라인으로 동시에 요청됩니다. 콜백은 PollScheduler와 같습니다.
+    run()은 블로킹이므로 별도 스레드에서 호출해야 합니다.
+    """
+    def __init__(self, endpoints, on_result, on_error=None, on_overrun=None, depth=4, timeout=1.0, on_state=None):
+        self.endpoints = endpoints
+        self.on_result = on_result
+        self.on_error = on_error
+        self.on_overrun = on_overrun
+        self.on_state = on_state
+        self.depth = depth
+        self.timeout = timeout
+        self.masters = []
+        self.is_running = False
+        self.loop = None
+        self._stop = None
+
+    @property
+    def groups(self):
+        return [g for _, _, groups in self.endpoints for g in groups]
+
+    @staticmethod
+    def expand(hosts, port, groups):
+        """ 같은 그룹 구성을 여러 장치에 적용 (장치별로 그룹 복사, 이름에 호스트 표시) """
+        endpoints = []
+        for host in hosts:
+            copies = []
+            for g in groups:
+                c = copy.deepcopy(g)
+                if len(hosts) > 1: c.name = f"{host} {g.name}"
+                copies.append(c)
+            endpoints.append((host, port, copies))
+        return endpoints
+
+    def health(self):
+        """ 장치별 연결 상태 (ManagedConnection.health() 형식) """
+        return [m.health() for m in list(self.masters)]
+
+    def stop(self):
+        self.is_running = False
+        if self.loop and self._stop:
+            self.loop.call_soon_threadsafe(self._stop.set)
+
+    def run(self):
+        self.is_running = True
+        asyncio.run(self._main())
+
+    async def _main(self):
+        self.loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        if not self.is_running: return
+        self.masters = [AsyncModbusTcpMaster(host, port, self.depth, self.timeout, on_state=self.on_state)
+                        for host, port, _ in self.endpoints]
+        tasks = [self.loop.create_task(self._group_loop(m, g))
+                 for m, (_, _, groups) in zip(self.masters, self.endpoints) for g in groups]
+        try:
+            await self._stop.wait()
+        finally:
+            for t in tasks: t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for m in self.masters: await m.close()
+
+    async def _group_loop(self, master, group):
+        loop = self.loop
+        origin = loop.time()
+        k = 0
+        while self.is_running:
+            t0 = loop.time()
+            group.last_lateness = t0 - (origin + k * group.period)
+            try:
+                values = await read_group(master, group)
+                group.polls += 1
+                group.last_latency = loop.time() - t0
+                self.on_result(group, values, time.time())
+            except Exception as e:  # 응답 하나가 잘못돼도 그룹 태스크는 계속 폴링
+                group.errors += 1
+                group.last_latency = loop.time() - t0
+                if self.on_error: self.on_error(group, e)  # 예외 객체 그대로 (계측에서 종류 구분)
+
+            k += 1
+            elapsed = loop.time() - origin
+            if k * group.period <= elapsed:
+                late_k = int(elapsed // group.period) + 1
+                group.overruns += 1
+                if self.on_overrun: self.on_overrun(group, late_k - k)
+                k = late_k
+            delay = origin + k * group.period - loop.time()
+            try:
+                await asyncio.wait_for(self._stop.wait(), max(0, delay))
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,238 @@
+import sys
+import time
+import struct
+import asyncio
+from array import array
+from collections import Counter
+
+from .async_master import MBAP
+from .poll_metrics import LatencyHistogram
+
+READ_FC = {1: "co", 2: "di", 3: "hr", 4: "ir"}
+MAX_COUNT = {1: 2000, 2: 2000, 3: 125, 4: 125, 15: 1968, 16: 123}
+REQ = struct.Struct(">BHH")  # 기능 코드, 주소, 개수(또는 값)
+
+
+class ModbusError(Exception):
+    """ 예외 응답 코드 (01 기능 코드, 02 주소, 03 값, 0B 국번 없음) """
+    def __init__(self, code):
+        super().__init__(code)
+        self.code = code
+
+
+def _regs_to_bytes(values):
+    a = array("H", values)
+    if sys.byteorder == "little": a.byteswap()
+    return a.tobytes()
+
+
+def _bytes_to_regs(data):
+    a = array("H", data)
+    if sys.byteorder == "little": a.byteswap()
+    return a
+
+
+def _pack_bits(bits):
+    out = bytearray((len(bits) + 7) // 8)
+    for i, b in enumerate(bits):
+        if b: out[i >> 3] |= 1 << (i & 7)
+    return bytes(out)
+
+
+def _unpack_bits(data, count):
+    return [bool(data[i >> 3] >> (i & 7) & 1) for i in range(count)]
+
+
+class ClientStats:
+    """ 연결 하나의 계측 (요청/예외 수, 송수신 바이트, 처리 시간 히스토그램) """
+    def __init__(self, peer):
+        self.peer = peer
+        self.connected = time.time()
+        self.last = time.monotonic()
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.errors = 0
+        self.rx = 0
+        self.tx = 0
+        self.latency = LatencyHistogram(highest=1.0)
+
+    def snapshot(self):
+        lat = self.latency.snapshot()
+        return {"peer": self.peer, "connected": round(time.time() - self.connected, 1), "requests": self.requests,
+                "errors": self.errors, "rx": self.rx, "tx": self.tx, "p50": lat["p50"], "p99": lat["p99"], "max": lat["max"]}
+
+
+def handle_pdu(datastore, unit, pdu):
+    """ 요청 PDU -> 응답 PDU (SlaveDatastore에서 바로 읽고 씀). FC 1~6, 15, 16 """
+    fc = pdu[0]
+    areas = datastore.units.get(unit)
+    try:
+        if areas is None: raise ModbusError(0x0B)
+        if fc not in (1, 2, 3, 4, 5, 6, 15, 16): raise ModbusError(0x01)
+        if len(pdu) < REQ.size: raise ModbusError(0x03)
+        _, address, count = REQ.unpack_from(pdu)
+        if fc in READ_FC:
+            if not 1 <= count <= MAX_COUNT[fc]: raise ModbusError(0x03)
+            area = areas[READ_FC[fc]]
+            if area.find(address, count) is None: raise ModbusError(0x02)
+            with datastore.lock:
+                values = area.get(address, count)
+            data = _pack_bits(values) if fc <= 2 else _regs_to_bytes(values)
+            return bytes((fc, len(data))) + data
+        if fc in (5, 6):
+            area = areas["co" if fc == 5 else "hr"]
+            if fc == 5 and count not in (0x0000, 0xFF00): raise ModbusError(0x03)
+            if area.find(address) is None: raise ModbusError(0x02)
+            with datastore.lock:
+                area.set(address, [count == 0xFF00] if fc == 5 else [count])
+            return pdu[:5]
+        # 15/16: 주소, 개수, 바이트 수, 데이터
+        nbytes = (count + 7) // 8 if fc == 15 else 2 * count
+        if not 1 <= count <= MAX_COUNT[fc] or len(pdu) < 6 + nbytes or pdu[5] != nbytes: raise ModbusError(0x03)
+        area = areas["co" if fc == 15 else "hr"]
+        if area.find(address, count) is None: raise ModbusError(0x02)
+        data = pdu[6:6 + nbytes]
+        with datastore.lock:
+            area.set(address, _unpack_bits(data, count) if fc == 15 else _bytes_to_regs(data))
+        return pdu[:5]
+    except ModbusError as e:
+        return bytes((fc | 0x80, e.code))
+
+
+class AsyncModbusTcpServer:
+    """
+    asyncio 기반 Modbus TCP 슬레이브. 한 이벤트 루프에서 여러 마스터 연결을 동시에 처리하며
+    SlaveDatastore에서 바로 응답합니다. 요청을 파이프라인으로 보내는 마스터도 순서대로 응답합니다.
+    max_connections를 넘는 연결은 바로 끊고, idle_timeout초 동안 요청이 없는 연결은 닫습니다 (0이면 무제한).
+    run()은 블로킹이므로 별도 스레드에서 호출하고, stop()은 어느 스레드에서나 부를 수 있습니다.
+    """
+    def __init__(self, datastore, host="0.0.0.0", port=502, max_connections=500, idle_timeout=60.0):
+        self.datastore = datastore
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout or None
+        self.is_running = True  # run() 전에 stop()이 불려도 시작하지 않도록 여기서 설정
+        self.loop = None
+        self.stopped = None
+        self.clients = {}  # peer -> ClientStats
+        self.writers = {}  # peer -> StreamWriter
+        self.reset()
+
+    def reset(self):
+        """ 누적 계측 초기화 (연결은 유지하고 연결별 계측도 초기화) """
+        for c in list(self.clients.values()): c.reset()
+        self.started = time.time()
+        self.latency = LatencyHistogram(highest=1.0)
+        self.loop_lag = LatencyHistogram()  # 이벤트 루프 지연 (포화 지표)
+        self.requests = 0
+        self.exceptions = Counter()  # 예외 코드 -> 횟수
+        self.accepted = 0
+        self.rejected = 0
+        self.idle_closed = 0
+        self.peak = len(self.clients)
+        self.rate_mark = (time.monotonic(), 0)
+        self.last_rate = 0.0
+
+    def stop(self):
+        self.is_running = False
+        if self.loop and self.stopped: self.loop.call_soon_threadsafe(self.stopped.set)
+
+    def run(self):
+        asyncio.run(self.main())
+
+    async def main(self):
+        self.loop = asyncio.get_running_loop()
+        self.stopped = asyncio.Event()
+        if not self.is_running: return
+        server = await asyncio.start_server(self.serve, self.host, self.port, backlog=max(128, self.max_connections))
+        lag_task = self.loop.create_task(self.watch_loop_lag())
+        try:
+            await self.stopped.wait()
+        finally:
+            lag_task.cancel()
+            server.close()
+            for writer in list(self.writers.values()): writer.close()
+            await server.wait_closed()
+
+    async def watch_loop_lag(self, interval=0.05):
+        # 예약한 시각보다 얼마나 늦게 깨어나는지 = 요청 처리로 루프가 밀린 정도
+        while True:
+            t = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.loop_lag.record(max(0.0, time.perf_counter() - t - interval))
+
+    async def serve(self, reader, writer):
+        addr = writer.get_extra_info("peername")
+        peer = f"{addr[0]}:{addr[1]}" if addr else "?"
+        if len(self.clients) >= self.max_connections:
+            self.rejected += 1
+            writer.close()
+            return
+        st = self.clients[peer] = ClientStats(peer)
+        self.writers[peer] = writer
+        self.accepted += 1
+        self.peak = max(self.peak, len(self.clients))
+        try:
+            while True:
+                try:
+                    header = await asyncio.wait_for(reader.readexactly(MBAP.size), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    self.idle_closed += 1
+                    break
+                tid, pid, length, unit = MBAP.unpack(header)
+                if pid != 0 or not 2 <= length <= 254: break  # Modbus 프레임이 아니면 연결 종료
+                pdu = await reader.readexactly(length - 1)
+                t0 = time.perf_counter()
+                resp = handle_pdu(self.datastore, unit, pdu)
+                writer.write(MBAP.pack(tid, 0, len(resp) + 1, unit) + resp)
+                elapsed = time.perf_counter() - t0
+                st.last = time.monotonic()
+                st.requests += 1
+                st.rx += MBAP.size + len(pdu)
+                st.tx += MBAP.size + len(resp)
+                st.latency.record(elapsed)
+                self.latency.record(elapsed)
+                self.requests += 1
+                if resp[0] & 0x80:
+                    st.errors += 1
+                    self.exceptions[resp[1]] += 1
+                if writer.transport.get_write_buffer_size() > 65536: await writer.drain()  # 읽지 않는 마스터
+        except (asyncio.IncompleteReadError, ConnectionError, OSError):
+            pass
+        finally:
+            self.clients.pop(peer, None)
+            self.writers.pop(peer, None)
+            writer.close()
+
+    def rate(self):
+        """ 직전 호출 이후의 초당 요청 수 """
+        now, n = time.monotonic(), self.requests
+        t_prev, n_prev = self.rate_mark
+        if now - t_prev >= 0.5:
+            self.last_rate = (n - n_prev) / (now - t_prev)
+            self.rate_mark = (now, n)
+        return self.last_rate
+
+    def snapshot(self):
+        clients = sorted((c.snapshot() for c in list(self.clients.values())), key=lambda c: -c["requests"])
+        return {
+            "time": time.time(), "elapsed": round(time.time() - self.started, 1),
+            "connections": len(clients), "peak": self.peak, "max_connections": self.max_connections,
+            "accepted": self.accepted, "rejected": self.rejected, "idle_closed": self.idle_closed,
+            "requests": self.requests, "requests_per_sec": round(self.rate(), 1),
+            "exception_codes": {f"{k:02X}": v for k, v in sorted(self.exceptions.items())},
+            "latency_ms": self.latency.snapshot(), "loop_lag_ms": self.loop_lag.snapshot(),
+            "clients": clients,
+        }
+
+    def summary(self, snap=None):
+        """ 상태 표시용 한 줄 요약 """
+        s = snap or self.snapshot()
+        lat, lag = s["latency_ms"], s["loop_lag_ms"]
+        exc = ", ".join(f"{k}:{v}" for k, v in s["exception_codes"].items()) or "0"
+        return (f"연결 {s['connections']}/{s['max_connections']} (최대 {s['peak']}, 거부 {s['rejected']}, 유휴 종료 {s['idle_closed']})"
+                f" | {s['requests_per_sec']:.0f} req/s | 처리 p50 {lat['p50']:.3f} / p99 {lat['p99']:.3f} ms"
+                f" | 루프 지연 p99 {lag['p99']:.1f} ms | 예외 {exc}")
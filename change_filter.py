@@ -0,0 +1,85 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMPY_MIN = 64  # 이보다 작은 블록은 numpy 변환 비용이 더 큼
+
+
+def parse_deadbands(text):
+    """
+    "2" / "0.5%" / "2, 100:5%, 101:0" 형식 -> ((기본 값, 퍼센트 여부), {주소: (값, 퍼센트 여부)})
+    첫 항목(주소 없음)이 기본 데드밴드, '주소:값' 항목은 레지스터별 설정입니다.
+    """
+    def band(s):
+        s = s.strip()
+        return (float(s[:-1]), True) if s.endswith("%") else (float(s), False)
+    default, overrides = (0.0, False), {}
+    for part in text.replace(";", ",").split(","):
+        if not part.strip(): continue
+        if ":" in part:
+            addr, b = part.split(":", 1)
+            overrides[int(addr)] = band(b)
+        else:
+            default = band(part)
+    return default, overrides
+
+
+class ChangeFilter:
+    """
+    폴링 블록에서 바뀐 값만 골라냅니다 (그룹별로 마지막으로 보고한 값과 비교).
+    블록 전체가 같으면 바이트 비교 한 번으로 끝나고, 다르면 데드밴드를 적용해
+    |새 값 - 마지막 보고 값| > 절대값 + 퍼센트 * |마지막 보고 값| 인 위치만 보고합니다.
+    """
+    def __init__(self, deadband=(0.0, False), overrides=None):
+        self.deadband = deadband
+        self.overrides = overrides or {}
+        self.last = {}   # id(group) -> array('H') 마지막 보고 값
+        self.bands = {}  # id(group) -> (절대값 목록, 퍼센트 비율 목록) 또는 None(데드밴드 없음)
+        self.samples = 0
+        self.suppressed = 0         # 바뀐 값이 하나도 없어 생략된 샘플 수
+        self.values_suppressed = 0  # 생략된 값 개수
+
+    def _bands(self, group):
+        abs_b, pct_b = [], []
+        for a in group.addresses:
+            v, pct = self.overrides.get(a, self.deadband)
+            abs_b.append(0.0 if pct else v)
+            pct_b.append(v / 100.0 if pct else 0.0)
+        if not any(abs_b) and not any(pct_b): return None
+        if np is not None: return np.array(abs_b), np.array(pct_b)
+        return abs_b, pct_b
+
+    def changed(self, group, values):
+        """ 보고할 위치(인덱스) 목록. 첫 샘플은 전체, 바뀐 값이 없으면 빈 목록 """
+        self.samples += 1
+        cur = array("H", (int(v) for v in values))
+        key = id(group)
+        last = self.last.get(key)
+        if last is None or len(last) != len(cur):
+            self.last[key] = cur
+            self.bands[key] = self._bands(group)
+            return list(range(len(cur)))
+        if cur.tobytes() == last.tobytes():
+            self.suppressed += 1
+            self.values_suppressed += len(cur)
+            return []
+
+        bands = self.bands[key]
+        if np is not None and len(cur) >= NUMPY_MIN:
+            a = np.frombuffer(cur, dtype=np.uint16).astype(np.int32)
+            b = np.frombuffer(last, dtype=np.uint16).astype(np.int32)
+            diff = np.abs(a - b)
+            idx = np.nonzero(diff > (bands[0] + bands[1] * b) if bands else diff)[0].tolist()
+        elif bands:
+            abs_b, pct_b = bands
+            idx = [i for i, (x, y) in enumerate(zip(cur, last)) if x != y and abs(x - y) > abs_b[i] + pct_b[i] * y]
+        else:
+            idx = [i for i, (x, y) in enumerate(zip(cur, last)) if x != y]
+
+        for i in idx: last[i] = cur[i]
+        self.values_suppressed += len(cur) - len(idx)
+        if not idx: self.suppressed += 1
+        return idx
@@ -0,0 +1,59 @@
+import asyncio
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class HostnameResolver:
+    """
+    역방향 DNS(PTR) 조회 전용 단계.
+    전용 스레드풀(concurrency)로 동시 조회 수를 제한하고, 조회마다 timeout을 적용합니다.
+    timeout은 실제로 실행 중인 조회에만 적용합니다 (빈 스레드를 기다리는 시간은 제외).
+    결과는 TTL 캐시에 보관되어 다음 스캔에서도 재사용됩니다. (PTR 없음도 negative_ttl 동안 캐시)
+    """
+    def __init__(self, concurrency=16, timeout=2.0, ttl=3600.0, negative_ttl=300.0):
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="rdns")
+        self.concurrency = concurrency
+        self.slots = None       # 실행 중인 조회 수 제한 (이벤트 루프마다 새로 만듦)
+        self.slots_loop = None
+        self.timeout = timeout
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.cache = {}  # ip -> (hostname, 만료 시각)
+
+    def cached(self, ip):
+        """ 캐시에 유효한 값이 있으면 호스트명("" 포함), 없으면 None """
+        entry = self.cache.get(ip)
+        if entry and entry[1] > time.monotonic(): return entry[0]
+        return None
+
+    def _lookup(self, ip):
+        try: name = socket.gethostbyaddr(ip)[0]
+        except OSError: name = ""
+        # 호출 측이 시간 초과로 포기했더라도 결과는 캐시에 남김
+        self.cache[ip] = (name, time.monotonic() + (self.ttl if name else self.negative_ttl))
+        return name
+
+    async def resolve(self, ip):
+        name = self.cached(ip)
+        if name is not None: return name
+        loop = asyncio.get_running_loop()
+        if self.slots_loop is not loop:
+            self.slots, self.slots_loop = asyncio.Semaphore(self.concurrency), loop
+        slots = self.slots
+        await slots.acquire()
+        name = self.cached(ip)  # 기다리는 동안 다른 조회가 채웠을 수 있음
+        if name is not None:
+            slots.release()
+            return name
+        # 스레드가 끝날 때 자리를 돌려주므로, 대기 중인 조회는 큐에서 시간을 쓰지 않음
+        fut = loop.run_in_executor(self.executor, self._lookup, ip)
+        fut.add_done_callback(lambda _: slots.release())
+        try:
+            # shield: 시간 초과로 포기해도 조회는 끝까지 실행되어 캐시를 채움
+            return await asyncio.wait_for(asyncio.shield(fut), self.timeout)
+        except asyncio.TimeoutError:
+            return ""
+
+    def clear(self):
+        self.cache.clear()
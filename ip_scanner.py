@@ -1,14 +1,21 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import subprocess
-import ipaddress
 import threading
-import re
 import socket
-import csv
 import webbrowser
 import os
-from queue import Queue
+
+from .scan_engine import ScanEngine, PORT_PRESETS, parse_ports
+from .scan_results import ScanResults, export_hosts, Workbook
+from .neighbor_table import NeighborTable
+from .oui_index import OuiIndex, load_or_build
+from .hostname_resolver import HostnameResolver
+from .scan_state import ScanStateStore
+from .scan_targets import TargetSpec
+
+# 결과 표시 주기(ms)와 주기당 최대 삽입 행 수
+RESULT_TICK_MS = 100
+ROWS_PER_TICK = 500
 
 # 외부 라이브러리 로딩
 try:
@@ -16,17 +23,20 @@ try:
 except ImportError:
     MacLookup = None
 
-try:
-    from openpyxl import Workbook
-except ImportError:
-    Workbook = None
-
 
 class IPScannerGUI:
     def __init__(self, parent):
         self.parent = parent
         self.is_scanning = False
         self.mac_lookup = None
+        self.engine = None
+        self.results = ScanResults()
+        self.drain_job = None
+        self.restripe_job = None
+        self.neighbors = NeighborTable()
+        self.resolver = HostnameResolver()  # 호스트명 캐시는 스캔 간에 유지
+        self.state = None  # 이전 스캔 결과 저장소 (첫 스캔 시 로드)
+        self.scan_note = ""
         
         style = ttk.Style()
         style.configure("Treeview", rowheight=25)
@@ -46,18 +56,15 @@ class IPScannerGUI:
         top_frame = ttk.LabelFrame(parent, text="스캔 설정", padding="10")
         top_frame.pack(fill="x", padx=10, pady=5)
         
-        ttk.Label(top_frame, text="시작 IP:").grid(row=0, column=0, padx=5, sticky="w")
-        self.start_ip_var = tk.StringVar()
-        ttk.Entry(top_frame, textvariable=self.start_ip_var, width=15).grid(row=0, column=1, padx=5)
-        
-        ttk.Label(top_frame, text="~").grid(row=0, column=2, padx=5)
-        
-        ttk.Label(top_frame, text="종료 IP:").grid(row=0, column=3, padx=5, sticky="w")
-        self.end_ip_var = tk.StringVar()
-        ttk.Entry(top_frame, textvariable=self.end_ip_var, width=15).grid(row=0, column=4, padx=5)
+        # 대상: CIDR / 범위 / 단일 IP 여러 개, '!'로 시작하면 제외 (예: 192.168.0.0/24, 10.0.0.1-50, !192.168.0.100)
+        ttk.Label(top_frame, text="스캔 대상:").grid(row=0, column=0, padx=5, sticky="w")
+        self.target_var = tk.StringVar()
+        ttk.Entry(top_frame, textvariable=self.target_var, width=42).grid(row=0, column=1, columnspan=4, padx=5, sticky="we")
         
         self.detail_scan_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(top_frame, text="상세 스캔 (호스트명/포트)", variable=self.detail_scan_var).grid(row=0, column=5, padx=15)
+        self.delta_scan_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top_frame, text="증분 스캔 (변경분만)", variable=self.delta_scan_var).grid(row=0, column=7, padx=5)
 
         btn_frame = ttk.Frame(top_frame)
         btn_frame.grid(row=0, column=6, padx=10)
@@ -67,6 +74,26 @@ class IPScannerGUI:
         self.btn_export.pack(side="left", padx=2)
         self.btn_export_excel = ttk.Button(btn_frame, text="Excel 저장", command=self.export_excel)
         self.btn_export_excel.pack(side="left", padx=2)
+        self.btn_export_jsonl = ttk.Button(btn_frame, text="JSONL 저장", command=self.export_jsonl)
+        self.btn_export_jsonl.pack(side="left", padx=2)
+
+        ttk.Label(top_frame, text="동시 작업:").grid(row=1, column=0, padx=5, pady=(5, 0), sticky="w")
+        self.concurrency_var = tk.StringVar(value="128")
+        ttk.Entry(top_frame, textvariable=self.concurrency_var, width=6).grid(row=1, column=1, padx=5, pady=(5, 0), sticky="w")
+        ttk.Label(top_frame, text="타임아웃(ms):").grid(row=1, column=3, padx=5, pady=(5, 0), sticky="w")
+        self.timeout_var = tk.StringVar(value="1000")
+        ttk.Entry(top_frame, textvariable=self.timeout_var, width=6).grid(row=1, column=4, padx=5, pady=(5, 0), sticky="w")
+
+        port_frame = ttk.Frame(top_frame)
+        port_frame.grid(row=1, column=5, columnspan=2, padx=15, pady=(5, 0), sticky="w")
+        ttk.Label(port_frame, text="검사 포트:").pack(side="left")
+        self.port_preset = ttk.Combobox(port_frame, values=list(PORT_PRESETS), width=8, state="readonly")
+        self.port_preset.current(0)
+        self.port_preset.pack(side="left", padx=5)
+        self.port_preset.bind("<<ComboboxSelected>>", self.on_port_preset)
+        self.ports_var = tk.StringVar()
+        ttk.Entry(port_frame, textvariable=self.ports_var, width=40).pack(side="left")
+        self.on_port_preset()
         
         # 결과 리스트
         tree_frame = ttk.LabelFrame(parent, text="스캔 결과", padding="10")
@@ -90,7 +117,7 @@ class IPScannerGUI:
         self.tree.column("ports", width=150, anchor="center")
         
         scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.configure(yscrollcommand=lambda first, last: (scrollbar.set(first, last), self.schedule_restripe()))
         
         self.tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -154,20 +181,28 @@ class IPScannerGUI:
         local_ip = self.get_local_ip()
         parts = local_ip.split('.')
         base_ip = ".".join(parts[:3])
-        self.start_ip_var.set(f"{base_ip}.1")
-        self.end_ip_var.set(f"{base_ip}.254")
+        self.target_var.set(f"{base_ip}.1-{base_ip}.254")
 
     def init_mac_lookup(self):
-        if MacLookup is None:
-            self.status_var.set("MacLookup 모듈 없음. 제조사 정보가 표시되지 않습니다.")
-            return
+        # 1순위: 미리 만들어 둔 OUI 인덱스 (mmap, 수 ms 내 로드) / 2순위: mac_vendor_lookup 라이브러리
         def _load():
+            note = ""  # OUI 인덱스를 못 읽은 이유 (상태 표시줄에 함께 표시)
+            try:
+                self.mac_lookup = load_or_build()
+            except Exception as e:
+                note = f" (OUI 인덱스 로드 실패: {e})"
+            if self.mac_lookup:
+                self.status_var.set(f"대기 중 (제조사 DB {len(self.mac_lookup)}건)")
+                return
+            if MacLookup is None:
+                self.status_var.set("MacLookup 모듈 없음. 제조사 정보가 표시되지 않습니다." + note)
+                return
             try:
-                self.status_var.set("제조사 DB 로딩 중...")
+                self.status_var.set("제조사 DB 로딩 중..." + note)
                 self.mac_lookup = MacLookup()
-                self.status_var.set("대기 중")
+                self.status_var.set("대기 중" + note)
             except:
-                self.status_var.set("제조사 DB 로드 실패")
+                self.status_var.set("제조사 DB 로드 실패" + note)
                 self.mac_lookup = None
         threading.Thread(target=_load, daemon=True).start()
 
@@ -186,6 +221,9 @@ class IPScannerGUI:
         except Exception as e:
             self.lbl_my_ip.config(text="IP 확인 실패")
 
+    def on_port_preset(self, event=None):
+        self.ports_var.set(", ".join(str(p) for p in PORT_PRESETS[self.port_preset.get()]))
+
     def show_context_menu(self, event):
         item = self.tree.identify_row(event.y)
         if item:
@@ -213,166 +251,173 @@ class IPScannerGUI:
             self.parent.update()
 
     def export_csv(self):
-        if not self.tree.get_children():
-            messagebox.showwarning("경고", "저장할 데이터가 없습니다.")
-            return
-        filename = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV 파일", "*.csv")])
-        if not filename: return
-        try:
-            with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.writer(f)
-                writer.writerow(["IP", "응답속도", "호스트명", "MAC", "제조사", "포트"])
-                for item in self.tree.get_children():
-                    row = self.tree.item(item)['values']
-                    writer.writerow(row)
-            messagebox.showinfo("성공", "파일이 저장되었습니다.")
-        except Exception as e:
-            messagebox.showerror("오류", f"저장 실패: {e}")
+        self.export_results(".csv", [("CSV 파일", "*.csv")])
 
     def export_excel(self):
         if Workbook is None:
             messagebox.showerror("오류", "Excel 저장을 위해 'openpyxl' 라이브러리가 필요합니다.\n\n터미널에서 'pip install openpyxl' 명령을 실행하세요.")
             return
-        if not self.tree.get_children():
+        self.export_results(".xlsx", [("Excel 파일", "*.xlsx")])
+
+    def export_jsonl(self):
+        self.export_results(".jsonl", [("JSON Lines 파일", "*.jsonl")])
+
+    def export_results(self, ext, filetypes):
+        # Treeview가 아닌 결과 모델에서 저장. 현재 시점의 스냅샷만 떠서 백그라운드 스레드로 기록 (스캔 중에도 가능)
+        if not len(self.results):
             messagebox.showwarning("경고", "저장할 데이터가 없습니다.")
             return
-        filename = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel 파일", "*.xlsx")])
+        filename = filedialog.asksaveasfilename(defaultextension=ext, filetypes=filetypes)
         if not filename: return
-        
-        try:
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "IP Scan Results"
-            
-            # 헤더 추가
-            headers = ["IP", "응답속도", "호스트명", "MAC", "제조사", "포트"]
-            ws.append(headers)
-            
-            # 데이터 추가
-            for item in self.tree.get_children():
-                row = self.tree.item(item)['values']
-                ws.append(row)
-            
-            wb.save(filename)
-            messagebox.showinfo("성공", "파일이 저장되었습니다.")
-        except Exception as e:
-            messagebox.showerror("오류", f"저장 실패: {e}")
+        snapshot = list(self.results.hosts.values())
+        scanning = self.is_scanning
 
-    def get_mac_address_arp(self, ip):
-        try:
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW 
-            output = subprocess.check_output(f"arp -a {ip}", startupinfo=startupinfo, shell=True).decode('cp949', errors='ignore')
-            mac_regex = re.search(r"([0-9a-fA-F]{2}-){5}[0-9a-fA-F]{2}", output)
-            if mac_regex: return mac_regex.group(0).replace('-', ':').lower()
-        except: pass
-        return None
-
-    def check_ports(self, ip, ports=[502, 80, 443, 21, 23, 3389]):
-        open_ports = []
-        for port in ports:
-            if not self.is_scanning: break
-            try:
-                s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                s.settimeout(0.3)
-                if s.connect_ex((str(ip), port)) == 0: open_ports.append(str(port))
-                s.close()
-            except: pass
-        return ",".join(open_ports) if open_ports else ""
-
-    def get_hostname(self, ip):
-        try: return socket.gethostbyaddr(str(ip))[0]
-        except: return ""
-
-    def worker(self, queue, detailed):
-        while self.is_scanning:
+        def _save():
             try:
-                ip = queue.get_nowait()
-            except:
-                break # 큐가 비었으면 종료
-            
-            try:
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                proc = subprocess.Popen(['ping', '-n', '1', '-w', '200', str(ip)], stdout=subprocess.PIPE, stderr=subprocess.PIPE, startupinfo=startupinfo)
-                stdout, _ = proc.communicate()
-
-                if proc.returncode == 0 and self.is_scanning:
-                    output = stdout.decode('cp949', errors='ignore')
-                    latency = 1
-                    lat_match = re.search(r'(time|시간)[=<](\d+)ms', output)
-                    if lat_match: latency = int(lat_match.group(2))
-                    
-                    mac = self.get_mac_address_arp(str(ip))
-                    vendor = "" if not mac else "알수없음"
-                    if mac and self.mac_lookup:
-                        try: vendor = self.mac_lookup.lookup(mac)
-                        except: pass
-                    
-                    hostname, ports = ("", "")
-                    if detailed and self.is_scanning:
-                        hostname = self.get_hostname(ip)
-                        ports = self.check_ports(ip)
-                    
-                    if self.is_scanning:
-                        self.parent.after(0, self.insert_result, str(ip), latency, hostname, mac, vendor, ports)
+                count = export_hosts(snapshot, filename)
+                msg = f"{count}건이 저장되었습니다." + (" (스캔 진행 중 시점 기준)" if scanning else "")
+                self.parent.after(0, messagebox.showinfo, "성공", msg)
             except Exception as e:
-                print(f"Error scanning {ip}: {e}")
-            finally:
-                queue.task_done()
+                self.parent.after(0, messagebox.showerror, "오류", f"저장 실패: {e}")
+        threading.Thread(target=_save, daemon=True).start()
+
+    def enrich_host(self, host):
+        # 생존 확인된 호스트의 MAC/제조사 수집 - 엔진 스레드풀에서 실행 (포트/호스트명은 엔진의 별도 단계에서 처리)
+        if not self.is_scanning: return
+        # MAC은 ARP 테이블 스냅샷에서 조회 (없으면 최대 1초에 한 번만 테이블 전체를 다시 읽음)
+        host.mac = self.neighbors.lookup(host.ip, max_age=1.0)
+        host.vendor = self.resolve_vendor(host.mac)
+
+    def resolve_vendor(self, mac):
+        if not mac: return ""
+        vendor = None
+        if self.mac_lookup:
+            try: vendor = self.mac_lookup.lookup(mac)
+            except: pass
+        return vendor or "알수없음"
+
+    def fill_missing_macs(self):
+        # 스캔 종료 시점의 ARP 테이블로 MAC이 비어있는 행을 채움 (딕셔너리 조회만 수행)
+        for ip, host in self.results.hosts.items():
+            if host.mac: continue
+            host.mac = self.neighbors.lookup(ip)
+            if host.mac:
+                host.vendor = self.resolve_vendor(host.mac)
+                self.tree.item(self.results.item_ids[ip], values=self.row_values(host))
+
+    def row_values(self, host):
+        ip, latency, hostname, mac, vendor, ports = host.as_row()
+        return (ip, f"{latency}ms", hostname, mac, vendor, ports)
+
+    def drain_results(self, limit=ROWS_PER_TICK):
+        # 버퍼에 쌓인 결과를 한 번에 여러 행씩 Treeview에 반영 (호스트마다 after 콜백을 만들지 않음)
+        for host in self.results.drain(limit):
+            self.insert_result(host)
+
+        self.drain_job = None
+        if self.is_scanning or self.results.has_pending():
+            self.drain_job = self.parent.after(RESULT_TICK_MS, self.drain_results)
+
+    def insert_result(self, host):
+        ip, latency = host.ip, host.latency
+        values = self.row_values(host)
+        item = self.results.item_ids.get(ip)
+        if item is not None:
+            # 이미 있는 IP는 중복 삽입하지 않고 값만 갱신
+            self.results.hosts[ip] = host
+            self.tree.item(item, values=values)
+            return
+        tags = self.stripe_tags(len(self.results), latency)
+        self.results.hosts[ip] = host
+        self.results.display_order.append(ip)
+        self.results.row_tags[ip] = tags
+        self.results.item_ids[ip] = self.tree.insert("", "end", values=values, tags=tags)
 
-    def insert_result(self, ip, latency, hostname, mac, vendor, ports):
-        for item in self.tree.get_children():
-            if self.tree.item(item)['values'][0] == ip:
-                return
-        count = len(self.tree.get_children())
-        tag = "even" if count % 2 == 0 else "odd"
-        tags = [tag, "slow"] if latency >= 100 else [tag]
-        self.tree.insert("", "end", values=(ip, f"{latency}ms", hostname, mac, vendor, ports), tags=tags)
+    def stripe_tags(self, index, latency):
+        tag = "even" if index % 2 == 0 else "odd"
+        return (tag, "slow") if latency >= 100 else (tag,)
 
     def run_scan_thread(self):
-        s_ip = self.start_ip_var.get().strip()
-        e_ip = self.end_ip_var.get().strip()
         is_detail = self.detail_scan_var.get()
+        is_delta = self.delta_scan_var.get()
+        self.scan_note = ""
         try:
-            start, end = ipaddress.IPv4Address(s_ip), ipaddress.IPv4Address(e_ip)
-            if start > end: start, end = end, start
-            ip_list = [ipaddress.IPv4Address(ip) for ip in range(int(start), int(end) + 1)]
+            # 주소 목록을 미리 만들지 않음 - 엔진이 반복하면서 하나씩 생성
+            spec = TargetSpec.parse(self.target_var.get())
         except ValueError:
             # IP 주소 형식이 잘못되었을 경우, GUI 스레드에서 에러 메시지를 표시하고 종료합니다.
-            self.parent.after(0, messagebox.showerror, "오류", "IP 형식이 잘못되었습니다.")
+            self.parent.after(0, messagebox.showerror, "오류", "스캔 대상 형식이 잘못되었습니다.\n예: 192.168.0.0/24, 10.0.0.1-50, !10.0.0.7")
             self.parent.after(0, self.finish_scan, True) # 스캔이 중지된 것으로 처리
             return
 
-        self.parent.after(0, lambda: self.status_var.set(f"스캔 중... (대상: {len(ip_list)}개)"))
-        scan_queue = Queue()
-        for ip in ip_list: scan_queue.put(ip)
-        
-        threads = []
-        num_threads = 30 if is_detail else 50
-        for _ in range(num_threads):
-            t = threading.Thread(target=self.worker, args=(scan_queue, is_detail))
-            t.daemon = True
-            t.start()
-            threads.append(t)
-        
-        # 모든 워커 스레드가 작업을 마칠 때까지 백그라운드에서 대기합니다.
-        for t in threads:
-            t.join()
+        try:
+            concurrency = max(1, int(self.concurrency_var.get()))
+            timeout = max(50, int(self.timeout_var.get())) / 1000.0
+        except ValueError:
+            concurrency, timeout = (64 if is_detail else 128), 1.0
+
+        ports = ()
+        if is_detail:
+            try:
+                ports = parse_ports(self.ports_var.get())
+            except ValueError:
+                self.parent.after(0, messagebox.showerror, "오류", "포트 목록 형식이 잘못되었습니다. (예: 502, 102, 8000-8010)")
+                self.parent.after(0, self.finish_scan, True)
+                return
 
-        # 모든 스레드 작업이 끝나면, GUI 스레드에서 finish_scan을 호출합니다.
+        self.parent.after(0, lambda: self.status_var.set(f"스캔 중... (대상: {len(spec)}개, 동시 {concurrency})"))
+
+        # 스캔 시작 시점의 ARP 테이블 스냅샷 / 제조사 조회 캐시 초기화
+        self.neighbors.refresh()
+        if isinstance(self.mac_lookup, OuiIndex): self.mac_lookup.clear_cache()
+
+        # 증분 모드일 때만 상태 저장소를 사용: 이전 결과로 대상 순서/상세 검사 여부를 정하고 이번 결과를 기록
+        targets, reuse, state = spec, None, None
+        if is_delta:
+            if self.state is None: self.state = ScanStateStore().load()
+            state = self.state
+            state.begin_scan(is_detail)
+            targets = state.delta_targets(spec, spec.__contains__)
+            reuse = state.reuse_detail if is_detail else None
+
+        def on_batch(batch):
+            if state: state.record_alive(batch)
+            self.results.push(batch)
+
+        # 호스트 결과는 엔진 스레드에서 버퍼에 쌓이고, GUI 스레드가 drain_results 주기마다 꺼내서 표시합니다.
+        self.engine = ScanEngine(concurrency=concurrency, host_timeout=timeout, ports=ports,
+                                 resolver=self.resolver if is_detail else None)
+        if self.is_scanning: self.engine.run(
+            targets,
+            on_batch=on_batch,
+            enrich=self.enrich_host,
+            on_dead=state.record_dead if state else None,
+            reuse=reuse,
+        )
+        # 스캔 종료 시점의 스냅샷 (탐색 중 새로 학습된 항목 반영)
+        self.neighbors.refresh()
+
+        if state:
+            self.scan_note = f" (증분: 생략 {state.skipped}개, 상세 재사용 {state.reused}개)"
+            try: state.save()
+            except Exception as e: self.scan_note += f" (상태 저장 실패: {e})"
+
+        # 엔진 작업이 끝나면, GUI 스레드에서 finish_scan을 호출합니다.
         # self.is_scanning이 False이면 사용자가 중지 버튼을 누른 것입니다.
         is_stopped_by_user = not self.is_scanning
         self.parent.after(0, self.finish_scan, is_stopped_by_user)
 
     def start_scan(self):
         if self.is_scanning: return
-        for item in self.tree.get_children(): self.tree.delete(item)
+        self.tree.delete(*self.tree.get_children())
+        self.results.clear()
         
         self.is_scanning = True
         self.btn_scan.config(text="스캔 중지", command=self.stop_scan)
         
         threading.Thread(target=self.run_scan_thread, daemon=True).start()
+        if self.drain_job: self.parent.after_cancel(self.drain_job)
+        self.drain_job = self.parent.after(RESULT_TICK_MS, self.drain_results)
 
     def stop_scan(self):
         if self.is_scanning:
@@ -380,6 +425,7 @@ class IPScannerGUI:
             self.btn_scan.config(text="중지 중...", state="disabled")
             self.status_var.set("스캔 중지 중...")
             self.is_scanning = False
+            if self.engine: self.engine.stop()
 
     def finish_scan(self, is_stopped):
         # 스캔 완료 또는 중지 시, is_scanning 상태를 확실히 False로 변경합니다.
@@ -389,35 +435,43 @@ class IPScannerGUI:
         # 스캔 버튼을 다시 '스캔 시작' 상태로 완전히 복구합니다.
         self.btn_scan.config(text="스캔 시작", command=self.start_scan, state="normal")
         
-        # 결과가 있을 경우에만 IP 주소로 기본 정렬을 수행합니다.
-        if self.tree.get_children():
+        # 버퍼에 남아있는 결과를 모두 반영한 뒤, 결과가 있을 경우에만 IP 주소로 기본 정렬을 수행합니다.
+        for host in self.results.drain(): self.insert_result(host)
+        self.fill_missing_macs()
+        if len(self.results):
             self.sort_tree("ip", False) 
         
         if is_stopped:
-            self.status_var.set(f"스캔이 중지되었습니다. {len(self.tree.get_children())}개 장치 발견.")
+            self.status_var.set(f"스캔이 중지되었습니다. {len(self.results)}개 장치 발견.{self.scan_note}")
         else:
-            self.status_var.set(f"스캔 완료. {len(self.tree.get_children())}개 장치 발견.")
+            self.status_var.set(f"스캔 완료. {len(self.results)}개 장치 발견.{self.scan_note}")
             # 사용자가 '중지'를 누른게 아니라, 정상적으로 끝났을 때만 완료 메시지를 표시합니다.
             if was_scanning_before_finish:
                 messagebox.showinfo("완료", "스캔이 완료되었습니다.")
 
     def sort_tree(self, col, reverse):
-        l = [(self.tree.set(k, col), k) for k in self.tree.get_children('')]
-        try:
-            if col == "ip": l.sort(key=lambda t: ipaddress.IPv4Address(t[0]), reverse=reverse)
-            elif col == "latency": l.sort(key=lambda t: int(str(t[0]).replace('ms','').replace('(나)','0').strip()), reverse=reverse)
-            else: l.sort(reverse=reverse)
-        except: l.sort(reverse=reverse)
-        
-        for i, (val, k) in enumerate(l):
-            self.tree.move(k, '', i)
-            tag = "even" if i % 2 == 0 else "odd"
-            latency_val = self.tree.item(k, 'values')[1]
-            try:
-                latency_int = int(latency_val.replace('ms','').strip())
-                tags = [tag, "slow"] if latency_int >= 100 else [tag]
-                self.tree.item(k, tags=tags)
-            except:
-                self.tree.item(k, tags=[tag])
+        # 결과 모델에서 타입 있는 키(정수 IP, 숫자 응답시간, 포트 비트맵)로 정렬하고,
+        # 위젯에는 새 순서를 set_children 한 번으로 반영. 줄무늬 태그는 화면에 보이는 행만 다시 칠합니다.
+        order = self.results.sort(col, reverse)
+        item_ids = self.results.item_ids
+        self.tree.set_children("", *(item_ids[ip] for ip in order))
+        self.restripe_visible()
 
         self.tree.heading(col, command=lambda: self.sort_tree(col, not reverse))
+
+    def schedule_restripe(self):
+        if self.restripe_job is None:
+            self.restripe_job = self.parent.after_idle(self.restripe_visible)
+
+    def restripe_visible(self):
+        self.restripe_job = None
+        order = self.results.display_order
+        if not order: return
+        first, last = self.tree.yview()
+        n = len(order)
+        for i in range(max(0, int(first * n) - 1), min(n, int(last * n) + 2)):
+            ip = order[i]
+            tags = self.stripe_tags(i, self.results.hosts[ip].latency)
+            if self.results.row_tags.get(ip) != tags:
+                self.results.row_tags[ip] = tags
+                self.tree.item(self.results.item_ids[ip], tags=tags)
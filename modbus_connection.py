@@ -0,0 +1,150 @@
+import time
+import random
+import socket
+import threading
+
+try:
+    from pymodbus.exceptions import ModbusException
+except ImportError:
+    class ModbusException(Exception): pass
+
+# 연결 자체가 끊긴 것으로 보는 예외 (장치의 예외 응답은 ModbusReadError로 따로 처리)
+CONNECTION_ERRORS = (OSError, ConnectionError, ModbusException)
+
+
+def enable_keepalive(sock, idle=10, interval=5, count=3):
+    """ TCP keepalive로 반쯤 끊긴(half-open) 연결을 OS가 감지하도록 설정 """
+    if not isinstance(sock, socket.socket): return
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, count)
+    elif hasattr(socket, "SIO_KEEPALIVE_VALS"):  # Windows
+        sock.ioctl(socket.SIO_KEEPALIVE_VALS, (1, idle * 1000, interval * 1000))
+
+
+class ManagedConnection:
+    """
+    끊겨도 세션을 끝내지 않는 Modbus 연결.
+    클라이언트 객체는 한 번 만들어 재사용하고, 연결 실패 시 지수 백오프 + 지터 간격으로 재시도합니다.
+    소켓 오류 외에도 응답 없음이 max_silent회 연속되면 반쯤 끊긴 연결로 보고 다시 연결합니다.
+    on_state(conn, msg)로 상태 변화를 알립니다.
+    """
+    def __init__(self, name, factory, base_delay=0.5, max_delay=30.0, jitter=0.3, max_silent=3, on_state=None):
+        self.name = name
+        self.factory = factory
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.max_silent = max_silent
+        self.on_state = on_state
+        self.client = None
+        self.connected = False
+        self.attempt = 0      # 연속 연결 실패 횟수
+        self.next_try = 0.0
+        self.silent = 0       # 연속 응답 없음 횟수
+        # 상태 지표
+        self.connects = 0
+        self.connect_failures = 0
+        self.drops = 0
+        self.last_error = ""
+        self.up_since = None
+        self.down_time = 0.0
+        self.down_since = time.monotonic()
+
+    def _notify(self, msg):
+        if self.on_state: self.on_state(self, msg)
+
+    def _connect_once(self):
+        if self.client is None: self.client = self.factory()
+        else: self.client.close()
+        if not self.client.connect(): return False
+        enable_keepalive(getattr(self.client, "socket", None))
+        return True
+
+    def ensure(self, stop_event=None):
+        """ 연결될 때까지 백오프하며 재시도. stop_event가 설정되면 False """
+        while not self.connected:
+            if stop_event is not None and stop_event.is_set(): return False
+            delay = self.next_try - time.monotonic()
+            if delay > 0:
+                if stop_event is not None: stop_event.wait(delay)
+                else: time.sleep(delay)
+                continue
+            try:
+                ok = self._connect_once()
+                if not ok: self.last_error = "연결 실패"
+            except CONNECTION_ERRORS as e:
+                ok, self.last_error = False, str(e)
+            if ok:
+                now = time.monotonic()
+                self.down_time += now - self.down_since
+                self.connected, self.up_since, self.attempt, self.silent = True, now, 0, 0
+                self.connects += 1
+                self._notify("연결됨" if self.connects == 1 else f"재연결됨 (누적 끊김 {self.drops}회)")
+            else:
+                self.connect_failures += 1
+                self.attempt += 1
+                wait = min(self.max_delay, self.base_delay * 2 ** (self.attempt - 1))
+                wait *= 1 + random.uniform(-self.jitter, self.jitter)  # 여러 장치가 동시에 재접속하지 않도록 분산
+                self.next_try = time.monotonic() + wait
+                self._notify(f"연결 실패 ({self.last_error}), {wait:.1f}초 후 재시도 [{self.attempt}회째]")
+        return True
+
+    def mark_down(self, err):
+        if not self.connected: return
+        self.connected = False
+        self.drops += 1
+        self.last_error = str(err)
+        self.down_since = time.monotonic()
+        self.next_try = 0.0  # 첫 재시도는 바로
+        try: self.client.close()
+        except Exception: pass
+        self._notify(f"연결 끊김: {err}")
+
+    def got_response(self):
+        self.silent = 0
+
+    def no_response(self):
+        self.silent += 1
+        if self.silent >= self.max_silent:
+            self.mark_down(f"응답 없음 {self.silent}회 연속 (half-open 의심)")
+
+    def close(self):
+        if self.client: self.client.close()
+        if self.connected: self.down_since = time.monotonic()
+        self.connected = False
+
+    def health(self):
+        now = time.monotonic()
+        down = self.down_time + (0 if self.connected else now - self.down_since)
+        return {
+            "name": self.name, "connected": self.connected, "connects": self.connects,
+            "connect_failures": self.connect_failures, "drops": self.drops, "last_error": self.last_error,
+            "uptime": round(now - self.up_since, 1) if self.connected else 0.0, "downtime": round(down, 1),
+        }
+
+
+class ConnectionPool:
+    """ 엔드포인트(키)별 ManagedConnection 보관. 세션을 다시 시작해도 같은 연결을 재사용합니다. """
+    def __init__(self):
+        self.conns = {}
+        self.lock = threading.Lock()
+
+    def get(self, key, factory, **opts):
+        with self.lock:
+            conn = self.conns.get(key)
+            if conn is None:
+                conn = self.conns[key] = ManagedConnection(":".join(map(str, key)), factory, **opts)
+            elif "on_state" in opts:
+                conn.on_state = opts["on_state"]
+            return conn
+
+    def health(self):
+        with self.lock:
+            return [c.health() for c in self.conns.values()]
+
+    def close_all(self):
+        with self.lock:
+            for c in self.conns.values(): c.close()
@@ -0,0 +1,119 @@
+import os
+import sys
+import json
+import signal
+import argparse
+import threading
+from datetime import datetime
+
+from .poll_session import PollSession, make_group, sample_values
+from .change_filter import parse_deadbands
+from .poll_metrics import save_snapshot
+
+EXAMPLE_CONFIG = """{
+  "mode": "TCP",
+  "ip": "192.168.0.10",
+  "port": 502,
+  "async": false,
+  "depth": 4,
+  "groups": [
+    {"area": "hr", "address": 0, "count": 10, "unit": 1, "period": 1.0},
+    {"area": "hr", "tags": "100-105, 200", "max_gap": 10, "period": 0.5},
+    {"area": "hr", "tag_map": "tags.csv", "period": 1.0}
+  ],
+  "record": "plc_log.etr",
+  "deadband": "",
+  "output": "text"
+}"""
+
+
+def load_config(path):
+    """ JSON 설정 파일 -> PollSession 설정 (태그 맵 경로는 설정 파일 기준 상대 경로) """
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    groups = []
+    for g in raw.get("groups", []):
+        g = dict(g)
+        if g.get("tag_map"): g["tag_map"] = os.path.join(base, g["tag_map"])
+        groups.append(make_group(**g))
+    if not groups: raise ValueError("groups 항목이 비어 있습니다.")
+    deadband = str(raw.get("deadband") or "")
+    return {
+        'mode': raw.get("mode", "TCP").upper(),
+        'ip': raw.get("ip", "192.168.0.10"),
+        'port': int(raw.get("port", 502)),
+        'com': raw.get("com", "COM3"),
+        'baud': int(raw.get("baud", 9600)),
+        'async': bool(raw.get("async", False)),
+        'depth': int(raw.get("depth", 4)),
+        'record': raw.get("record"),
+        'deadband': parse_deadbands(deadband) if deadband else None,
+        'groups': groups,
+        'output': raw.get("output", "text"),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m modules.modbus_logger_cli",
+                                 description="Modbus 마스터 로거 (GUI 없이 실행)")
+    ap.add_argument("config", nargs="?", help="JSON 설정 파일")
+    ap.add_argument("--output", choices=("text", "jsonl", "none"), help="표준 출력 형식 (설정 파일의 output보다 우선)")
+    ap.add_argument("--record", help="바이너리 기록 파일 (.etr)")
+    ap.add_argument("--duration", type=float, help="지정한 초만큼 수집 후 종료")
+    ap.add_argument("--metrics", help="계측 스냅샷 JSON 파일 (주기적으로, 종료 시 갱신)")
+    ap.add_argument("--metrics-interval", type=float, default=10.0, help="스냅샷 갱신 주기(초)")
+    ap.add_argument("--example", action="store_true", help="예시 설정 파일 출력")
+    args = ap.parse_args(argv)
+
+    if args.example or not args.config:
+        print(EXAMPLE_CONFIG)
+        return 0 if args.example else 1
+    try:
+        config = load_config(args.config)
+    except (OSError, ValueError, TypeError) as e:
+        print(f"설정 파일 오류: {e}", file=sys.stderr)
+        return 1
+    if args.record: config['record'] = args.record
+    output = args.output or config['output']
+
+    def on_log(msg, tag="INFO"):
+        print(f"{datetime.now():%H:%M:%S} [{tag}] {msg}", file=sys.stderr, flush=True)
+
+    def on_sample(group, values, ts, idx):
+        if output == "jsonl":
+            data = sample_values(group, values, idx)
+            print(json.dumps({"ts": round(ts, 3), "group": group.name, "changed": idx is not None,
+                              "values": {str(k): v for k, v in data.items()}}, ensure_ascii=False), flush=True)
+        elif output == "text":
+            print(f"{datetime.fromtimestamp(ts):%Y-%m-%d %H:%M:%S.%f}"[:-3] + " " + session.format(group, values, idx), flush=True)
+
+    session = PollSession(config, on_sample=on_sample, on_log=on_log)
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: session.stop())
+    timer = None
+    if args.duration:
+        timer = threading.Timer(args.duration, session.stop)
+        timer.daemon = True  # 중지/오류로 먼저 끝나도 타이머가 종료를 막지 않도록
+        timer.start()
+
+    done = threading.Event()
+    def metrics_loop():
+        while not done.wait(args.metrics_interval):
+            save_snapshot(session.snapshot(), args.metrics)
+    if args.metrics: threading.Thread(target=metrics_loop, daemon=True).start()
+    try:
+        session.run()
+    except RuntimeError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 1
+    finally:
+        done.set()
+        if timer: timer.cancel()
+        if args.metrics: save_snapshot(session.snapshot(), args.metrics)
+        on_log(session.metrics.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,13 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext, filedialog
+from tkinter import ttk, messagebox, filedialog
 import threading
-import time
-from datetime import datetime
+
+from .modbus_poll import AREA_LABELS
+from .ring_console import RingConsole
+from .change_filter import parse_deadbands
+from .modbus_connection import ConnectionPool
+from .poll_session import PollSession, make_group
+from .poll_metrics import save_snapshot
 
 # --- 외부 라이브러리 로딩 (상세 에러 출력 기능 추가) ---
 try:
@@ -19,8 +24,10 @@ class PLCLoggerGUI:
     def __init__(self, parent):
         self.parent = parent
         self.is_running = False
-        self.client = None
+        self.pool = ConnectionPool()  # 엔드포인트별 연결 (세션을 다시 시작해도 재사용)
+        self.session = None
         self.thread = None
+        self.poll_groups = []
         
         style = ttk.Style()
         style.configure("TLabel", font=("맑은 고딕", 10))
@@ -37,9 +44,14 @@ class PLCLoggerGUI:
         self.tcp_frame = ttk.Frame(settings_frame)
         self.tcp_frame.grid(row=1, column=0, columnspan=4, sticky="w", pady=5)
         ttk.Label(self.tcp_frame, text="IP 주소:").pack(side="left", padx=5)
-        self.ip_entry = ttk.Entry(self.tcp_frame, width=15); self.ip_entry.insert(0, "192.168.0.10"); self.ip_entry.pack(side="left")
+        self.ip_entry = ttk.Entry(self.tcp_frame, width=30); self.ip_entry.insert(0, "192.168.0.10"); self.ip_entry.pack(side="left")
         ttk.Label(self.tcp_frame, text="Port:").pack(side="left", padx=5)
         self.port_entry = ttk.Entry(self.tcp_frame, width=6); self.port_entry.insert(0, "502"); self.port_entry.pack(side="left")
+        # 비동기: 한 스레드에서 여러 IP(쉼표 구분)를 동시에, 연결당 depth개 요청을 파이프라인으로 전송
+        self.async_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.tcp_frame, text="비동기(파이프라인)", variable=self.async_var).pack(side="left", padx=(10, 2))
+        ttk.Label(self.tcp_frame, text="Depth:").pack(side="left", padx=2)
+        self.depth_entry = ttk.Entry(self.tcp_frame, width=4); self.depth_entry.insert(0, "4"); self.depth_entry.pack(side="left")
 
         self.rtu_frame = ttk.Frame(settings_frame)
         ttk.Label(self.rtu_frame, text="COM:").pack(side="left", padx=5)
@@ -53,7 +65,7 @@ class PLCLoggerGUI:
         read_frame.pack(fill="x", padx=10, pady=5)
         
         ttk.Label(read_frame, text="영역 선택:").grid(row=0, column=0, padx=5)
-        self.reg_type = ttk.Combobox(read_frame, values=["Holding Reg (4x)", "Input Reg (3x)", "Coils (0x)", "Discrete In (1x)"], width=15, state="readonly")
+        self.reg_type = ttk.Combobox(read_frame, values=AREA_LABELS, width=15, state="readonly")
         self.reg_type.current(0)
         self.reg_type.grid(row=0, column=1, padx=5)
 
@@ -65,6 +77,41 @@ class PLCLoggerGUI:
         self.count_entry = ttk.Entry(read_frame, width=5); self.count_entry.insert(0, "10"); self.count_entry.grid(row=0, column=7)
         ttk.Label(read_frame, text="주기(초):").grid(row=0, column=8, padx=5)
         self.interval_entry = ttk.Entry(read_frame, width=5); self.interval_entry.insert(0, "1.0"); self.interval_entry.grid(row=0, column=9)
+        # 태그 주소를 입력하면 시작 주소/개수 대신 흩어진 주소들을 최소 요청 수로 묶어서 읽음
+        ttk.Label(read_frame, text="태그 주소:").grid(row=1, column=0, padx=5, pady=(5, 0))
+        self.tags_entry = ttk.Entry(read_frame, width=40); self.tags_entry.grid(row=1, column=1, columnspan=5, sticky="w", pady=(5, 0))
+        ttk.Label(read_frame, text="최대 간격:").grid(row=1, column=6, padx=5, pady=(5, 0))
+        self.gap_entry = ttk.Entry(read_frame, width=5); self.gap_entry.insert(0, "10"); self.gap_entry.grid(row=1, column=7, pady=(5, 0))
+        # 바이너리 기록: 모든 샘플을 시각+값 블록으로 .etr 파일에 추가 (로그 창과 별개)
+        self.record_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(read_frame, text="바이너리 기록:", variable=self.record_var).grid(row=2, column=0, padx=5, pady=(5, 0))
+        self.record_entry = ttk.Entry(read_frame, width=40); self.record_entry.insert(0, "plc_log.etr")
+        self.record_entry.grid(row=2, column=1, columnspan=5, sticky="w", pady=(5, 0))
+        ttk.Button(read_frame, text="...", width=3, command=self.choose_record_file).grid(row=2, column=6, sticky="w", pady=(5, 0))
+        # 변경분만 로그: 예) "2" / "1%" / "2, 100:5%, 101:0" (주소:값 은 레지스터별 데드밴드)
+        self.change_only_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(read_frame, text="변경분만 로그", variable=self.change_only_var).grid(row=1, column=8, columnspan=2, sticky="w", pady=(5, 0))
+        ttk.Label(read_frame, text="데드밴드:").grid(row=2, column=7, padx=5, pady=(5, 0))
+        self.deadband_entry = ttk.Entry(read_frame, width=12); self.deadband_entry.insert(0, "0")
+        self.deadband_entry.grid(row=2, column=8, columnspan=2, sticky="w", pady=(5, 0))
+        # 태그 맵(CSV: 이름,주소,형식[,순서[,배율]])을 지정하면 필요한 레지스터만 읽어 INT32/FLOAT/문자열 등으로 해석
+        ttk.Label(read_frame, text="태그 맵:").grid(row=3, column=0, padx=5, pady=(5, 0))
+        self.tagmap_entry = ttk.Entry(read_frame, width=40)
+        self.tagmap_entry.grid(row=3, column=1, columnspan=5, sticky="w", pady=(5, 0))
+        ttk.Button(read_frame, text="...", width=3, command=self.choose_tag_map).grid(row=3, column=6, sticky="w", pady=(5, 0))
+
+        # 폴링 그룹 (비어 있으면 위 읽기 옵션 하나로 수집)
+        group_frame = ttk.LabelFrame(parent, text="폴링 그룹 (영역/국번/주소/주기별로 여러 개 동시 수집)", padding="5")
+        group_frame.pack(fill="x", padx=10, pady=5)
+        self.group_tree = ttk.Treeview(group_frame, columns=("area", "uid", "addr", "cnt", "sec"), show="headings", height=4)
+        for col, text, width in (("area", "영역", 130), ("uid", "국번", 60), ("addr", "시작 주소", 80), ("cnt", "개수", 60), ("sec", "주기(초)", 70)):
+            self.group_tree.heading(col, text=text)
+            self.group_tree.column(col, width=width, anchor="center")
+        self.group_tree.pack(side="left", fill="x", expand=True)
+        group_btns = ttk.Frame(group_frame)
+        group_btns.pack(side="left", padx=5)
+        ttk.Button(group_btns, text="그룹 추가", command=self.add_poll_group).pack(fill="x", pady=2)
+        ttk.Button(group_btns, text="선택 삭제", command=self.remove_poll_group).pack(fill="x", pady=2)
 
         # 버튼
         btn_frame = ttk.Frame(parent)
@@ -76,15 +123,22 @@ class PLCLoggerGUI:
         self.save_btn = tk.Button(btn_frame, text="로그 저장 (Save)", bg="#2196F3", fg="white", font=("맑은 고딕", 11, "bold"), command=self.save_log_to_file)
         self.save_btn.pack(side="left", fill="x", expand=True, padx=5)
 
+        # 통계 (1초마다 갱신: 처리량, 응답 시간 분포, 지터, 타임아웃/예외 코드, 주기 초과)
+        stats_frame = ttk.LabelFrame(parent, text="통계", padding="5")
+        stats_frame.pack(fill="x", padx=10, pady=5)
+        self.stats_var = tk.StringVar(value="-")
+        ttk.Label(stats_frame, textvariable=self.stats_var, font=("Consolas", 9)).pack(side="left", fill="x", expand=True)
+        ttk.Button(stats_frame, text="통계 저장", command=self.save_stats).pack(side="right", padx=2)
+        ttk.Button(stats_frame, text="초기화", command=self.reset_stats).pack(side="right", padx=2)
+        self.parent.after(1000, self.refresh_stats)
+
         # 로그
         log_frame = ttk.LabelFrame(parent, text="실시간 모니터링 로그", padding="5")
         log_frame.pack(fill="both", expand=True, padx=10, pady=5)
-        self.log_text = scrolledtext.ScrolledText(log_frame, state='disabled', height=15, font=("Consolas", 10))
-        self.log_text.pack(fill="both", expand=True)
-        self.log_text.tag_config("TX", foreground="blue")
-        self.log_text.tag_config("RX", foreground="green")
-        self.log_text.tag_config("ERR", foreground="red")
-        self.log_text.tag_config("INFO", foreground="black")
+        # 화면에는 최근 줄만, 전체 기록은 링 버퍼에 보관 (저장 시 링 버퍼 전체를 기록)
+        self.console = RingConsole(log_frame, tags={"TX": "blue", "RX": "green", "ERR": "red", "INFO": "black"},
+                                   height=15, font=("Consolas", 10))
+        self.console.pack(fill="both", expand=True)
 
         self.status_var = tk.StringVar(value="대기 중...")
         ttk.Label(parent, textvariable=self.status_var, relief="sunken", anchor="w").pack(side="bottom", fill="x")
@@ -101,24 +155,50 @@ class PLCLoggerGUI:
             self.tcp_frame.grid_forget()
             self.rtu_frame.grid(row=1, column=0, columnspan=4, sticky="w", pady=5)
 
+    def read_group_from_fields(self):
+        return make_group(self.reg_type.get(), unit=self.unit_id_entry.get(), period=self.interval_entry.get(),
+                          address=self.addr_entry.get(), count=self.count_entry.get(), tags=self.tags_entry.get().strip(),
+                          max_gap=self.gap_entry.get(), tag_map=self.tagmap_entry.get().strip())
+
+    def add_poll_group(self):
+        try:
+            g = self.read_group_from_fields()
+        except (ValueError, OSError) as e:
+            messagebox.showerror("입력 오류", f"읽기 옵션 값을 확인해주세요.\n{e}")
+            return
+        self.poll_groups.append(g)
+        addr = g.address if isinstance(g.addresses, range) else f"태그 {len(g.addresses)}개"
+        self.group_tree.insert("", "end", iid=str(id(g)), values=(self.reg_type.get(), g.unit, addr, g.count, g.period))
+
+    def remove_poll_group(self):
+        for item in self.group_tree.selection():
+            self.poll_groups = [g for g in self.poll_groups if str(id(g)) != item]
+            self.group_tree.delete(item)
+
     def log_msg(self, msg, tag="INFO"):
-        t = datetime.now().strftime("[%H:%M:%S] ")
-        def _append():
-            self.log_text.config(state='normal')
-            self.log_text.insert(tk.END, t + msg + "\n", tag)
-            self.log_text.see(tk.END)
-            self.log_text.config(state='disabled')
-        self.parent.after(0, _append)
+        self.console.write(msg, tag)
 
     def save_log_to_file(self):
         filename = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text files", "*.txt")])
         if filename:
             try:
-                content = self.log_text.get("1.0", tk.END)
-                with open(filename, 'w', encoding='utf-8') as f: f.write(content)
+                self.console.save(filename)
                 messagebox.showinfo("저장 완료", "로그가 저장되었습니다.")
             except Exception as e: messagebox.showerror("오류", f"저장 실패: {e}")
 
+    def choose_tag_map(self):
+        filename = filedialog.askopenfilename(filetypes=[("Tag Map", "*.csv"), ("All", "*.*")])
+        if filename:
+            self.tagmap_entry.delete(0, tk.END)
+            self.tagmap_entry.insert(0, filename)
+
+    def choose_record_file(self):
+        filename = filedialog.asksaveasfilename(defaultextension=".etr", filetypes=[("Sample Record", "*.etr")])
+        if filename:
+            self.record_entry.delete(0, tk.END)
+            self.record_entry.insert(0, filename)
+            self.record_var.set(True)
+
     def start_logging(self):
         try:
             config = {
@@ -127,11 +207,11 @@ class PLCLoggerGUI:
                 'port': int(self.port_entry.get()),
                 'com': self.com_entry.get(),
                 'baud': int(self.baud_combo.get()),
-                'uid': int(self.unit_id_entry.get()),
-                'addr': int(self.addr_entry.get()),
-                'cnt': int(self.count_entry.get()),
-                'sec': float(self.interval_entry.get()),
-                'type': self.reg_type.get()
+                'async': self.async_var.get(),
+                'depth': int(self.depth_entry.get()),
+                'record': self.record_entry.get() if self.record_var.get() else None,
+                'deadband': parse_deadbands(self.deadband_entry.get()) if self.change_only_var.get() else None,
+                'groups': list(self.poll_groups) or [self.read_group_from_fields()],
             }
         except:
             messagebox.showerror("입력 오류", "설정값을 확인해주세요.")
@@ -142,56 +222,45 @@ class PLCLoggerGUI:
         self.stop_btn.config(state="normal")
         self.status_var.set("상태: 실행 중...")
         
-        self.thread = threading.Thread(target=self.scan_loop, args=(config,), daemon=True)
+        self.session = PollSession(config, on_sample=self.on_sample, on_log=self.log_msg, pool=self.pool, on_state=self.on_conn_state)
+        self.thread = threading.Thread(target=self.scan_loop, daemon=True)
         self.thread.start()
 
     def stop_logging(self):
         self.is_running = False
+        if self.session: self.session.stop()
         self.log_msg("정지 요청됨.")
 
-    def scan_loop(self, config):
+    def scan_loop(self):
         try:
-            if config['mode'] == "TCP":
-                self.client = ModbusTcpClient(config['ip'], port=config['port'])
-            else:
-                # pymodbus 3.x 호환 (method='rtu' 대신 명시적 파라미터 사용 권장되나 호환성 유지 시도)
-                self.client = ModbusSerialClient(port=config['com'], baudrate=config['baud'], bytesize=8, parity='N', stopbits=1)
-            
-            if not self.client.connect():
-                self.log_msg(f"연결 실패: {config['mode']}", "ERR")
-                self.reset_ui()
-                return
-            
-            self.log_msg(f"연결 성공. ({config['type']} 수집)", "INFO")
-            
-            while self.is_running:
-                rr = None
-                t_str = config['type']
-                
-                # pymodbus 3.x에서는 slave=... 인자가 필수일 수 있음
-                if "Holding" in t_str:
-                    rr = self.client.read_holding_registers(config['addr'], count=config['cnt'], slave=config['uid'])
-                elif "Input Reg" in t_str:
-                    rr = self.client.read_input_registers(config['addr'], count=config['cnt'], slave=config['uid'])
-                elif "Coils" in t_str:
-                    rr = self.client.read_coils(config['addr'], count=config['cnt'], slave=config['uid'])
-                elif "Discrete" in t_str:
-                    rr = self.client.read_discrete_inputs(config['addr'], count=config['cnt'], slave=config['uid'])
-                
-                if not rr.isError():
-                    val = rr.bits if ("Coils" in t_str or "Discrete" in t_str) else rr.registers
-                    self.log_msg(f"주소 {config['addr']} ~ : {val}", "RX")
-                else:
-                    self.log_msg(f"읽기 실패: {rr}", "ERR")
-                
-                time.sleep(config['sec'])
-                
+            self.session.run()
         except Exception as e:
             self.log_msg(f"시스템 에러: {e}", "ERR")
         finally:
-            if self.client: self.client.close()
             self.reset_ui()
 
+    def on_sample(self, group, values, ts, idx):
+        self.log_msg(self.session.format(group, values, idx), "RX")
+
+    def on_conn_state(self, conn, msg):
+        self.parent.after(0, lambda: self.status_var.set("상태: 실행 중..." if conn.connected else f"상태: 재연결 대기 ({msg})"))
+
+    def refresh_stats(self):
+        if self.session: self.stats_var.set(self.session.metrics.summary())
+        self.parent.after(1000, self.refresh_stats)
+
+    def reset_stats(self):
+        if self.session: self.session.metrics.reset()
+
+    def save_stats(self):
+        if not self.session: return
+        filename = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if filename:
+            try:
+                save_snapshot(self.session.snapshot(), filename)
+                messagebox.showinfo("저장 완료", "통계가 저장되었습니다.")
+            except Exception as e: messagebox.showerror("오류", f"저장 실패: {e}")
+
     def reset_ui(self):
         self.parent.after(0, lambda: self._reset())
     def _reset(self):
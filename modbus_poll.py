@@ -0,0 +1,135 @@
+import time
+import heapq
+import threading
+
+from .modbus_connection import CONNECTION_ERRORS
+
+# 영역 키 -> (GUI 라벨, pymodbus 읽기 메서드, 비트 영역 여부)
+AREAS = {
+    "hr": ("Holding Reg (4x)", "read_holding_registers", False),
+    "ir": ("Input Reg (3x)", "read_input_registers", False),
+    "co": ("Coils (0x)", "read_coils", True),
+    "di": ("Discrete In (1x)", "read_discrete_inputs", True),
+}
+AREA_LABELS = [label for label, _, _ in AREAS.values()]
+# 영역 키 -> 읽기 함수 코드 (FC01~04)
+AREA_FC = {"co": 1, "di": 2, "hr": 3, "ir": 4}
+
+
+def area_from_label(label):
+    for key, (name, _, _) in AREAS.items():
+        if name == label or key == label: return key
+    raise ValueError(f"알 수 없는 영역: {label}")
+
+
+class ModbusReadError(Exception):
+    """ 장치가 예외 응답을 돌려준 경우 (연결 자체는 정상) """
+    def __init__(self, response, code=None):
+        super().__init__(str(response))
+        self.response = response
+        self.code = code if code is not None else getattr(response, "exception_code", None)
+
+
+def read_block(client, area, address, count, unit):
+    _, method, is_bit = AREAS[area]
+    rr = getattr(client, method)(address, count=count, slave=unit)
+    if rr.isError(): raise ModbusReadError(rr)
+    return rr.bits[:count] if is_bit else rr.registers
+
+
+class PollGroup:
+    def __init__(self, area, address, count, unit=1, period=1.0, name=None):
+        self.area = area
+        self.address = address
+        self.count = count
+        self.unit = unit
+        self.period = max(0.01, float(period))
+        self.name = name or f"{area.upper()} {address}+{count} #{unit}"
+        self.addresses = range(address, address + count)  # read() 결과 값과 같은 순서의 주소
+        self.tag_map = None  # 값을 형식 있는 태그로 해석할 TagMap (없으면 원시 값)
+        self.polls = 0
+        self.errors = 0
+        self.overruns = 0
+        self.last_latency = 0.0
+        self.last_lateness = 0.0  # 예정 시각 대비 실제 시작 지연 (지터)
+
+    def read(self, client):
+        return read_block(client, self.area, self.address, self.count, self.unit)
+
+
+class PollScheduler:
+    """
+    여러 폴링 그룹을 하나의 연결로 주기 실행합니다.
+    다음 실행 시각을 '시작 시각 + k * 주기'로 계산하므로 읽기 시간만큼 주기가 밀리지 않으며,
+    마감 시각 순 힙(heap)에서 가장 이른 그룹만 꺼내 실행합니다.
+    읽기가 길어져 다음 주기를 놓치면 밀린 주기는 건너뛰고 on_overrun(group, missed)으로 알립니다.
+    connection(ManagedConnection)을 주면 연결이 끊겨도 멈추지 않고 재연결될 때까지 기다렸다가 계속합니다.
+    run()은 블로킹이므로 별도 스레드에서 호출해야 합니다.
+    """
+    def __init__(self, client, groups, on_result, on_error=None, on_overrun=None, connection=None):
+        self.client = client
+        self.connection = connection
+        self.groups = list(groups)
+        self.on_result = on_result
+        self.on_error = on_error
+        self.on_overrun = on_overrun
+        self.is_running = False
+        self._wake = threading.Event()
+
+    def stop(self):
+        self.is_running = False
+        self._wake.set()
+
+    def run(self):
+        self.is_running = True
+        self._wake.clear()
+        origin = time.monotonic()
+        heap = [(origin, i, 0) for i in range(len(self.groups))]  # (마감 시각, 그룹 번호, 주기 번호 k)
+        heapq.heapify(heap)
+        while self.is_running and heap:
+            due, i, k = heap[0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                self._wake.wait(delay)
+                continue
+            heapq.heappop(heap)
+            group = self.groups[i]
+            group.last_lateness = time.monotonic() - due
+            self.poll(group)
+
+            k += 1
+            elapsed = time.monotonic() - origin
+            if k * group.period <= elapsed:
+                # 주기 초과: 밀린 주기는 건너뛰고 다음 정규 시각에 맞춤
+                late_k = int(elapsed // group.period) + 1
+                group.overruns += 1
+                if self.on_overrun: self.on_overrun(group, late_k - k)
+                k = late_k
+            heapq.heappush(heap, (origin + k * group.period, i, k))
+
+    def poll(self, group):
+        conn = self.connection
+        if conn is not None:
+            if not conn.ensure(self._wake): return  # 재연결 대기 중 정지 요청
+            self.client = conn.client
+        t0 = time.monotonic()
+        try:
+            values = group.read(self.client)
+        except ModbusReadError as e:
+            group.errors += 1
+            if conn is not None:
+                if e.code is None: conn.no_response()  # 예외 코드 없음 = 응답 없음
+                else: conn.got_response()
+            if self.on_error: self.on_error(group, e)
+            return
+        except CONNECTION_ERRORS as e:
+            if conn is None: raise
+            group.errors += 1
+            conn.mark_down(e)
+            if self.on_error: self.on_error(group, e)
+            return
+        finally:
+            group.last_latency = time.monotonic() - t0
+        if conn is not None: conn.got_response()
+        group.polls += 1
+        self.on_result(group, values, time.time())
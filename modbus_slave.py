@@ -2,6 +2,13 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 import threading
 
+from .modbus_poll import area_from_label
+from .slave_datastore import SlaveDatastore, AreaBlock, parse_memory_map
+from .shared_image import SharedImage
+from .virtual_grid import VirtualGrid
+from .sim_engine import SimEngine, parse_rules, SIM_EXAMPLE
+from .async_slave_server import AsyncModbusTcpServer
+
 # --- 외부 라이브러리 로딩 (pymodbus 3.x 및 하위 호환성 강화) ---
 MODBUS_SERVER_AVAILABLE = False
 try:
@@ -31,12 +38,18 @@ class ModbusSlaveGUI:
     def __init__(self, parent):
         self.parent = parent
         self.parent.title("가상 PLC 시뮬레이터 (Modbus Slave)")
-        self.parent.geometry("600x750")
+        self.parent.geometry("640x900")
         
         self.server_thread = None
         self.is_server_running = False
         self.context = None
-        self.auto_sim_active = False
+        self.async_server = None  # asyncio TCP 서버 (고성능 모드)
+        self.server_snap = None
+        self.datastore = None
+        self.image = None  # 공유 메모리 이미지 (외부 프로세스가 값을 씀)
+        self.monitor = None  # 그리드에 표시하는 (국번, 영역, 시작 주소, 개수)
+        self.monitor_version = -1  # 마지막으로 확인한 모니터 영역의 변경 번호
+        self.sim = None  # 시뮬레이션 엔진 (별도 스레드)
 
         # --- 설정 UI ---
         settings_frame = ttk.LabelFrame(parent, text="슬레이브 설정", padding="10")
@@ -45,6 +58,7 @@ class ModbusSlaveGUI:
         self.mode_var = tk.StringVar(value="TCP")
         ttk.Radiobutton(settings_frame, text="TCP 서버", variable=self.mode_var, value="TCP", command=self.update_ui_state).grid(row=0, column=0, padx=5, sticky="w")
         ttk.Radiobutton(settings_frame, text="시리얼 슬레이브 (RTU)", variable=self.mode_var, value="RTU", command=self.update_ui_state).grid(row=0, column=1, padx=5, sticky="w")
+        ttk.Radiobutton(settings_frame, text="TCP 고성능 (asyncio)", variable=self.mode_var, value="ATCP", command=self.update_ui_state).grid(row=0, column=2, padx=5, sticky="w")
 
         # 연결 파라미터
         self.conn_frame = ttk.Frame(settings_frame)
@@ -59,6 +73,12 @@ class ModbusSlaveGUI:
         self.cmb_baud = ttk.Combobox(self.conn_frame, values=["9600","19200","38400","115200"], width=8)
         self.cmb_baud.current(0)
 
+        # asyncio 모드: 동시 연결 한도, 유휴 연결 종료 시간 (0 = 무제한)
+        self.lbl_maxconn = ttk.Label(self.conn_frame, text="최대 연결:")
+        self.ent_maxconn = ttk.Entry(self.conn_frame, width=6); self.ent_maxconn.insert(0, "500")
+        self.lbl_idle = ttk.Label(self.conn_frame, text="유휴 종료(초):")
+        self.ent_idle = ttk.Entry(self.conn_frame, width=6); self.ent_idle.insert(0, "60")
+
         # 메모리 파라미터
         self.param_frame = ttk.Frame(settings_frame)
         self.param_frame.grid(row=2, column=0, columnspan=6, sticky="w", pady=5)
@@ -76,6 +96,17 @@ class ModbusSlaveGUI:
         ttk.Label(self.param_frame, text="개수:").pack(side="left", padx=5)
         self.ent_qty = ttk.Entry(self.param_frame, width=5); self.ent_qty.insert(0, "10"); self.ent_qty.pack(side="left")
 
+        # 메모리 맵: 여러 국번/영역을 동시에 제공 (비우면 위 ID/영역/주소/개수 한 구간만 생성, 위 설정은 모니터링 범위)
+        self.map_frame = ttk.Frame(settings_frame)
+        self.map_frame.grid(row=3, column=0, columnspan=6, sticky="w", pady=5)
+        ttk.Label(self.map_frame, text="메모리 맵:").pack(side="left", padx=5)
+        self.ent_map = ttk.Entry(self.map_frame, width=55); self.ent_map.pack(side="left")
+        # 공유 메모리: 켜면 메모리를 공유 메모리(또는 경로를 주면 mmap 파일)에 두어 외부 프로세스가 직접 값을 쓸 수 있음
+        self.chk_shared = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.map_frame, text="공유 메모리", variable=self.chk_shared).pack(side="left", padx=(10, 2))
+        self.ent_shared = ttk.Entry(self.map_frame, width=14); self.ent_shared.insert(0, "engtool_plc"); self.ent_shared.pack(side="left")
+        ttk.Label(settings_frame, text="예) 1-3: hr 0-999 ir 0-99 co 0-63; 10: hr 1000-1999 di 0-15", foreground="gray").grid(row=4, column=0, columnspan=6, sticky="w", padx=5)
+
         # 버튼
         btn_frame = ttk.Frame(parent)
         btn_frame.pack(fill="x", padx=10)
@@ -85,44 +116,60 @@ class ModbusSlaveGUI:
         self.btn_stop.pack(side="left", fill="x", expand=True, padx=5)
 
         # 시뮬레이션 설정
-        sim_frame = ttk.LabelFrame(parent, text="자동 시뮬레이션 (값 자동 증가)", padding="5")
+        # 규칙을 비우면 모니터링 범위를 틱마다 1씩 증가 (ramp)
+        sim_frame = ttk.LabelFrame(parent, text="자동 시뮬레이션 (sine / ramp / walk / step / replay)", padding="5")
         sim_frame.pack(fill="x", padx=10, pady=5)
         self.chk_auto = tk.BooleanVar(value=False)
-        ttk.Checkbutton(sim_frame, text="동작", variable=self.chk_auto, command=self.toggle_auto_sim).pack(side="left", padx=10)
-        ttk.Label(sim_frame, text="주기(초):").pack(side="left")
-        self.ent_sim_int = ttk.Entry(sim_frame, width=5); self.ent_sim_int.insert(0, "1.0"); self.ent_sim_int.pack(side="left", padx=5)
+        ttk.Checkbutton(sim_frame, text="동작", variable=self.chk_auto, command=self.toggle_auto_sim).grid(row=0, column=0, padx=10)
+        ttk.Label(sim_frame, text="주기(초):").grid(row=0, column=1)
+        self.ent_sim_int = ttk.Entry(sim_frame, width=5); self.ent_sim_int.insert(0, "1.0"); self.ent_sim_int.grid(row=0, column=2, padx=5)
+        ttk.Label(sim_frame, text="규칙:").grid(row=0, column=3)
+        self.ent_sim_rules = ttk.Entry(sim_frame, width=45); self.ent_sim_rules.grid(row=0, column=4, padx=5)
+        ttk.Label(sim_frame, text=f"예) {SIM_EXAMPLE}", foreground="gray").grid(row=1, column=0, columnspan=5, sticky="w", padx=5)
+        self.sim_var = tk.StringVar(value="")
+        ttk.Label(sim_frame, textvariable=self.sim_var, foreground="gray").grid(row=2, column=0, columnspan=5, sticky="w", padx=5)
 
         # 데이터 그리드
-        grid_frame = ttk.LabelFrame(parent, text="메모리 모니터링 (더블 클릭하여 수정)", padding="5")
+        grid_frame = self.grid_frame = ttk.LabelFrame(parent, text="메모리 모니터링 (더블 클릭하여 수정)", padding="5")
         grid_frame.pack(fill="both", expand=True, padx=10, pady=5)
         
-        self.tree = ttk.Treeview(grid_frame, columns=("addr", "val", "hex"), show="headings", height=10)
-        self.tree.heading("addr", text="주소")
-        self.tree.heading("val", text="값 (DEC / Bool)")
-        self.tree.heading("hex", text="값 (HEX)")
-        self.tree.column("addr", width=100, anchor="center")
-        self.tree.column("val", width=150, anchor="center")
-        self.tree.column("hex", width=150, anchor="center")
-        
-        vsb = ttk.Scrollbar(grid_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=vsb.set)
-        self.tree.pack(side="left", fill="both", expand=True)
-        vsb.pack(side="right", fill="y")
-        
-        self.tree.bind("<Double-1>", self.on_double_click)
+        # 보이는 줄만 만드는 가상 그리드 (개수가 수만 개여도 화면 줄 수만큼만 갱신)
+        self.grid = VirtualGrid(grid_frame, ("addr", "val", "hex"), ("주소", "값 (DEC / Bool)", "값 (HEX)"),
+                                (100, 150, 150), fetch=self.fetch_rows, height=10)
+        self.grid.pack(fill="both", expand=True)
+        self.grid.bind("<Double-1>", self.on_double_click)
+
+        # 연결 통계 (asyncio 모드): 요약 + 연결별 요청 수/처리 시간
+        stats_frame = ttk.LabelFrame(parent, text="클라이언트 연결 (asyncio 모드)", padding="5")
+        stats_frame.pack(fill="x", padx=10, pady=5)
+        stats_top = ttk.Frame(stats_frame)
+        stats_top.pack(fill="x")
+        self.server_var = tk.StringVar(value="-")
+        ttk.Label(stats_top, textvariable=self.server_var, foreground="gray", wraplength=480).pack(side="left", fill="x", expand=True)
+        ttk.Button(stats_top, text="초기화", width=6, command=self.reset_server_stats).pack(side="right")
+        self.client_grid = VirtualGrid(stats_frame, ("peer", "time", "req", "err", "p50", "p99", "max"),
+                                       ("클라이언트", "연결(초)", "요청", "예외", "p50 ms", "p99 ms", "max ms"),
+                                       (130, 60, 70, 50, 60, 60, 60), fetch=self.fetch_clients, height=4)
+        self.client_grid.pack(fill="x")
 
-        self.update_ui_state()
-        
         if not MODBUS_SERVER_AVAILABLE:
-            self.btn_start.config(state="disabled")
-            messagebox.showerror("오류", "pymodbus 라이브러리 로드 실패.\n'pip install pymodbus pyserial'을 확인해주세요.")
+            # pymodbus 없이도 asyncio TCP 모드는 동작
+            self.mode_var.set("ATCP")
+            messagebox.showwarning("알림", "pymodbus 라이브러리 로드 실패. TCP 고성능(asyncio) 모드만 사용할 수 있습니다.\n"
+                                         "'pip install pymodbus pyserial'을 확인해주세요.")
+        self.update_ui_state()
 
     def update_ui_state(self):
         for widget in self.conn_frame.winfo_children():
             widget.pack_forget()
-        if self.mode_var.get() == "TCP":
+        if self.mode_var.get() in ("TCP", "ATCP"):
             self.lbl_port.pack(side="left", padx=5)
             self.ent_port.pack(side="left")
+            if self.mode_var.get() == "ATCP":
+                self.lbl_maxconn.pack(side="left", padx=5)
+                self.ent_maxconn.pack(side="left")
+                self.lbl_idle.pack(side="left", padx=5)
+                self.ent_idle.pack(side="left")
         else:
             self.lbl_com.pack(side="left", padx=5)
             self.ent_com.pack(side="left")
@@ -130,37 +177,45 @@ class ModbusSlaveGUI:
             self.cmb_baud.pack(side="left")
 
     def init_datastore(self):
-        if not MODBUS_SERVER_AVAILABLE:
+        if not MODBUS_SERVER_AVAILABLE and self.mode_var.get() != "ATCP":
             messagebox.showerror("오류", "라이브러리가 로드되지 않았습니다.")
             return False
 
         try:
+            uid = int(self.ent_uid.get())
             raw_addr = int(self.ent_addr.get())
             qty = int(self.ent_qty.get())
-            t_str = self.mem_type.get()
-            
-            # 데이터 블록 생성
-            block = ModbusSequentialDataBlock(raw_addr, [0]*qty)
-
-            # 슬레이브 컨텍스트 생성 (선택된 타입만 블록 할당)
-            store = ModbusSlaveContext(
-                hr=block if "Holding" in t_str else None,
-                ir=block if "Input Reg" in t_str else None,
-                co=block if "Coils" in t_str else None,
-                di=block if "Discrete" in t_str else None,
-            )
-
-            # [수정] GUI에서 직접 데이터에 접근할 수 있도록 슬레이브 컨텍스트를 인스턴스 변수에 저장
-            self.slave_context = store
-
-            # [핵심] 단일 컨텍스트 모드 (single=True)
-            self.context = ModbusServerContext(slaves=self.slave_context, single=True)
+            area = area_from_label(self.mem_type.get())
+            if qty < 1: raise ValueError("개수는 1 이상이어야 합니다.")
+
+            # 메모리 생성 (국번 x 영역별 희소 구간, array('H') / 비트 압축 저장)
+            map_text = self.ent_map.get().strip() or f"{uid}: {area} {raw_addr}-{raw_addr + qty - 1}"
+            self.close_image()
+            if self.chk_shared.get():
+                # 공유 이미지를 저장소로 사용 (복사 없이 서버가 이미지에서 바로 응답)
+                self.image = SharedImage.create(parse_memory_map(map_text), self.ent_shared.get().strip() or "engtool_plc")
+                self.datastore = self.image.datastore()
+            else:
+                self.datastore = SlaveDatastore.parse(map_text)
+            monitored = self.datastore.area(uid, area)
+            if monitored is None or monitored.find(raw_addr, qty) is None:
+                raise ValueError(f"모니터링 범위(ID {uid}, {area.upper()} {raw_addr}~{raw_addr + qty - 1})가 메모리 맵에 없습니다.")
+            self.monitor = (uid, area, raw_addr, qty)
+
+            # 국번별 슬레이브 컨텍스트 (zero_mode: 요청 주소 = 메모리 주소), 여러 국번 동시 응답 (single=False)
+            # (asyncio 모드는 저장소에서 바로 응답하므로 컨텍스트 불필요)
+            if self.mode_var.get() != "ATCP":
+                slaves = {unit: ModbusSlaveContext(zero_mode=True, **{key: AreaBlock(a, self.datastore.lock) for key, a in areas.items()})
+                          for unit, areas in self.datastore.units.items()}
+                self.context = ModbusServerContext(slaves=slaves, single=False)
+            # 메모리 요약은 모니터링 창 제목에 표시
+            info = self.datastore.describe()
+            if self.image: info += f", 공유 메모리 {self.image.name} ({len(self.image.buf)} bytes)"
+            self.grid_frame.config(text=f"메모리 모니터링 (더블 클릭하여 수정) - {info}")
             
             # 그리드 초기화
-            self.tree.delete(*self.tree.get_children())
-            for i in range(qty):
-                ui_addr = raw_addr + i
-                self.tree.insert("", "end", iid=str(i), values=(ui_addr, 0, "0x0000"))
+            self.monitor_version = -1
+            self.grid.set_rows(qty)
             return True
         except Exception as e:
             messagebox.showerror("설정 오류", f"초기화 실패:\n{str(e)}")
@@ -170,6 +225,16 @@ class ModbusSlaveGUI:
         if not self.init_datastore(): return
 
         mode = self.mode_var.get()
+        self.async_server = None
+        if mode == "ATCP":
+            try:
+                self.async_server = AsyncModbusTcpServer(self.datastore, port=int(self.ent_port.get()),
+                                                         max_connections=int(self.ent_maxconn.get()),
+                                                         idle_timeout=float(self.ent_idle.get()))
+            except ValueError as e:
+                messagebox.showerror("설정 오류", f"asyncio 서버 설정 오류:\n{e}")
+                return
+            self.parent.after(1000, self.refresh_server_stats)
         self.is_server_running = True
         self.btn_start.config(state="disabled")
         self.btn_stop.config(state="normal")
@@ -182,7 +247,9 @@ class ModbusSlaveGUI:
 
     def run_server_thread(self, mode):
         try:
-            if mode == "TCP":
+            if mode == "ATCP":
+                self.async_server.run()
+            elif mode == "TCP":
                 port = int(self.ent_port.get())
                 StartTcpServer(context=self.context, address=("0.0.0.0", port))
             else:
@@ -195,112 +262,121 @@ class ModbusSlaveGUI:
             self.is_server_running = False
 
     def stop_server(self):
-        if self.is_server_running:
+        if self.async_server:
+            self.async_server.stop()
+            self.server_thread.join(timeout=2)  # 진행 중인 응답이 끝난 뒤 메모리(공유 이미지)를 닫도록
+        elif self.is_server_running:
             try:
                 ServerStop()
             except Exception as e:
                 print(f"서버 중지 오류: {e}")
         
         self.is_server_running = False
+        self.stop_sim()
+        self.close_image()
         self.btn_start.config(state="normal")
         self.btn_stop.config(state="disabled")
         self.chk_auto.set(False)
         messagebox.showinfo("알림", "서버가 중지되었습니다.")
 
-    def get_slave_context(self):
-        """ [수정] 명시적으로 저장된 슬레이브 컨텍스트를 반환하는 함수 """
-        return self.slave_context
+    def refresh_server_stats(self):
+        server = self.async_server
+        if not server: return
+        self.server_snap = server.snapshot()
+        self.server_var.set(server.summary(self.server_snap))
+        self.client_grid.set_rows(len(self.server_snap["clients"]), keep_offset=True)
+        if self.is_server_running: self.parent.after(1000, self.refresh_server_stats)
+
+    def fetch_clients(self, first, n):
+        """ 연결 통계 표에 보이는 줄 (요청 수 많은 순) """
+        if not self.server_snap: return []
+        return [(c["peer"], c["connected"], c["requests"], c["errors"], c["p50"], c["p99"], c["max"])
+                for c in self.server_snap["clients"][first:first + n]]
+
+    def reset_server_stats(self):
+        if self.async_server: self.async_server.reset()
+
+    def close_image(self):
+        if self.image:
+            self.datastore = None
+            self.context = None
+            self.image.close()
+            self.image = None
 
     def refresh_ui(self):
         if not self.is_server_running: return
         
         try:
-            # [수정] 컨텍스트 접근 방식 개선
-            slave = self.get_slave_context()
-            if not slave: return
-
-            t_str = self.mem_type.get()
-            addr = int(self.ent_addr.get())
-            qty = int(self.ent_qty.get())
-            
-            fc = 3
-            if "Holding" in t_str: fc = 3
-            elif "Input Reg" in t_str: fc = 4
-            elif "Coils" in t_str: fc = 1
-            elif "Discrete" in t_str: fc = 2
-            
-            values = slave.getValues(fc, addr, count=qty)
-            
-            for i, val in enumerate(values):
-                if self.tree.exists(str(i)):
-                    current = self.tree.item(str(i))['values']
-                    if current[1] != val:
-                        ui_addr = current[0]
-                        val_int = int(val)
-                        self.tree.item(str(i), values=(ui_addr, val_int, f"0x{val_int:04X}"))
+            if not self.datastore: return
+            uid, key, addr, qty = self.monitor
+            area = self.datastore.area(uid, key)
+            # 변경이 없으면 아무것도 읽지 않고, 있으면 보이는 줄에 걸린 블록이 바뀐 경우만 다시 읽음
+            # (공유 메모리는 외부 프로세스가 표시 없이 쓰므로 보이는 줄을 매번 비교)
+            if self.image or area.version != self.monitor_version:
+                self.monitor_version = area.version
+                with self.datastore.lock:
+                    changed = area.take_dirty(addr + self.grid.offset, self.grid.visible)
+                if changed or self.image: self.grid.refresh()
         except: pass
         
         self.parent.after(500, self.refresh_ui)
 
+    def fetch_rows(self, first, n):
+        """ 그리드에 보이는 줄 값 (주소, 값, HEX) """
+        if not self.datastore or not self.monitor: return []
+        uid, key, addr, qty = self.monitor
+        with self.datastore.lock:
+            values = self.datastore.get(uid, key, addr + first, n)
+        return [(addr + first + i, int(v), f"0x{int(v):04X}") for i, v in enumerate(values)]
+
     def toggle_auto_sim(self):
         if self.chk_auto.get() and self.is_server_running:
-            if not self.auto_sim_active:
-                self.auto_sim_active = True
-                self.sim_loop()
+            if self.sim and self.sim.is_running: return
+            try:
+                uid, area, addr, qty = self.monitor
+                rules_text = self.ent_sim_rules.get().strip() or f"{uid} {area} {addr}-{addr + qty - 1} ramp"
+                self.sim = SimEngine(self.datastore, parse_rules(rules_text), interval=float(self.ent_sim_int.get()))
+            except Exception as e:
+                self.chk_auto.set(False)
+                messagebox.showerror("시뮬레이션 설정 오류", str(e))
+                return
+            self.sim.start()
+            self.update_sim_status(self.sim)
         else:
-            self.auto_sim_active = False
+            self.stop_sim()
 
-    def sim_loop(self):
-        if not self.auto_sim_active or not self.is_server_running: return
-        try:
-            slave = self.get_slave_context()
-            if not slave: return
-            
-            t_str = self.mem_type.get()
-            addr = int(self.ent_addr.get())
-            qty = int(self.ent_qty.get())
-            
-            fc = 3
-            if "Holding" in t_str: fc = 3
-            elif "Input Reg" in t_str: fc = 4
-            elif "Coils" in t_str: fc = 1
-            elif "Discrete" in t_str: fc = 2
-
-            current_vals = slave.getValues(fc, addr, count=qty)
-            new_vals = [(v + 1) % 65535 for v in current_vals]
-            slave.setValues(fc, addr, new_vals)
-            
-            interval = float(self.ent_sim_int.get())
-            self.parent.after(int(interval * 1000), self.sim_loop)
-        except:
-            self.auto_sim_active = False
+    def stop_sim(self):
+        if self.sim:
+            self.sim.stop()
+            self.sim_var.set(self.sim.describe() + " - 정지")
+            self.sim = None
+
+    def update_sim_status(self, sim):
+        # 엔진 스레드는 Tk를 건드리지 않으므로 상태/오류는 여기서 주기적으로 확인
+        if self.sim is not sim: return
+        if self.sim.error:
+            err = self.sim.error
+            self.chk_auto.set(False)
+            self.stop_sim()
+            messagebox.showerror("시뮬레이션 오류", str(err))
+            return
+        self.sim_var.set(self.sim.describe())
+        self.parent.after(1000, self.update_sim_status, sim)
 
     def on_double_click(self, event):
         if not self.is_server_running: return
-        item_id = self.tree.identify_row(event.y)
-        if not item_id: return
+        row = self.grid.row_index(event.y)
+        if row is None: return
         
-        current_vals = self.tree.item(item_id)['values']
-        try:
-            addr = int(current_vals[0])
-            val = int(current_vals[1])
-        except ValueError:
-            return
+        addr, val, _ = self.fetch_rows(row, 1)[0]
         
         new_val = simpledialog.askinteger("값 수정", f"{addr}번지의 새 값:", initialvalue=val, minvalue=0, maxvalue=65535)
         
         if new_val is not None:
             try:
-                slave = self.get_slave_context()
-                t_str = self.mem_type.get()
-                
-                fc = 3
-                if "Holding" in t_str: fc = 3
-                elif "Input Reg" in t_str: fc = 4
-                elif "Coils" in t_str: fc = 1
-                elif "Discrete" in t_str: fc = 2 
-                
-                slave.setValues(fc, addr, [new_val])
-                self.tree.item(item_id, values=(addr, new_val, f"0x{new_val:04X}"))
+                uid, area, _, _ = self.monitor
+                with self.datastore.lock:  # 시뮬레이션/서버 스레드와 같은 잠금
+                    self.datastore.set(uid, area, addr, [new_val])
+                self.grid.refresh()
             except Exception as e:
                 messagebox.showerror("오류", str(e))
@@ -0,0 +1,80 @@
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+# "192.168.0.1   00-11-22-33-44-55" (Windows) / "? (192.168.0.1) at 0:11:22:33:44:55 on en0" (macOS/BSD)
+_ARP_LINE = re.compile(r"\(?(\d{1,3}(?:\.\d{1,3}){3})\)?\s+(?:at\s+)?([0-9a-fA-F]{1,2}(?:[-:][0-9a-fA-F]{1,2}){5})")
+_INVALID_MACS = ("00:00:00:00:00:00", "ff:ff:ff:ff:ff:ff")
+
+
+def normalize_mac(mac):
+    return ":".join(f"{int(x, 16):02x}" for x in re.split(r"[-:]", mac))
+
+
+class NeighborTable:
+    """
+    OS의 ARP(이웃) 테이블 전체를 한 번에 읽어 IP -> MAC 딕셔너리로 보관합니다.
+    리눅스는 /proc/net/arp 파일을 읽고, 그 외 OS는 'arp -a'를 한 번만 실행합니다.
+    """
+    PROC_PATH = "/proc/net/arp"
+
+    def __init__(self):
+        self.table = {}
+        self.updated = 0.0
+        self.lock = threading.Lock()
+
+    def refresh(self, max_age=None):
+        """ 테이블 다시 읽기. max_age가 있으면 잠금을 잡은 뒤 스냅샷이 그보다 오래됐을 때만 읽음 """
+        with self.lock:
+            if max_age is not None and time.monotonic() - self.updated <= max_age:
+                return len(self.table)  # 기다리는 동안 다른 스레드가 갱신함
+            try:
+                if os.path.exists(self.PROC_PATH):
+                    table = self._read_proc()
+                else:
+                    table = self._read_arp_command()
+            except Exception as e:
+                print(f"ARP 테이블 읽기 실패: {e}")
+                return len(self.table)
+            self.table = table
+            self.updated = time.monotonic()
+            return len(table)
+
+    def lookup(self, ip, max_age=None):
+        """ 테이블에 없고 스냅샷이 max_age(초)보다 오래됐으면 한 번 갱신 후 다시 조회 """
+        mac = self.table.get(ip)
+        if mac is None and max_age is not None and time.monotonic() - self.updated > max_age:
+            self.refresh(max_age)
+            mac = self.table.get(ip)
+        return mac
+
+    def _read_proc(self):
+        table = {}
+        with open(self.PROC_PATH, encoding="ascii", errors="ignore") as f:
+            next(f, None)  # 헤더
+            for line in f:
+                cols = line.split()
+                # IP, HW type, Flags, HW address, Mask, Device / Flags 0x0 = 미완료 항목
+                if len(cols) < 4 or cols[2] == "0x0": continue
+                mac = cols[3].lower()
+                if mac not in _INVALID_MACS: table[cols[0]] = mac
+        return table
+
+    def _read_arp_command(self):
+        kwargs = {}
+        if sys.platform == "win32":
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            kwargs["startupinfo"] = startupinfo
+            cmd = ["arp", "-a"]
+        else:
+            cmd = ["arp", "-an"]
+        output = subprocess.check_output(cmd, **kwargs).decode("cp949" if sys.platform == "win32" else "utf-8", errors="ignore")
+        table = {}
+        for m in _ARP_LINE.finditer(output):
+            mac = normalize_mac(m.group(2))
+            if mac not in _INVALID_MACS: table[m.group(1)] = mac
+        return table
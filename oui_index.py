@@ -0,0 +1,137 @@
+"""
+OUI(MAC 앞 24비트) -> 제조사 인덱스.
+
+파일 구조 (리틀 엔디안, 재파싱 없이 mmap 후 바로 조회):
+    헤더     : b"OUI1" + uint32 N(항목 수) + uint32 V(제조사 수)
+    prefixes : uint32 * N   정렬된 24비트 OUI
+    vendors  : uint16 * N   각 OUI의 제조사 번호 (문자열 중복 저장 없음, N이 홀수면 2바이트 패딩)
+    offsets  : uint32 * (V+1) 제조사 문자열 시작 위치
+    strings  : UTF-8 문자열 모음
+
+인덱스 재생성:
+    python -m modules.oui_index oui.txt [출력파일]
+    (IEEE oui.txt 형식 "00-00-0C   (hex)   Cisco" 또는 "00:00:0C:Cisco" 형식 모두 지원)
+"""
+import os
+import re
+import sys
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+
+MAGIC = b"OUI1"
+HEADER = struct.Struct("<4sII")
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "engtool-oui.bin")
+# mac_vendor_lookup 라이브러리가 내려받아 두는 원본 파일 (있으면 인덱스 생성에 사용)
+MAC_VENDORS_TXT = os.path.join(os.path.expanduser("~"), ".cache", "mac-vendors.txt")
+
+_IEEE_LINE = re.compile(r"^\s*([0-9A-Fa-f]{2})[-:]?([0-9A-Fa-f]{2})[-:]?([0-9A-Fa-f]{2})\s*(?:\(hex\)|\(base 16\)|:)\s*(.+?)\s*$")
+
+
+def parse_oui_text(lines):
+    """ OUI 텍스트에서 (prefix, vendor) 를 추출 """
+    for line in lines:
+        m = _IEEE_LINE.match(line)
+        if not m or "(base 16)" in line: continue
+        vendor = m.group(4).strip()
+        if vendor:
+            yield int(m.group(1) + m.group(2) + m.group(3), 16), vendor
+
+
+def build_index(entries, path):
+    """ (prefix, vendor) 목록으로 인덱스 파일 생성. 저장된 항목 수를 반환 """
+    table = {}
+    for prefix, vendor in entries:
+        table.setdefault(prefix, vendor)  # 중복 OUI는 처음 것 유지
+
+    names, name_ids = [], {}
+    prefixes, vendor_ids = array("I"), array("H")
+    for prefix in sorted(table):
+        vendor = table[prefix]
+        if vendor not in name_ids:
+            name_ids[vendor] = len(names)
+            names.append(vendor)
+        prefixes.append(prefix)
+        vendor_ids.append(name_ids[vendor])
+
+    blobs = [n.encode("utf-8") for n in names]
+    offsets = array("I", [0])
+    for b in blobs: offsets.append(offsets[-1] + len(b))
+
+    if sys.byteorder != "little":
+        for a in (prefixes, vendor_ids, offsets): a.byteswap()
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(prefixes), len(names)))
+        f.write(prefixes.tobytes())
+        f.write(vendor_ids.tobytes())
+        if len(vendor_ids) % 2: f.write(b"\0\0")
+        f.write(offsets.tobytes())
+        f.write(b"".join(blobs))
+    os.replace(tmp, path)
+    return len(prefixes)
+
+
+class OuiIndex:
+    """ mmap 기반 읽기 전용 인덱스. 조회 시 잠금이 필요 없습니다. """
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.cache = {}  # 스캔 단위 조회 캐시 (clear_cache()로 초기화)
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n, v = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or sys.byteorder != "little":
+            self.mm.close()
+            raise ValueError(f"지원하지 않는 OUI 인덱스: {path}")
+        view = memoryview(self.mm)
+        pos = HEADER.size
+        self.prefixes = view[pos:pos + 4 * n].cast("I"); pos += 4 * n
+        self.vendor_ids = view[pos:pos + 2 * n].cast("H"); pos += 2 * n + (2 * n) % 4
+        self.offsets = view[pos:pos + 4 * (v + 1)].cast("I"); pos += 4 * (v + 1)
+        self.strings_pos = pos
+
+    def __len__(self):
+        return len(self.prefixes)
+
+    def vendor_name(self, vid):
+        start = self.strings_pos + self.offsets[vid]
+        end = self.strings_pos + self.offsets[vid + 1]
+        return self.mm[start:end].decode("utf-8", errors="replace")
+
+    def lookup(self, mac):
+        """ 'aa:bb:cc:dd:ee:ff' 형식 MAC의 제조사. 없으면 None """
+        key = mac[:8]
+        if key in self.cache: return self.cache[key]
+        try:
+            prefix = int(key.replace(":", "").replace("-", ""), 16)
+        except ValueError:
+            return None
+        i = bisect_left(self.prefixes, prefix)
+        vendor = self.vendor_name(self.vendor_ids[i]) if i < len(self.prefixes) and self.prefixes[i] == prefix else None
+        self.cache[key] = vendor
+        return vendor
+
+    def clear_cache(self):
+        self.cache = {}
+
+
+def load_or_build(path=DEFAULT_PATH, source=MAC_VENDORS_TXT):
+    """ 인덱스를 열고, 없으면 원본 텍스트(source)가 있을 때 한 번 생성합니다. 둘 다 없으면 None """
+    if not os.path.exists(path):
+        if not os.path.exists(source): return None
+        with open(source, encoding="utf-8", errors="ignore") as f:
+            build_index(parse_oui_text(f), path)
+    return OuiIndex(path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("사용법: python -m modules.oui_index <oui.txt> [출력파일]")
+        sys.exit(1)
+    out = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PATH
+    with open(sys.argv[1], encoding="utf-8", errors="ignore") as f:
+        count = build_index(parse_oui_text(f), out)
+    print(f"{count}개 OUI -> {out}")
@@ -0,0 +1,154 @@
+import os
+import json
+import time
+import asyncio
+import threading
+from collections import Counter, deque
+
+from .modbus_poll import ModbusReadError
+
+SUB_BITS = 5  # 2의 거듭제곱 구간마다 32개 버킷 -> 상대 오차 약 3%
+
+
+class LatencyHistogram:
+    """
+    HDR 방식(로그-선형) 지연 시간 히스토그램. 값은 마이크로초 정수로 기록합니다.
+    2^k ~ 2^(k+1) 구간을 2^SUB_BITS개의 같은 폭 버킷으로 나누므로
+    1us ~ 수십 초 범위를 버킷 수백 개로 일정한 상대 오차 안에서 기록합니다.
+    """
+    def __init__(self, highest=60.0):
+        self.sub = 1 << SUB_BITS
+        self.counts = [0] * (self._index(int(highest * 1e6)) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def _index(self, us):
+        if us < self.sub: return us
+        shift = us.bit_length() - 1 - SUB_BITS
+        return self.sub * (shift + 1) + (us >> shift) - self.sub
+
+    def _value(self, i):
+        """ 버킷 i의 중간값 (초) """
+        if i < self.sub: return i / 1e6
+        shift = i // self.sub - 1
+        lo = (self.sub + i % self.sub) << shift
+        return (lo + (1 << shift) / 2) / 1e6
+
+    def record(self, seconds):
+        us = max(0, int(seconds * 1e6))
+        self.counts[min(self._index(us), len(self.counts) - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min: self.min = seconds
+        if seconds > self.max: self.max = seconds
+
+    def percentile(self, p):
+        if not self.count: return 0.0
+        target = max(1, p / 100.0 * self.count)
+        acc = 0
+        for i, c in enumerate(self.counts):
+            acc += c
+            if acc >= target: return min(self._value(i), self.max)
+        return self.max
+
+    def snapshot(self, unit=1e3):
+        """ 요약 (기본 단위: ms) """
+        return {
+            "count": self.count,
+            "min": round((self.min or 0) * unit, 3), "mean": round(self.total / self.count * unit, 3) if self.count else 0.0,
+            "p50": round(self.percentile(50) * unit, 3), "p90": round(self.percentile(90) * unit, 3),
+            "p99": round(self.percentile(99) * unit, 3), "p999": round(self.percentile(99.9) * unit, 3),
+            "max": round(self.max * unit, 3),
+        }
+
+
+class PollMetrics:
+    """
+    폴링 계측: 요청 지연 히스토그램(전체/그룹별), 초당 요청 수, 타임아웃/예외 코드/연결 오류 횟수,
+    예정 시각 대비 시작 지연(지터), 주기 초과 횟수. 스케줄러 콜백에서 기록하고 snapshot()으로 읽습니다.
+    """
+    def __init__(self, rate_window=10.0):
+        self.lock = threading.Lock()
+        self.rate_window = rate_window
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started = time.time()
+            self.latency = LatencyHistogram()
+            self.jitter = LatencyHistogram()
+            self.groups = {}  # 그룹 이름 -> LatencyHistogram
+            self.polls = 0
+            self.requests = 0
+            self.errors = 0
+            self.timeouts = 0
+            self.disconnects = 0
+            self.exceptions = Counter()  # 예외 코드 -> 횟수
+            self.overruns = 0
+            self.recent = deque()  # (시각, 요청 수) - 최근 rate_window초 처리량 계산용
+
+    def _requests_of(self, group):
+        return len(getattr(group, "spans", ())) or 1
+
+    def record_poll(self, group, latency, lateness=0.0):
+        n = self._requests_of(group)
+        now = time.monotonic()
+        with self.lock:
+            self.polls += 1
+            self.requests += n
+            self.latency.record(latency)
+            self.jitter.record(max(0.0, lateness))
+            h = self.groups.get(group.name)
+            if h is None: h = self.groups[group.name] = LatencyHistogram()
+            h.record(latency)
+            self.recent.append((now, n))
+            while self.recent and now - self.recent[0][0] > self.rate_window: self.recent.popleft()
+
+    def record_error(self, group, err, lateness=0.0):
+        with self.lock:
+            self.errors += 1
+            self.jitter.record(max(0.0, lateness))
+            if isinstance(err, ModbusReadError) and err.code is not None: self.exceptions[err.code] += 1
+            elif isinstance(err, (ModbusReadError, asyncio.TimeoutError)): self.timeouts += 1  # 응답 없음
+            else: self.disconnects += 1
+
+    def record_overrun(self, group, missed):
+        with self.lock:
+            self.overruns += 1
+
+    def rate(self):
+        with self.lock:
+            if not self.recent: return 0.0
+            span = max(time.monotonic() - self.recent[0][0], 1.0)
+            return sum(n for _, n in self.recent) / span
+
+    def snapshot(self):
+        rate = self.rate()
+        with self.lock:
+            return {
+                "time": time.time(), "elapsed": round(time.time() - self.started, 1),
+                "polls": self.polls, "requests": self.requests, "requests_per_sec": round(rate, 2),
+                "errors": self.errors, "timeouts": self.timeouts, "disconnects": self.disconnects,
+                "exception_codes": {str(k): v for k, v in sorted(self.exceptions.items())},
+                "overruns": self.overruns,
+                "latency_ms": self.latency.snapshot(), "jitter_ms": self.jitter.snapshot(),
+                "groups": {name: h.snapshot() for name, h in self.groups.items()},
+            }
+
+    def summary(self):
+        """ 상태 표시줄용 한 줄 요약 """
+        s = self.snapshot()
+        lat, jit = s["latency_ms"], s["jitter_ms"]
+        exc = ", ".join(f"{k}:{v}" for k, v in s["exception_codes"].items()) or "0"
+        return (f"{s['requests_per_sec']:.1f} req/s | 응답 p50 {lat['p50']:.1f} / p99 {lat['p99']:.1f} / max {lat['max']:.1f} ms"
+                f" | 지터 p99 {jit['p99']:.1f} ms | 타임아웃 {s['timeouts']} | 예외 {exc} | 끊김 {s['disconnects']} | 주기 초과 {s['overruns']}")
+
+
+def save_snapshot(snapshot, filename):
+    """ JSON 스냅샷 저장 (임시 파일에 쓴 뒤 교체) """
+    tmp = filename + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, filename)
@@ -0,0 +1,177 @@
+from .modbus_poll import PollScheduler, area_from_label
+from .read_planner import TagReadGroup, parse_addresses
+from .async_master import AsyncPollRunner
+from .sample_recorder import SampleRecorder
+from .change_filter import ChangeFilter
+from .tag_decoder import TagMap
+from .modbus_connection import ConnectionPool
+from .poll_metrics import PollMetrics
+
+try:
+    # pymodbus 3.x 버전 호환
+    from pymodbus.client import ModbusTcpClient, ModbusSerialClient
+except ImportError:
+    ModbusTcpClient = None
+    ModbusSerialClient = None
+
+
+def make_group(area, unit=1, period=1.0, address=0, count=10, tags=None, max_gap=0, tag_map=None):
+    """ 읽기 설정 -> 폴링 그룹. 태그 맵 > 태그 주소 > 시작 주소/개수 순으로 적용 """
+    area = area_from_label(area)
+    unit, period, max_gap = int(unit), float(period), int(max_gap)
+    if tag_map:
+        if area not in ("hr", "ir"): raise ValueError("태그 맵은 레지스터 영역(HR/IR)만 지원합니다.")
+        tm = tag_map if isinstance(tag_map, TagMap) else TagMap.load(tag_map)
+        group = TagReadGroup(area, tm.addresses, unit=unit, period=period, max_gap=max_gap,
+                             name=f"{area.upper()} 태그 맵 {len(tm)}개 #{unit}")
+        group.tag_map = tm
+        return group
+    if tags:
+        return TagReadGroup(area, parse_addresses(tags), unit=unit, period=period, max_gap=max_gap)
+    # 시작 주소/개수도 태그 그룹으로 읽음: 프로토콜 한도를 넘거나 장치가 거부(예외 02/03)하면 자동 분할
+    address, count = int(address), int(count)
+    group = TagReadGroup(area, range(address, address + count), unit=unit, period=period,
+                         name=f"{area.upper()} {address}+{count} #{unit}")
+    group.addresses = range(address, address + count)  # 연속 주소 (로그는 '주소 n ~' 형식)
+    return group
+
+
+def sample_values(group, values, idx=None):
+    """ 샘플 -> {주소 또는 태그 이름: 값}. idx가 있으면 바뀐 위치(태그)만 """
+    if group.tag_map:
+        named = group.tag_map.decode(values)
+        return named if idx is None else group.tag_map.touching(named, {group.addresses[i] for i in idx})
+    if idx is None: return dict(zip(group.addresses, values))
+    return {group.addresses[i]: values[i] for i in idx}
+
+
+class PollSession:
+    """
+    Tk 없이 동작하는 수집 세션: 연결(풀) + 스케줄러(동기/비동기) + 바이너리 기록 + 변경분 필터.
+    config 키: mode, ip, port, com, baud, async, depth, groups, record, deadband
+    on_sample(group, values, ts, idx)는 로그할 샘플마다 호출됩니다 (변경분 모드에서 idx = 바뀐 위치, 전체면 None).
+    on_log(msg, tag)는 상태 메시지, on_state(conn, msg)는 연결 상태 변화 때 호출됩니다.
+    run()은 블로킹이므로 GUI에서는 별도 스레드에서 호출해야 합니다.
+    """
+    def __init__(self, config, on_sample, on_log, pool=None, on_state=None):
+        self.config = config
+        self.on_sample = on_sample
+        self.on_log = on_log
+        self.on_state = on_state
+        self.pool = pool or ConnectionPool()
+        self.is_running = True  # run() 전에 stop()이 불려도 시작하지 않도록 여기서 설정
+        self.scheduler = None
+        self.connection = None
+        self.recorder = None
+        self.change_filter = None
+        self.metrics = PollMetrics()
+
+    def stop(self):
+        self.is_running = False
+        if self.scheduler: self.scheduler.stop()
+
+    def run(self):
+        config = self.config
+        try:
+            if config.get('record'):
+                multi = len(config['groups']) > 1 or (config.get('async') and "," in config['ip'])
+                self.recorder = SampleRecorder(config['record'], multi=multi)
+            self.change_filter = ChangeFilter(*config['deadband']) if config.get('deadband') else None
+            if config['mode'] == "TCP" and config.get('async'):
+                self.run_async()
+            else:
+                self.run_sync()
+        finally:
+            self.close()
+
+    def run_sync(self):
+        config = self.config
+        if ModbusTcpClient is None: raise RuntimeError("pymodbus 라이브러리가 필요합니다. (pip install pymodbus)")
+        if config['mode'] == "TCP":
+            key = ("TCP", config['ip'], config['port'])
+            factory = lambda: ModbusTcpClient(config['ip'], port=config['port'])
+        else:
+            # pymodbus 3.x 호환 (method='rtu' 대신 명시적 파라미터 사용 권장되나 호환성 유지 시도)
+            key = ("RTU", config['com'], config['baud'])
+            factory = lambda: ModbusSerialClient(port=config['com'], baudrate=config['baud'], bytesize=8, parity='N', stopbits=1)
+        # 연결 실패/끊김 시 세션을 끝내지 않고 백오프하며 재연결
+        self.connection = self.pool.get(key, factory, on_state=self.conn_state)
+
+        groups = config['groups']
+        self.on_log(f"수집 시작. ({len(groups)}개 그룹 수집: {', '.join(g.name for g in groups)})", "INFO")
+
+        # 모든 그룹을 하나의 연결로 주기 실행 (주기 밀림 없음, 주기 초과 시 알림)
+        self.scheduler = PollScheduler(None, groups, on_result=self.poll_result, on_error=self.poll_error,
+                                       on_overrun=self.poll_overrun, connection=self.connection)
+        if self.is_running: self.scheduler.run()
+
+    def run_async(self):
+        # 장치별로 그룹을 복사해 하나의 이벤트 루프에서 실행 (연결은 첫 요청 시 생성, 끊기면 백오프하며 재연결)
+        config = self.config
+        hosts = [h.strip() for h in config['ip'].split(",") if h.strip()]
+        endpoints = AsyncPollRunner.expand(hosts, config['port'], config['groups'])
+        depth = config.get('depth', 4)
+        self.scheduler = AsyncPollRunner(endpoints, on_result=self.poll_result, on_error=self.poll_error,
+                                         on_overrun=self.poll_overrun, depth=depth, on_state=self.conn_state)
+        self.on_log(f"비동기 수집 시작. ({len(hosts)}개 장치, {len(self.scheduler.groups)}개 그룹, depth {depth})", "INFO")
+        if self.is_running: self.scheduler.run()
+
+    def connections(self):
+        """ 연결 상태 목록 (동기: 풀의 연결 하나, 비동기: 장치별 마스터) """
+        if self.connection: return [self.connection.health()]
+        if isinstance(self.scheduler, AsyncPollRunner): return self.scheduler.health()
+        return []
+
+    def close(self):
+        conns = self.connections()
+        for h in conns:
+            name = f"[{h['name']}] " if len(conns) > 1 else ""
+            self.on_log(f"{name}연결 상태: 연결 {h['connects']}회, 실패 {h['connect_failures']}회, 끊김 {h['drops']}회, 끊긴 시간 {h['downtime']}초", "INFO")
+        if self.connection and self.config['mode'] != "TCP":
+            self.connection.close()  # 시리얼 포트는 다른 도구가 쓸 수 있도록 닫음
+        if self.recorder:
+            self.on_log(f"바이너리 기록 종료: {self.recorder.samples}개 샘플", "INFO")
+            self.recorder.close()
+            self.recorder = None
+        if self.change_filter:
+            cf = self.change_filter
+            self.on_log(f"변경 없음 {cf.suppressed}/{cf.samples}회 생략, 생략된 값 {cf.values_suppressed}개", "INFO")
+
+    def format(self, group, values, idx=None):
+        """ 로그 한 줄 (그룹이 여러 개면 그룹 이름 표시) """
+        prefix = f"[{group.name}] " if len(self.scheduler.groups) > 1 else ""
+        if idx is not None:
+            prefix += "변경 "
+        if group.tag_map:
+            return prefix + TagMap.format(sample_values(group, values, idx))
+        if idx is None and isinstance(group.addresses, range):
+            return f"{prefix}주소 {group.address} ~ : {values}"
+        return f"{prefix}{sample_values(group, values, idx)}"
+
+    def snapshot(self):
+        """ 계측 스냅샷 + 연결 상태 """
+        snap = self.metrics.snapshot()
+        snap["connections"] = self.connections()
+        return snap
+
+    def poll_result(self, group, values, ts):
+        self.metrics.record_poll(group, group.last_latency, group.last_lateness)
+        if self.recorder: self.recorder.record(group, values, ts)
+        idx = None
+        if self.change_filter:
+            idx = self.change_filter.changed(group, values)
+            if not idx: return
+            if len(idx) == len(values): idx = None
+        self.on_sample(group, values, ts, idx)
+
+    def conn_state(self, conn, msg):
+        self.on_log(f"[{conn.name}] {msg}", "INFO" if conn.connected else "ERR")
+        if self.on_state: self.on_state(conn, msg)
+
+    def poll_error(self, group, err):
+        self.metrics.record_error(group, err, group.last_lateness)
+        self.on_log(f"[{group.name}] 읽기 실패: {str(err) or '응답 시간 초과'}", "ERR")
+
+    def poll_overrun(self, group, missed):
+        self.metrics.record_overrun(group, missed)
+        self.on_log(f"[{group.name}] 주기 초과: 읽기 {group.last_latency*1000:.0f}ms > 주기 {group.period}s ({missed}회 건너뜀, 누적 {group.overruns})", "ERR")
@@ -0,0 +1,100 @@
+from bisect import bisect_left, bisect_right
+
+from .modbus_poll import PollGroup, ModbusReadError, read_block
+
+# 프로토콜상 한 번에 읽을 수 있는 최대 개수 (FC03/04: 125 워드, FC01/02: 2000 비트)
+MAX_READ = {"hr": 125, "ir": 125, "co": 2000, "di": 2000}
+
+# 이 예외 코드가 오면 요청을 쪼개서 다시 시도 (02: 잘못된 주소, 03: 잘못된 데이터 값/개수)
+SPLIT_CODES = (2, 3)
+
+
+def parse_addresses(text):
+    """ "0-9, 20, 100-110" 형식의 문자열을 정렬된 주소 목록으로 변환 """
+    addrs = set()
+    for part in text.replace(";", ",").split(","):
+        part = part.strip()
+        if not part: continue
+        if "-" in part:
+            lo, hi = (int(x) for x in part.split("-", 1))
+            addrs.update(range(min(lo, hi), max(lo, hi) + 1))
+        else:
+            addrs.add(int(part))
+    if any(not 0 <= a <= 0xFFFF for a in addrs): raise ValueError("주소 범위는 0~65535 입니다.")
+    return sorted(addrs)
+
+
+def plan_reads(addresses, max_count, max_gap=0):
+    """
+    주소 목록을 최소 개수의 (시작 주소, 개수) 요청으로 병합합니다.
+    사이 빈 주소가 max_gap개 이하이고 전체 길이가 max_count 이하면 한 요청으로 묶습니다.
+    """
+    spans = []
+    for a in sorted(set(addresses)):
+        if spans:
+            start, end = spans[-1]
+            if a - end - 1 <= max_gap and a - start + 1 <= max_count:
+                spans[-1][1] = a
+                continue
+        spans.append([a, a])
+    return [(s, e - s + 1) for s, e in spans]
+
+
+class TagReadGroup(PollGroup):
+    """
+    흩어진 태그 주소들을 병합된 요청으로 읽는 폴링 그룹.
+    read()는 addresses 순서에 맞춘 값 목록을 반환합니다.
+    장치가 큰 요청을 거부하면(SPLIT_CODES) 해당 요청을 둘로 나눠 재시도하고, 나눈 계획은 다음 주기에도 유지됩니다.
+    """
+    def __init__(self, area, addresses, unit=1, period=1.0, max_gap=0, max_count=None, name=None):
+        addresses = sorted(set(addresses))
+        if not addresses: raise ValueError("태그 주소가 없습니다.")
+        super().__init__(area, addresses[0], addresses[-1] - addresses[0] + 1, unit=unit, period=period,
+                         name=name or f"{area.upper()} 태그 {len(addresses)}개 #{unit}")
+        self.addresses = addresses
+        self.max_gap = max_gap
+        self.max_count = min(max_count or MAX_READ[area], MAX_READ[area])
+        self.spans = plan_reads(self.addresses, self.max_count, max_gap)
+        self.splits = 0
+
+    def tags_in(self, start, count):
+        return self.addresses[bisect_left(self.addresses, start):bisect_right(self.addresses, start + count - 1)]
+
+    def split(self, start, count):
+        # 태그 사이의 가장 큰 빈 구간에서 나누고, 빈 구간이 없으면 태그 개수 기준 절반으로 나눔
+        tags = self.tags_in(start, count)
+        gaps = [(tags[j + 1] - tags[j], j) for j in range(len(tags) - 1)]
+        gap, j = max(gaps)
+        cut = j + 1 if gap > 1 else len(tags) // 2
+        left, right = tags[:cut], tags[cut:]
+        return [(left[0], left[-1] - left[0] + 1), (right[0], right[-1] - right[0] + 1)]
+
+    def reject(self, span, err):
+        """ 장치가 거부한 요청을 둘로 나눠 계획에 반영하고 새 요청들을 반환 (나눌 수 없으면 None) """
+        start, count = span
+        if err.code not in SPLIT_CODES or len(self.tags_in(start, count)) < 2: return None
+        parts = self.split(start, count)
+        i = self.spans.index(span)
+        self.spans[i:i + 1] = parts
+        self.splits += 1
+        return parts
+
+    def collect(self, span, block, values):
+        start, count = span
+        for a in self.tags_in(start, count):
+            values[a] = block[a - start]
+
+    def read(self, client):
+        values = {}
+        todo = list(self.spans)
+        while todo:
+            span = todo.pop(0)
+            try:
+                block = read_block(client, self.area, span[0], span[1], self.unit)
+            except ModbusReadError as e:
+                parts = self.reject(span, e)
+                if not parts: raise
+                todo[0:0] = parts
+                continue
+            self.collect(span, block, values)
+        return [values[a] for a in self.addresses]
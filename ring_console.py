@@ -0,0 +1,60 @@
+import tkinter as tk
+from tkinter import scrolledtext
+from collections import deque
+from datetime import datetime
+
+
+class RingConsole:
+    """
+    로그 창 (ScrolledText) + 고정 크기 링 버퍼.
+    write()는 어느 스레드에서 불러도 되며 줄을 큐에 넣기만 하고,
+    flush_ms마다 UI 스레드에서 모인 줄을 한 번에 삽입합니다.
+    화면에는 최근 max_lines줄만 남기고, 전체 기록(최근 capacity줄)은 링 버퍼에 보관합니다.
+    """
+    def __init__(self, master, tags=None, capacity=100000, max_lines=2000, flush_ms=100, **text_opts):
+        self.text = scrolledtext.ScrolledText(master, state='disabled', **text_opts)
+        for tag, color in (tags or {}).items():
+            self.text.tag_config(tag, foreground=color)
+        self.ring = deque(maxlen=capacity)
+        self.pending = deque(maxlen=max_lines)  # 화면에 아직 안 나간 줄 (max_lines보다 오래된 줄은 어차피 잘림)
+        self.max_lines = max_lines
+        self.flush_ms = flush_ms
+        self.text.after(flush_ms, self._flush)
+
+    def pack(self, **kw):
+        self.text.pack(**kw)
+
+    def write(self, msg, tag="INFO"):
+        line = datetime.now().strftime("[%H:%M:%S] ") + msg + "\n"
+        self.ring.append(line)
+        self.pending.append((line, tag))
+
+    def _flush(self):
+        try:
+            if self.pending:
+                batch = [self.pending.popleft() for _ in range(len(self.pending))]
+                at_bottom = self.text.yview()[1] >= 0.999
+                args = []
+                for line, tag in batch: args += [line, tag]
+                self.text.config(state='normal')
+                self.text.insert(tk.END, *args)
+                # 메시지 안의 줄바꿈도 한 줄로 세도록 위젯의 실제 줄 수로 판단 (마지막 빈 줄 제외)
+                lines = int(self.text.index("end-1c").split(".")[0]) - 1
+                if lines > self.max_lines:
+                    self.text.delete("1.0", f"{lines - self.max_lines + 1}.0")
+                self.text.config(state='disabled')
+                if at_bottom: self.text.see(tk.END)  # 사용자가 위로 스크롤해 보는 중이면 자동 스크롤하지 않음
+            self.text.after(self.flush_ms, self._flush)
+        except tk.TclError:
+            pass  # 창이 닫힘
+
+    def save(self, filename):
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.writelines(list(self.ring))
+
+    def clear(self):
+        self.ring.clear()
+        self.pending.clear()
+        self.text.config(state='normal')
+        self.text.delete("1.0", tk.END)
+        self.text.config(state='disabled')
@@ -0,0 +1,187 @@
+import os
+import re
+import sys
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+
+# ---------------------------------------------------------------------------
+# 파일 형식 (.etr, 리틀 엔디안, 추가 전용)
+#
+#   파일 헤더 (64 bytes)
+#     magic   8s   b"ETREC01\0"
+#     width   u16  샘플 하나의 값 개수 (레지스터/비트 개수)
+#     flags   u16  bit0 = 비트 영역(코일/입력)
+#     name    52s  그룹 이름 (UTF-8, 0으로 채움)
+#
+#   청크 (반복) - 청크 헤더가 시간 인덱스 역할을 합니다
+#     magic   4s   b"CHNK"
+#     n       u32  샘플 개수
+#     t_first f64  첫 샘플 시각 (epoch 초)
+#     t_last  f64  마지막 샘플 시각
+#     ts      f64 * n          시각 열
+#     values  u16 * n * width  값 (샘플 순서대로 width개씩)
+#
+# 청크 단위로 열(column)을 모아 쓰므로 array('d') / array('H') 또는
+# numpy.frombuffer로 바로 읽을 수 있습니다. 쓰다가 끊긴 마지막 청크는 읽을 때 무시됩니다.
+# ---------------------------------------------------------------------------
+MAGIC = b"ETREC01\0"
+FILE_HEADER = struct.Struct("<8sHH52s")
+CHUNK_HEADER = struct.Struct("<4sIdd")
+CHUNK_MAGIC = b"CHNK"
+FLAG_BITS = 1
+
+_SWAP = sys.byteorder != "little"
+
+
+def _to_le(arr):
+    if _SWAP: arr.byteswap()
+    return arr
+
+
+class RecordFile:
+    """
+    그룹 하나의 샘플 파일. append()로 메모리에 모았다가
+    chunk_size개가 차거나 flush_interval초가 지나면 청크 하나로 기록합니다.
+    """
+    def __init__(self, path, width, name="", bits=False, chunk_size=600, flush_interval=5.0):
+        self.path = path
+        self.width = width
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.ts = array("d")
+        self.values = array("H")
+        self.samples = 0
+        if os.path.exists(path) and os.path.getsize(path) >= FILE_HEADER.size:
+            rd = RecordReader(path)
+            if rd.width != width: raise ValueError(f"{path}: 기존 파일의 값 개수({rd.width})가 다릅니다 ({width}).")
+            self.f = open(path, "r+b")
+            self.f.truncate(rd.end)  # 끊긴 청크는 잘라내고 이어서 기록
+            self.f.seek(rd.end)
+        else:
+            self.f = open(path, "wb")
+            self.f.write(FILE_HEADER.pack(MAGIC, width, FLAG_BITS if bits else 0, name.encode("utf-8")[:52]))
+            self.f.flush()
+
+    def append(self, ts, values):
+        if len(values) != self.width: raise ValueError(f"값 개수 불일치: {len(values)} != {self.width}")
+        self.ts.append(ts)
+        self.values.extend(int(v) for v in values)
+        self.samples += 1
+        if len(self.ts) >= self.chunk_size or ts - self.ts[0] >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        n = len(self.ts)
+        if not n: return
+        self.f.write(CHUNK_HEADER.pack(CHUNK_MAGIC, n, self.ts[0], self.ts[-1]))
+        _to_le(self.ts).tofile(self.f)
+        _to_le(self.values).tofile(self.f)
+        self.f.flush()
+        self.ts = array("d")
+        self.values = array("H")
+
+    def close(self):
+        self.flush()
+        self.f.close()
+
+
+def read_header(path):
+    """ (width, bits, name) 반환 """
+    with open(path, "rb") as f:
+        magic, width, flags, name = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+    if magic != MAGIC: raise ValueError(f"{path}: 샘플 기록 파일이 아닙니다.")
+    return width, bool(flags & FLAG_BITS), name.rstrip(b"\0").decode("utf-8", "replace")
+
+
+class RecordReader:
+    """
+    .etr 파일 읽기. 열 때 청크 헤더만 건너뛰며 읽어 시간 인덱스를 만들고,
+    read_range()는 해당 시간 구간과 겹치는 청크만 읽습니다.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.width, self.bits, self.name = read_header(path)
+        self.index = []  # (오프셋, n, t_first, t_last)
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            pos = FILE_HEADER.size
+            while pos + CHUNK_HEADER.size <= size:
+                f.seek(pos)
+                magic, n, t_first, t_last = CHUNK_HEADER.unpack(f.read(CHUNK_HEADER.size))
+                end = pos + CHUNK_HEADER.size + n * (8 + 2 * self.width)
+                if magic != CHUNK_MAGIC or end > size: break  # 기록 중 끊긴 청크
+                self.index.append((pos, n, t_first, t_last))
+                pos = end
+        self.end = pos
+        self.t_last = [c[3] for c in self.index]
+
+    def __len__(self):
+        return sum(c[1] for c in self.index)
+
+    @property
+    def time_span(self):
+        return (self.index[0][2], self.index[-1][3]) if self.index else (None, None)
+
+    def read_range(self, t0=None, t1=None):
+        """ t0 <= 시각 <= t1 샘플의 (시각 array('d'), 값 array('H'), width). 값은 샘플당 width개씩 이어짐 """
+        t0 = float("-inf") if t0 is None else t0
+        t1 = float("inf") if t1 is None else t1
+        ts_out, val_out = array("d"), array("H")
+        with open(self.path, "rb") as f:
+            for pos, n, t_first, t_last in self.index[bisect_left(self.t_last, t0):]:
+                if t_first > t1: break
+                f.seek(pos + CHUNK_HEADER.size)
+                ts, vals = array("d"), array("H")
+                ts.fromfile(f, n)
+                vals.fromfile(f, n * self.width)
+                _to_le(ts); _to_le(vals)
+                i, j = bisect_left(ts, t0), bisect_right(ts, t1)
+                ts_out.extend(ts[i:j])
+                val_out.extend(vals[i * self.width:j * self.width])
+        return ts_out, val_out, self.width
+
+    def rows(self, t0=None, t1=None):
+        """ (시각, [값...]) 단위로 순회 """
+        ts, vals, w = self.read_range(t0, t1)
+        for k, t in enumerate(ts):
+            yield t, vals[k * w:(k + 1) * w].tolist()
+
+
+class SampleRecorder:
+    """
+    폴링 결과를 그룹별 .etr 파일로 기록합니다. base_path가 "plc.etr"이면
+    그룹이 하나일 때 plc.etr, 여러 개면 plc_<그룹 이름>.etr 파일을 만듭니다.
+    이름이 같은 그룹(예: 주기만 다른 그룹)은 기록을 시작한 순서대로 plc_<이름>_2.etr, _3 ... 을 씁니다.
+    """
+    def __init__(self, base_path, multi=False, **file_opts):
+        self.base, self.ext = os.path.splitext(base_path)
+        self.ext = self.ext or ".etr"
+        self.multi = multi
+        self.file_opts = file_opts
+        self.files = {}
+
+    def path_for(self, group):
+        if not self.multi: return self.base + self.ext
+        stem = self.base + "_" + re.sub(r"[^\w+.-]+", "_", group.name).strip("_")  # 한글 등 유니코드 글자는 유지
+        used = {rf.path for rf in self.files.values()}
+        path, n = stem + self.ext, 1
+        while path in used:
+            n += 1
+            path = f"{stem}_{n}{self.ext}"
+        return path
+
+    def record(self, group, values, ts):
+        rf = self.files.get(id(group))
+        if rf is None:
+            rf = self.files[id(group)] = RecordFile(self.path_for(group), len(values), group.name,
+                                                    bits=isinstance(values[0], bool) if values else False, **self.file_opts)
+        rf.append(ts, values)
+
+    @property
+    def samples(self):
+        return sum(rf.samples for rf in self.files.values())
+
+    def close(self):
+        for rf in self.files.values(): rf.close()
+        self.files.clear()
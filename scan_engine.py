@@ -0,0 +1,324 @@
+import asyncio
+import socket
+import struct
+import time
+import os
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+# 생존 확인용 기본 TCP 포트 (연결 거부(RST) 응답도 '살아있음'으로 판정)
+DEFAULT_ALIVE_PORTS = (80, 443, 445, 502)
+
+# 상세 스캔 포트 프리셋
+PORT_PRESETS = {
+    "기본": (502, 80, 443, 21, 23, 3389),
+    "ICS/PLC": (502, 102, 44818, 20000, 4840, 2404, 9600, 5007, 1911, 18245, 789),
+    "IT": (21, 22, 23, 80, 135, 139, 443, 445, 3389, 5900, 8080),
+}
+
+# 포트 상태
+PORT_OPEN = "open"
+PORT_CLOSED = "closed"    # 연결 거부 (RST)
+PORT_TIMEOUT = "timeout"  # 응답 없음 (방화벽 필터링 등)
+PORT_ERROR = "error"      # 기타 소켓 오류 (Host unreachable 등)
+
+
+def parse_ports(text):
+    """ "502, 80, 8000-8010" 형식의 문자열을 포트 튜플로 변환 (중복 제거, 입력 순서 유지) """
+    ports = []
+    for part in text.replace(";", ",").split(","):
+        part = part.strip()
+        if not part: continue
+        if "-" in part:
+            lo, hi = (int(x) for x in part.split("-", 1))
+            rng = range(min(lo, hi), max(lo, hi) + 1)
+        else:
+            rng = (int(part),)
+        for p in rng:
+            if not 0 < p < 65536: raise ValueError(f"잘못된 포트: {p}")
+            if p not in ports: ports.append(p)
+    return tuple(ports)
+
+
+class HostResult:
+    __slots__ = ("ip", "ip_int", "latency", "method", "mac", "vendor", "hostname", "ports", "port_states", "port_bits")
+
+    def __init__(self, ip, latency, method=""):
+        self.ip = ip
+        self.ip_int = int.from_bytes(socket.inet_aton(ip), "big")  # 정렬용 정수 IP
+        self.latency = latency
+        self.method = method
+        self.mac = None
+        self.vendor = ""
+        self.hostname = ""
+        self.ports = ""
+        self.port_states = {}  # port -> PORT_OPEN / PORT_CLOSED / PORT_TIMEOUT / PORT_ERROR
+        self.port_bits = 0     # 열린 포트 비트맵 (bit n = 포트 n), 정렬용
+
+    def set_port_states(self, states):
+        self.port_states = states
+        open_ports = [p for p, st in states.items() if st == PORT_OPEN]
+        self.ports = ",".join(str(p) for p in open_ports)
+        self.port_bits = sum(1 << p for p in open_ports)
+
+    def as_row(self):
+        return (self.ip, self.latency, self.hostname, self.mac, self.vendor, self.ports)
+
+
+def _checksum(data):
+    if len(data) % 2: data += b"\x00"
+    s = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    s = (s >> 16) + (s & 0xFFFF)
+    s += s >> 16
+    return ~s & 0xFFFF
+
+
+class IcmpPinger:
+    """ ICMP 소켓 하나로 여러 호스트에 Echo 요청을 보내고 응답을 (IP, seq)로 매칭 """
+    def __init__(self):
+        self.sock = None
+        self.raw = False
+        self.ident = os.getpid() & 0xFFFF
+        self.seq = itertools.count(1)
+        self.waiters = {}
+
+    def open(self):
+        # 1. 리눅스 비특권 ICMP (ping_group_range) -> 2. RAW 소켓 (관리자 권한) 순으로 시도
+        for kind in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+            try:
+                s = socket.socket(socket.AF_INET, kind, socket.IPPROTO_ICMP)
+            except (OSError, AttributeError):
+                continue
+            s.setblocking(False)
+            self.sock = s
+            self.raw = kind == socket.SOCK_RAW
+            return True
+        return False
+
+    def close(self):
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+
+    async def rx_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                data, addr = await loop.sock_recvfrom(self.sock, 1024)
+            except OSError:
+                await asyncio.sleep(0.01)
+                continue
+            if self.raw:
+                data = data[(data[0] & 0x0F) * 4:]  # IP 헤더 제거
+            if len(data) < 8 or data[0] != 0: continue  # Echo Reply 만 처리
+            ident, seq = struct.unpack("!HH", data[4:8])
+            if self.raw and ident != self.ident: continue  # DGRAM은 커널이 ID를 바꿔서 넣음
+            fut = self.waiters.pop((addr[0], seq), None)
+            if fut and not fut.done():
+                fut.set_result(time.perf_counter())
+
+    async def ping(self, ip, timeout):
+        loop = asyncio.get_running_loop()
+        seq = next(self.seq) & 0xFFFF
+        payload = b"engtool-scan"
+        header = struct.pack("!BBHHH", 8, 0, 0, self.ident, seq)
+        packet = struct.pack("!BBHHH", 8, 0, _checksum(header + payload), self.ident, seq) + payload
+        key = (ip, seq)
+        fut = loop.create_future()
+        self.waiters[key] = fut
+        t0 = time.perf_counter()
+        try:
+            await loop.sock_sendto(self.sock, packet, (ip, 0))
+            t1 = await asyncio.wait_for(fut, timeout)
+            return (t1 - t0) * 1000.0
+        except (asyncio.TimeoutError, OSError):
+            return None
+        finally:
+            self.waiters.pop(key, None)
+
+
+async def _first_alive(tasks):
+    # 가장 먼저 '살아있음'을 보고한 프로브 결과를 반환 (모두 실패하면 None)
+    pending = set(tasks)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for t in done:
+            if not t.cancelled() and t.exception() is None and t.result() is not None:
+                return t.result()
+    return None
+
+
+class ScanEngine:
+    """
+    GUI와 분리된 asyncio 기반 스캔 엔진.
+    자식 프로세스(ping/arp) 없이 TCP 연결 / ICMP 소켓으로 생존 여부를 확인합니다.
+    ports가 주어지면 살아있는 호스트의 포트를 동시에 검사합니다.
+    동시에 열리는 TCP 소켓 수는 socket_budget으로 전체 제한됩니다.
+    resolver(HostnameResolver)가 주어지면 호스트명은 별도 단계에서 조회되어 나중에 다시 전달됩니다.
+    run()은 블로킹이므로 백그라운드 스레드에서 호출해야 합니다.
+    """
+    def __init__(self, concurrency=128, host_timeout=1.0, alive_ports=DEFAULT_ALIVE_PORTS,
+                 use_icmp=True, batch_interval=0.1, enrich_workers=16,
+                 ports=(), port_timeout=0.5, socket_budget=512, resolver=None):
+        self.concurrency = max(1, int(concurrency))
+        self.host_timeout = host_timeout
+        self.alive_ports = tuple(alive_ports)
+        self.ports = tuple(ports)
+        self.port_timeout = port_timeout
+        self.socket_budget = max(1, int(socket_budget))
+        self.budget = None
+        self.resolver = resolver
+        self.use_icmp = use_icmp
+        self.batch_interval = batch_interval
+        self.enrich_workers = enrich_workers
+        self.is_running = False
+        self.pinger = None
+        self.probed = 0
+
+    def stop(self):
+        self.is_running = False
+
+    def run(self, targets, on_batch, enrich=None, on_dead=None, reuse=None):
+        """
+        targets: IP 이터러블, on_batch(list[HostResult]) / on_dead(ip): 엔진 스레드에서 호출됨
+        enrich(host): 스레드풀에서 실행
+        reuse(host): enrich 이후 호출, True를 반환하면 상세 검사(포트/호스트명)를 생략 (증분 스캔)
+        """
+        self.is_running = True
+        self.probed = 0
+        try:
+            return asyncio.run(self._run(iter(targets), on_batch, enrich, on_dead, reuse))
+        finally:
+            self.is_running = False
+
+    async def _run(self, targets, on_batch, enrich, on_dead, reuse):
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.enrich_workers) if enrich else None
+        self.budget = asyncio.Semaphore(self.socket_budget)
+        pending = []
+        found = [0]
+        dns_tasks = set()
+
+        rx_task = None
+        self.pinger = IcmpPinger() if self.use_icmp else None
+        if self.pinger and self.pinger.open():
+            rx_task = loop.create_task(self.pinger.rx_loop())
+        else:
+            self.pinger = None
+
+        def flush():
+            if pending:
+                batch = pending[:]
+                pending.clear()
+                on_batch(batch)
+
+        async def flusher():
+            while True:
+                await asyncio.sleep(self.batch_interval)
+                flush()
+
+        async def resolve_later(host):
+            # 생존/포트 단계는 DNS를 기다리지 않음. 호스트명이 확인되면 같은 호스트를 다시 전달(행 갱신)
+            name = await self.resolver.resolve(host.ip)
+            if name and self.is_running:
+                host.hostname = name
+                pending.append(host)
+
+        async def worker():
+            # 공유 이터레이터에서 하나씩 꺼내므로 대상 목록 전체를 큐에 미리 쌓지 않음
+            for ip in targets:
+                if not self.is_running: break
+                ip = str(ip)
+                self.probed += 1
+                res = await self.probe(ip)
+                if not self.is_running: continue
+                if res is None:
+                    if on_dead: on_dead(ip)
+                    continue
+                host = HostResult(ip, max(1, round(res[0])), res[1])
+                jobs = []
+                reused = False
+                if reuse:
+                    # 증분 스캔: MAC을 먼저 확인하고, 이전과 같으면 이전 상세 결과를 재사용
+                    if enrich: jobs.append(loop.run_in_executor(executor, enrich, host))
+                    errors = await asyncio.gather(*jobs, return_exceptions=True)
+                    reused = reuse(host)
+                    jobs = [] if reused or not self.ports else [self.scan_ports(host)]
+                else:
+                    # 포트 검사(asyncio)와 부가 정보 수집(스레드풀)을 동시에 진행
+                    if self.ports: jobs.append(self.scan_ports(host))
+                    if enrich: jobs.append(loop.run_in_executor(executor, enrich, host))
+                    errors = []
+                errors += await asyncio.gather(*jobs, return_exceptions=True)
+                for r in errors:
+                    if isinstance(r, Exception): print(f"Error scanning {ip}: {r}")
+                pending.append(host)
+                found[0] += 1
+                if self.resolver and not reused:
+                    cached = self.resolver.cached(ip)
+                    if cached is not None:
+                        host.hostname = cached
+                    else:
+                        task = loop.create_task(resolve_later(host))
+                        dns_tasks.add(task)
+                        task.add_done_callback(dns_tasks.discard)
+
+        flush_task = loop.create_task(flusher())
+        try:
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+            if dns_tasks and self.is_running:
+                await asyncio.gather(*dns_tasks)
+        finally:
+            for t in dns_tasks: t.cancel()
+            flush_task.cancel()
+            if rx_task: rx_task.cancel()
+            if self.pinger: self.pinger.close()
+            if executor: executor.shutdown(wait=False)
+            flush()
+        return found[0]
+
+    async def probe(self, ip):
+        """ 호스트 하나의 생존 확인. (응답시간 ms, 방식) 또는 None. host_timeout이 전체 마감 시간 """
+        tasks = [asyncio.ensure_future(self._tcp_alive(ip, p)) for p in self.alive_ports]
+        if self.pinger:
+            tasks.append(asyncio.ensure_future(self._icmp_alive(ip)))
+        try:
+            return await asyncio.wait_for(_first_alive(tasks), self.host_timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            for t in tasks: t.cancel()
+
+    async def _icmp_alive(self, ip):
+        ms = await self.pinger.ping(ip, self.host_timeout)
+        return None if ms is None else (ms, "icmp")
+
+    async def _tcp_alive(self, ip, port):
+        t0 = time.perf_counter()
+        state = await self.connect(ip, port, self.host_timeout)
+        if state not in (PORT_OPEN, PORT_CLOSED):  # RST 응답 = 포트는 닫혀있지만 호스트는 살아있음
+            return None
+        return (time.perf_counter() - t0) * 1000.0, f"tcp/{port}"
+
+    async def connect(self, ip, port, timeout):
+        """ 비차단 TCP 연결 시도 후 포트 상태를 반환. 소켓 예산(socket_budget) 안에서만 소켓을 엽니다. """
+        loop = asyncio.get_running_loop()
+        async with self.budget:
+            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            s.setblocking(False)
+            try:
+                await asyncio.wait_for(loop.sock_connect(s, (ip, port)), timeout)
+                return PORT_OPEN
+            except ConnectionRefusedError:
+                return PORT_CLOSED
+            except asyncio.TimeoutError:
+                return PORT_TIMEOUT
+            except OSError:
+                return PORT_ERROR
+            finally:
+                s.close()
+
+    async def scan_ports(self, host):
+        # 한 호스트의 모든 포트를 동시에 검사 (호스트 간 동시성은 worker 수 + 소켓 예산으로 제한)
+        states = await asyncio.gather(*(self.connect(host.ip, p, self.port_timeout) for p in self.ports))
+        host.set_port_states(dict(zip(self.ports, states)))
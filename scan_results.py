@@ -0,0 +1,109 @@
+import os
+import csv
+import json
+from collections import deque
+
+# 외부 라이브러리 로딩
+try:
+    from openpyxl import Workbook
+except ImportError:
+    Workbook = None
+
+EXPORT_HEADERS = ["IP", "응답속도", "호스트명", "MAC", "제조사", "포트"]
+
+# 열별 정렬 키 (문자열 파싱 없이 HostResult의 타입 있는 값 사용)
+SORT_KEYS = {
+    "ip": lambda h: h.ip_int,
+    "latency": lambda h: h.latency,
+    "hostname": lambda h: h.hostname.lower(),
+    "mac": lambda h: h.mac or "",
+    "vendor": lambda h: h.vendor,
+    "ports": lambda h: h.port_bits,
+}
+
+
+class ScanResults:
+    """
+    스캔 결과 버퍼 + IP 인덱스.
+    엔진 스레드는 push()로 결과를 쌓기만 하고, GUI 스레드가 일정 주기(tick)마다 drain()으로 꺼내서 표시합니다.
+    """
+    def __init__(self):
+        self.pending = deque()  # deque의 extend/popleft는 스레드 간에 안전함 (별도 Lock 불필요)
+        self.hosts = {}         # ip -> HostResult (GUI 스레드 전용)
+        self.item_ids = {}      # ip -> Treeview item id
+        self.display_order = [] # 화면 표시 순서 (ip 목록)
+        self.row_tags = {}      # ip -> 현재 적용된 행 태그 (변경된 행만 다시 칠하기 위함)
+
+    def __len__(self):
+        return len(self.hosts)
+
+    def push(self, batch):
+        self.pending.extend(batch)
+
+    def has_pending(self):
+        return bool(self.pending)
+
+    def drain(self, limit=None):
+        n = len(self.pending) if limit is None else min(limit, len(self.pending))
+        return [self.pending.popleft() for _ in range(n)]
+
+    def sort(self, col, reverse=False):
+        """ 모델 안에서 정렬하고 새 표시 순서를 반환 """
+        key = SORT_KEYS[col]
+        hosts = self.hosts
+        self.display_order = sorted(hosts, key=lambda ip: key(hosts[ip]), reverse=reverse)
+        return self.display_order
+
+    def clear(self):
+        self.pending.clear()
+        self.hosts.clear()
+        self.item_ids.clear()
+        self.display_order.clear()
+        self.row_tags.clear()
+
+
+def export_hosts(hosts, filename):
+    """
+    결과 모델(HostResult 목록)을 파일로 스트리밍 저장. 확장자로 형식 결정 (.csv / .xlsx / .jsonl)
+    hosts는 GUI 스레드에서 만든 스냅샷이므로 백그라운드 스레드에서 호출해도 됩니다.
+    """
+    hosts = sorted(hosts, key=SORT_KEYS["ip"])
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == ".xlsx":
+        _export_xlsx(hosts, filename)
+    elif ext in (".jsonl", ".ndjson"):
+        _export_jsonl(hosts, filename)
+    else:
+        _export_csv(hosts, filename)
+    return len(hosts)
+
+
+def _row(host):
+    ip, latency, hostname, mac, vendor, ports = host.as_row()
+    return [ip, f"{latency}ms", hostname, mac or "", vendor, ports]
+
+
+def _export_csv(hosts, filename):
+    with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_HEADERS)
+        writer.writerows(_row(h) for h in hosts)
+
+
+def _export_xlsx(hosts, filename):
+    if Workbook is None: raise RuntimeError("openpyxl 라이브러리가 필요합니다.")
+    # write-only 모드: 행을 메모리에 쌓지 않고 바로 파일로 기록
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("IP Scan Results")
+    ws.append(EXPORT_HEADERS)
+    for h in hosts: ws.append(_row(h))
+    wb.save(filename)
+
+
+def _export_jsonl(hosts, filename):
+    with open(filename, 'w', encoding='utf-8') as f:
+        for h in hosts:
+            rec = {"ip": h.ip, "latency_ms": h.latency, "method": h.method, "hostname": h.hostname,
+                   "mac": h.mac, "vendor": h.vendor, "ports": h.ports,
+                   "port_states": {str(p): st for p, st in h.port_states.items()}}
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
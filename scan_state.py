@@ -0,0 +1,133 @@
+import os
+import json
+import base64
+import time
+import ipaddress
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "engtool-scan-state.json")
+
+
+class ScanStateStore:
+    """
+    IP별 마지막 스캔 결과 저장소 (JSON 파일로 유지).
+    증분 스캔(delta rescan)에서 이전에 살아있던 호스트를 먼저 검사하고,
+    연속으로 응답이 없던 호스트는 점점 드물게 검사하며,
+    MAC이 그대로인 호스트는 이전 상세 결과(포트/호스트명)를 재사용합니다.
+    응답한 적 있는 호스트만 항목으로 저장하며, forget_after번 연속 무응답이면 항목을 지우고
+    무응답 기록(dead)으로 옮깁니다.
+
+    호스트 항목: last_seen, latency, mac, hostname, ports, port_states, detailed, dead_streak, last_probe
+    무응답 기록: /24 대역("a.b.c") -> 256바이트 연속 무응답 횟수 (255에서 멈춤).
+      항목 없는 주소는 마지막 검사 번호 대신 주소로 정한 위상((scan_no + 주소) % 간격 == 0)에 맞춰 검사합니다.
+    """
+    def __init__(self, path=DEFAULT_PATH, backoff_after=3, max_backoff_exp=4, forget_after=12):
+        self.path = path
+        self.backoff_after = backoff_after      # 이 횟수 이상 연속 무응답이면 검사 간격을 늘림
+        self.max_backoff_exp = max_backoff_exp  # 최대 2^n 스캔마다 한 번 검사
+        self.forget_after = forget_after        # 이 횟수만큼 연속 무응답이면 항목 삭제
+        self.scan_no = 0
+        self.hosts = {}
+        self.dead = {}  # "a.b.c" -> bytearray(256)
+        self.detailed = False
+        self.skipped = 0
+        self.reused = 0
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.scan_no = data.get("scan_no", 0)
+            self.hosts = data.get("hosts", {})
+            self.dead = {net: bytearray(base64.b64decode(b)) for net, b in data.get("dead", {}).items()}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"스캔 상태 파일 로드 실패: {e}")
+        return self
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            dead = {net: base64.b64encode(bytes(a)).decode("ascii") for net, a in self.dead.items()}
+            json.dump({"version": 2, "scan_no": self.scan_no, "hosts": self.hosts, "dead": dead}, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    def begin_scan(self, detailed):
+        self.scan_no += 1
+        self.detailed = detailed
+        self.skipped = 0
+        self.reused = 0
+
+    def _wait(self, streak):
+        return 2 ** min(streak - self.backoff_after + 1, self.max_backoff_exp)
+
+    def should_probe(self, ip):
+        h = self.hosts.get(ip)
+        if h:
+            if h["dead_streak"] < self.backoff_after: return True
+            return self.scan_no - h["last_probe"] >= self._wait(h["dead_streak"])
+        net, _, last = ip.rpartition(".")
+        streaks = self.dead.get(net)
+        streak = streaks[int(last)] if streaks else 0
+        if streak < self.backoff_after: return True
+        wait = self._wait(streak)
+        return (self.scan_no + int(last)) % wait == 0  # 대역 안 주소들이 서로 다른 스캔에 나눠 검사됨
+
+    def delta_targets(self, targets, contains):
+        """ 이전에 살아있던 호스트(contains로 범위 확인)를 먼저, 나머지는 백오프 규칙에 따라 순서대로 """
+        live = sorted((ip for ip, h in self.hosts.items() if h["dead_streak"] == 0 and contains(ip)),
+                      key=lambda ip: int(ipaddress.IPv4Address(ip)))
+        live_set = set(live)
+        yield from live
+        for ip in targets:
+            ip = str(ip)
+            if ip in live_set: continue
+            if not self.should_probe(ip):
+                self.skipped += 1
+                continue
+            yield ip
+
+    def reuse_detail(self, host):
+        """ 이전 스캔에서도 살아있었고 MAC이 같으면 상세 결과를 복사하고 True (상세 검사 생략) """
+        h = self.hosts.get(host.ip)
+        if not h or h["dead_streak"] != 0 or not h.get("detailed") or h.get("mac") != host.mac:
+            return False
+        host.hostname = h.get("hostname", "")
+        host.set_port_states({int(p): st for p, st in h.get("port_states", {}).items()})
+        self.reused += 1
+        return True
+
+    def record_alive(self, batch):
+        for host in batch:
+            h = self.hosts.get(host.ip)
+            if h is None or (host.mac and h.get("mac") and h["mac"] != host.mac):
+                h = self.hosts[host.ip] = {}  # 새 장치(또는 IP를 다른 장치가 사용)면 이전 정보 폐기
+            self._set_dead(host.ip, 0)
+            h.update(last_seen=time.time(), latency=host.latency, dead_streak=0, last_probe=self.scan_no)
+            if host.mac: h["mac"] = host.mac
+            if self.detailed:
+                h.update(hostname=host.hostname, ports=host.ports, detailed=True,
+                         port_states={str(p): st for p, st in host.port_states.items()})
+
+    def record_dead(self, ip):
+        h = self.hosts.get(ip)
+        if h is None:  # 응답한 적 없는 주소는 대역별 횟수만 기록
+            net, _, last = ip.rpartition(".")
+            streaks = self.dead.get(net)
+            self._set_dead(ip, min(255, (streaks[int(last)] if streaks else 0) + 1))
+            return
+        h["dead_streak"] = h.get("dead_streak", 0) + 1
+        h["last_probe"] = self.scan_no
+        if h["dead_streak"] >= self.forget_after:
+            del self.hosts[ip]
+            self._set_dead(ip, min(255, h["dead_streak"]))
+
+    def _set_dead(self, ip, streak):
+        net, _, last = ip.rpartition(".")
+        streaks = self.dead.get(net)
+        if streaks is None:
+            if not streak: return
+            streaks = self.dead[net] = bytearray(256)
+        streaks[int(last)] = streak
+        if not streak and not any(streaks): del self.dead[net]
@@ -0,0 +1,79 @@
+import ipaddress
+from bisect import bisect_right
+
+
+def _merge(intervals):
+    merged = []
+    for lo, hi in sorted(intervals):
+        if merged and lo <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], hi)
+        else:
+            merged.append([lo, hi])
+    return merged
+
+
+def _parse_range(token, whole_network=False):
+    """ 토큰 하나를 (시작 정수, 끝 정수) 로 변환. 제외 항목은 whole_network=True (CIDR 전체) """
+    if "/" in token:
+        net = ipaddress.IPv4Network(token, strict=False)
+        lo, hi = int(net.network_address), int(net.broadcast_address)
+        if net.prefixlen <= 30 and not whole_network: lo, hi = lo + 1, hi - 1  # 네트워크/브로드캐스트 주소 제외
+        return lo, hi
+    if "-" in token:
+        a, b = (x.strip() for x in token.split("-", 1))
+        start = ipaddress.IPv4Address(a)
+        if "." not in b:  # 192.168.0.10-50 형식 (마지막 옥텟만)
+            b = a.rsplit(".", 1)[0] + "." + b
+        end = ipaddress.IPv4Address(b)
+        lo, hi = int(start), int(end)
+        return min(lo, hi), max(lo, hi)
+    ip = int(ipaddress.IPv4Address(token))
+    return ip, ip
+
+
+class TargetSpec:
+    """
+    스캔 대상 목록. CIDR / 범위 / 단일 IP를 여러 개 받고, '!'로 시작하는 항목은 제외합니다.
+      예) "192.168.0.0/24, 10.10.1.1-10.10.3.254, 172.16.0.5, !192.168.0.100-120"
+    내부적으로 정수 구간 목록만 보관하므로 /16 여러 개도 메모리 사용량이 일정하며,
+    주소는 반복(iter) 시점에 하나씩 생성됩니다.
+    """
+    def __init__(self, includes=(), excludes=()):
+        self.intervals = self._subtract(_merge(includes), _merge(excludes))
+        self.starts = [lo for lo, _ in self.intervals]
+
+    @classmethod
+    def parse(cls, text):
+        includes, excludes = [], []
+        for token in text.replace(",", " ").replace(";", " ").split():
+            if token.startswith("!"):
+                excludes.append(_parse_range(token[1:], whole_network=True))
+            else:
+                includes.append(_parse_range(token))
+        if not includes: raise ValueError("스캔 대상이 없습니다.")
+        return cls(includes, excludes)
+
+    @staticmethod
+    def _subtract(includes, excludes):
+        out = []
+        for lo, hi in includes:
+            for ex_lo, ex_hi in excludes:
+                if ex_hi < lo or ex_lo > hi: continue
+                if ex_lo > lo: out.append((lo, ex_lo - 1))
+                lo = ex_hi + 1
+                if lo > hi: break
+            if lo <= hi: out.append((lo, hi))
+        return out
+
+    def __len__(self):
+        return sum(hi - lo + 1 for lo, hi in self.intervals)
+
+    def __contains__(self, ip):
+        n = int(ipaddress.IPv4Address(ip))
+        i = bisect_right(self.starts, n) - 1
+        return i >= 0 and n <= self.intervals[i][1]
+
+    def __iter__(self):
+        for lo, hi in self.intervals:
+            for n in range(lo, hi + 1):
+                yield str(ipaddress.IPv4Address(n))
@@ -1,8 +1,9 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox
 import threading
 import time
-from datetime import datetime
+
+from .ring_console import RingConsole
 
 # 외부 라이브러리 로딩 (pyserial)
 try:
@@ -61,9 +62,8 @@ class SerialTerminalGUI:
         ttk.Radiobutton(view_frame, text="ASCII", variable=self.view_format, value="ASCII").pack(side="left")
         ttk.Button(view_frame, text="지우기", command=self.clear_log).pack(side="right")
 
-        self.log_text = scrolledtext.ScrolledText(log_frame, state='disabled', height=10)
-        self.log_text.pack(fill="both", expand=True)
-        self.log_text.tag_config("TX", foreground="blue"); self.log_text.tag_config("RX", foreground="green")
+        self.console = RingConsole(log_frame, tags={"TX": "blue", "RX": "green"}, height=10)
+        self.console.pack(fill="both", expand=True)
 
     def toggle_serial(self):
         if not self.is_open:
@@ -118,15 +118,7 @@ class SerialTerminalGUI:
         self.log(f"[{tag}] {text}", tag)
 
     def log(self, msg, tag="INFO"):
-        t = datetime.now().strftime("[%H:%M:%S] ")
-        def _add():
-            self.log_text.config(state='normal')
-            self.log_text.insert(tk.END, t + msg + "\n", tag)
-            self.log_text.see(tk.END)
-            self.log_text.config(state='disabled')
-        self.parent.after(0, _add)
+        self.console.write(msg, tag)
 
     def clear_log(self):
-        self.log_text.config(state='normal')
-        self.log_text.delete(1.0, tk.END)
-        self.log_text.config(state='disabled')
+        self.console.clear()
@@ -0,0 +1,166 @@
+import os
+import mmap
+import struct
+
+try:
+    from multiprocessing import shared_memory, resource_tracker
+except ImportError:
+    shared_memory = None
+
+from .slave_datastore import AREA_KEYS, BIT_AREAS, SlaveDatastore, merge_spans
+
+# ---------------------------------------------------------------------------
+# 공유 레지스터 이미지 형식 (리틀 엔디안)
+#
+#   헤더 (32 bytes)
+#     magic     8s   b"ETSHM01\0"
+#     version   u32  1
+#     entries   u32  구간 개수 N
+#     data_size u32  데이터 영역 크기 (bytes)
+#     reserved  12x
+#
+#   구간 표 (N * 16 bytes, 국번/영역/시작 주소 순 정렬)
+#     unit   u8   국번
+#     area   u8   0=hr 1=ir 2=co 3=di
+#     pad    2x
+#     start  u32  시작 주소
+#     count  u32  개수
+#     offset u32  이미지 시작 기준 데이터 위치 (8바이트 정렬)
+#
+#   데이터
+#     hr/ir: u16 * count (리틀 엔디안, 주소 순. memoryview는 호스트 순서를 쓰므로 x86/ARM 리틀 엔디안 호스트 기준)
+#     co/di: ceil(count / 8) bytes, 주소 start+k 는 바이트 k//8 의 비트 k%8 (LSB 먼저)
+#
+# 외부 프로세스는 SharedImage.attach(이름)로 붙어서 datastore() 또는 view()로 직접 쓰거나,
+# numpy.frombuffer(img.buf, "<u2", count, offset) 등으로 복사 없이 접근할 수 있습니다.
+# ---------------------------------------------------------------------------
+MAGIC = b"ETSHM01\0"
+HEADER = struct.Struct("<8sIII12x")
+ENTRY = struct.Struct("<BB2xIII")
+
+_created = set()  # 이 프로세스가 만든 공유 메모리 이름 (resource_tracker 등록을 만든 쪽이 가짐)
+
+
+def _is_file(name):
+    return os.sep in name or "/" in name or name.endswith(".img")
+
+
+class SharedImage:
+    """
+    슬레이브 메모리를 공유 메모리(multiprocessing.shared_memory) 또는 mmap 파일에 둔 이미지.
+    이름에 경로 구분자가 있거나 .img로 끝나면 파일, 아니면 공유 메모리 이름으로 사용합니다.
+    """
+    def __init__(self, name, buf, handle, entries, owner):
+        self.name = name
+        self.buf = buf          # 이미지 전체 memoryview
+        self.handle = handle    # SharedMemory 또는 (파일, mmap)
+        self.entries = entries  # {(unit, area, start): (count, offset)}
+        self.owner = owner
+        self.views = []
+
+    @classmethod
+    def create(cls, layout, name):
+        """ 메모리 맵(parse_memory_map 결과)으로 새 이미지 생성 (값은 0) """
+        table, offset = [], 0
+        for unit in sorted(layout):
+            for ai, key in enumerate(AREA_KEYS):
+                for start, count in merge_spans(layout[unit].get(key, ())):
+                    table.append((unit, ai, start, count))
+        offset = HEADER.size + ENTRY.size * len(table)
+        rows = []
+        for unit, ai, start, count in table:
+            offset = (offset + 7) & ~7
+            rows.append((unit, ai, start, count, offset))
+            offset += (count + 7) // 8 if AREA_KEYS[ai] in BIT_AREAS else 2 * count
+        size = offset
+
+        if _is_file(name):
+            f = open(name, "w+b")
+            f.truncate(size)
+            mm = mmap.mmap(f.fileno(), size)
+            handle, buf = (f, mm), memoryview(mm)
+        else:
+            if shared_memory is None: raise RuntimeError("multiprocessing.shared_memory를 사용할 수 없습니다. (Python 3.8 이상)")
+            try:
+                old = shared_memory.SharedMemory(name=name)  # 이전 실행에서 남은 이미지 정리
+                old.close(); old.unlink()
+            except FileNotFoundError:
+                pass
+            handle = shared_memory.SharedMemory(name=name, create=True, size=size)
+            _created.add(name)
+            buf = handle.buf
+        buf[:size] = bytes(size)
+        HEADER.pack_into(buf, 0, MAGIC, 1, len(rows), size - HEADER.size - ENTRY.size * len(rows))
+        for i, row in enumerate(rows):
+            ENTRY.pack_into(buf, HEADER.size + i * ENTRY.size, *row)
+        return cls(name, buf, handle, cls._index(rows), owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """ 다른 프로세스가 만든 이미지에 연결 """
+        if _is_file(name):
+            f = open(name, "r+b")
+            try:
+                mm = mmap.mmap(f.fileno(), 0)
+            except ValueError:  # 빈 파일
+                f.close()
+                raise
+            handle, buf = (f, mm), memoryview(mm)
+        else:
+            if shared_memory is None: raise RuntimeError("multiprocessing.shared_memory를 사용할 수 없습니다. (Python 3.8 이상)")
+            try:
+                handle = shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+            except TypeError:
+                handle = shared_memory.SharedMemory(name=name)
+                # 3.12 이하는 붙기만 한 프로세스도 종료 시 이미지를 삭제하므로 추적에서 뺌 (POSIX)
+                # 같은 프로세스가 만든 이미지면 만든 쪽의 등록이므로 그대로 둠
+                if os.name == "posix" and name not in _created: resource_tracker.unregister(handle._name, "shared_memory")
+            buf = handle.buf
+        img = cls(name, buf, handle, {}, owner=False)
+        magic, version, n, _ = HEADER.unpack_from(buf, 0) if len(buf) >= HEADER.size else (None, 0, 0, 0)
+        if magic != MAGIC:
+            img.close()
+            raise ValueError(f"{name}: 레지스터 이미지가 아닙니다.")
+        img.entries = cls._index([ENTRY.unpack_from(buf, HEADER.size + i * ENTRY.size) for i in range(n)])
+        return img
+
+    @staticmethod
+    def _index(rows):
+        return {(unit, AREA_KEYS[ai], start): (count, offset) for unit, ai, start, count, offset in rows}
+
+    @property
+    def layout(self):
+        layout = {}
+        for (unit, key, start), (count, _) in self.entries.items():
+            layout.setdefault(unit, {}).setdefault(key, []).append((start, count))
+        return layout
+
+    def view(self, unit, key, start, count=None):
+        """ 구간 저장소의 memoryview (레지스터 'H', 비트 'B'). 복사 없음 """
+        n, offset = self.entries[(unit, key, start)]
+        if count is not None and count != n: raise ValueError(f"구간 크기 불일치: {count} != {n}")
+        raw = self.buf[offset:offset + ((n + 7) // 8 if key in BIT_AREAS else 2 * n)]
+        mv = raw if key in BIT_AREAS else raw.cast("H")
+        self.views += [raw, mv]
+        return mv
+
+    def datastore(self):
+        """ 이 이미지를 저장소로 쓰는 SlaveDatastore (읽기/쓰기가 곧바로 이미지에 반영) """
+        return SlaveDatastore(self.layout, alloc=self.view)
+
+    def close(self):
+        for v in reversed(self.views): v.release()
+        self.views = []
+        if isinstance(self.handle, tuple):
+            f, mm = self.handle
+            self.buf.release()
+            mm.close(); f.close()
+        else:
+            self.buf = None
+            self.handle.close()
+            if self.owner:
+                _created.discard(self.name)
+                try:
+                    self.handle.unlink()
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,215 @@
+import csv
+import math
+import time
+import random
+import threading
+from array import array
+from bisect import bisect_right
+
+from .slave_datastore import AREA_KEYS, BIT_AREAS, parse_span
+from .sample_recorder import RecordReader
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+KINDS = ("sine", "ramp", "walk", "step", "replay")
+
+SIM_EXAMPLE = "1 hr 0-99 sine amp=1000 period=10; 1 hr 100-199 walk step=5; 1 co 0-15 step period=2; 1 hr 200-209 replay file=log.etr"
+
+
+def parse_rules(text):
+    """
+    시뮬레이션 규칙 문자열 -> SimRule 목록. ';'로 구분하며 규칙은 "국번 영역 구간 종류 [키=값 ...]"
+      예) "1 hr 0-99 sine amp=1000 period=10; 1 co 0-15 step period=2"
+    """
+    rules = []
+    for entry in text.split(";"):
+        tokens = entry.split()
+        if not tokens: continue
+        if len(tokens) < 4: raise ValueError(f"'국번 영역 구간 종류' 형식이 아닙니다: {entry.strip()}")
+        unit, key, span, kind = int(tokens[0]), tokens[1].lower(), tokens[2], tokens[3].lower()
+        if key not in AREA_KEYS: raise ValueError(f"영역은 hr/ir/co/di 중 하나입니다: {tokens[1]}")
+        if kind not in KINDS: raise ValueError(f"지원하지 않는 종류: {kind} ({'/'.join(KINDS)})")
+        params = {}
+        for tok in tokens[4:]:
+            name, sep, value = tok.partition("=")
+            if not sep: raise ValueError(f"'키=값' 형식이 아닙니다: {tok}")
+            params[name.lower()] = value
+        start, count = parse_span(span)
+        rules.append(SimRule(unit, key, start, count, kind, params))
+    return rules
+
+
+def load_replay(path):
+    """ 기록 파일 -> (시각 목록(0부터 시작), 샘플 목록, width). .etr은 SampleRecorder 파일, 그 외는 "시각,값1,값2,..." CSV """
+    if path.lower().endswith(".etr"):
+        ts, vals, width = RecordReader(path).read_range()
+        rows = [vals[i * width:(i + 1) * width] for i in range(len(ts))]
+    else:
+        ts, rows = [], []
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.reader(f):
+                try:
+                    t, values = float(row[0]), array("H", (int(float(v)) & 0xFFFF for v in row[1:] if v.strip()))
+                except (ValueError, IndexError):
+                    continue  # 머리글/빈 줄
+                ts.append(t); rows.append(values)
+        width = max((len(r) for r in rows), default=0)
+    if not rows: raise ValueError(f"{path}: 재생할 샘플이 없습니다.")
+    return [t - ts[0] for t in ts], rows, width
+
+
+class SimRule:
+    """
+    한 구간(국번/영역/시작 주소/개수)의 값 발생기. 구간 전체를 한 번에 계산합니다 (numpy가 있으면 배열 연산).
+      sine   : offset + amp * sin(2π(t/period + phase*i/개수))   amp, offset, period, phase
+      ramp   : 틱마다 step씩 증가, max를 넘으면 min으로           step, min, max
+      walk   : 틱마다 ±step 범위 무작위 이동 (min~max 제한)      step, min, max
+      step   : period 주기로 lo/hi 반복 (구형파)                  lo, hi, period
+      replay : 기록 파일(.etr / CSV)을 기록된 시간 간격으로 반복 재생   file, speed
+    비트 영역(co/di)은 0.5 이상을 ON으로 씁니다.
+    """
+    def __init__(self, unit, key, start, count, kind, params=None):
+        self.unit, self.key, self.start, self.count, self.kind = unit, key, start, count, kind
+        self.bits = key in BIT_AREAS
+        hi = 1 if self.bits else 65535
+        p = dict(params or {})
+        num = lambda name, default: float(p.pop(name, default))
+        if kind == "sine":
+            self.amp = num("amp", 0.5 if self.bits else 1000)
+            self.offset = num("offset", self.amp)
+            self.period = num("period", 10)
+            phase = num("phase", 1)
+            self.phases = [phase * i / count for i in range(count)]
+        elif kind in ("ramp", "walk"):
+            self.step = num("step", 1 if kind == "ramp" or self.bits else 10)
+            self.min = num("min", 0)
+            self.max = num("max", hi - 1 if kind == "ramp" and not self.bits else hi)
+        elif kind == "step":
+            self.lo = num("lo", 0)
+            self.hi = num("hi", 1 if self.bits else 1000)
+            self.period = num("period", 2)
+        elif kind == "replay":
+            if "file" not in p: raise ValueError("replay에는 file=경로 가 필요합니다.")
+            self.speed = num("speed", 1)
+            self.times, self.rows, width = load_replay(p.pop("file"))
+            self.duration = self.times[-1] or 1.0
+            self.width = min(width, count)
+        if p: raise ValueError(f"{kind}: 알 수 없는 설정 {', '.join(p)}")
+        if kind in ("sine", "step") and self.period <= 0: raise ValueError("period는 0보다 커야 합니다.")
+        self.state = None
+        if np is not None and kind == "sine": self.phases = np.array(self.phases)
+
+    def __repr__(self):
+        return f"{self.unit} {self.key} {self.start}-{self.start + self.count - 1} {self.kind}"
+
+    def bind(self, datastore):
+        """ 규칙 구간이 메모리에 있는지 확인하고 상태(ramp/walk)를 현재 값으로 초기화 """
+        area = datastore.area(self.unit, self.key)
+        if area is None or area.find(self.start, self.count) is None:
+            raise ValueError(f"시뮬레이션 구간({self})이 메모리 맵에 없습니다.")
+        self.area = area
+        if self.kind in ("ramp", "walk"):
+            current = area.get(self.start, self.count)
+            self.state = np.array(current, dtype=float) if np is not None else [float(v) for v in current]
+
+    def values(self, t):
+        """ 시각 t(시작 후 초)의 구간 값 (numpy 배열 또는 리스트, 실수) """
+        n = self.count
+        if self.kind == "sine":
+            w = 2 * math.pi / self.period
+            if np is not None: return self.offset + self.amp * np.sin(w * (t + self.phases * self.period))
+            return [self.offset + self.amp * math.sin(w * (t + ph * self.period)) for ph in self.phases]
+        if self.kind == "ramp":
+            lo, span = self.min, self.max - self.min + 1
+            if np is not None: self.state = (self.state - lo + self.step) % span + lo
+            else: self.state = [(v - lo + self.step) % span + lo for v in self.state]
+            return self.state
+        if self.kind == "walk":
+            if np is not None:
+                self.state = np.clip(self.state + np.random.uniform(-self.step, self.step, n), self.min, self.max)
+            else:
+                self.state = [min(self.max, max(self.min, v + random.uniform(-self.step, self.step))) for v in self.state]
+            return self.state
+        if self.kind == "step":
+            v = self.hi if (t % self.period) < self.period / 2 else self.lo
+            return np.full(n, v) if np is not None else [v] * n
+        # replay: 기록 시각 기준으로 현재 샘플 선택 (끝나면 처음부터)
+        i = max(0, bisect_right(self.times, (t * self.speed) % (self.duration + 1e-9)) - 1)
+        row = self.rows[i]
+        if np is not None: return np.frombuffer(row, dtype=np.uint16)[:self.width]
+        return list(row[:self.width])
+
+    def apply(self, values):
+        """ 계산한 값을 메모리에 씀 (호출하는 쪽이 datastore.lock을 잡음) """
+        if self.bits:
+            bits = (values >= 0.5).tolist() if np is not None else [v >= 0.5 for v in values]
+            self.area.set(self.start, bits)
+        elif np is not None:
+            self.area.write(self.start, np.clip(np.rint(values), 0, 65535).astype(np.uint16))
+        else:
+            self.area.write(self.start, array("H", (min(65535, max(0, int(round(v)))) for v in values)))
+
+
+class SimEngine:
+    """
+    UI 스레드와 분리된 시뮬레이션 스레드. 매 틱마다 모든 규칙의 값을 먼저 계산한 뒤
+    datastore.lock을 잡고 한꺼번에 써서, 마스터가 한 틱의 일부만 바뀐 값을 읽지 않도록 합니다.
+    틱은 시작 시각 기준으로 예약하며 (주기 밀림 없음) 늦으면 밀린 틱은 건너뜁니다.
+    """
+    def __init__(self, datastore, rules, interval=0.1):
+        if interval <= 0: raise ValueError("주기는 0보다 커야 합니다.")
+        self.datastore = datastore
+        self.rules = rules
+        self.interval = interval
+        for rule in rules: rule.bind(datastore)
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.ticks = 0
+        self.overruns = 0
+        self.last_duration = 0.0
+        self.error = None
+
+    @property
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread and self.thread is not threading.current_thread(): self.thread.join(timeout=2)
+
+    def tick(self, t):
+        t_start = time.perf_counter()
+        blocks = [rule.values(t) for rule in self.rules]
+        with self.datastore.lock:
+            for rule, values in zip(self.rules, blocks): rule.apply(values)
+        self.ticks += 1
+        self.last_duration = time.perf_counter() - t_start
+
+    def run(self):
+        t0 = time.monotonic()
+        next_tick = t0
+        try:
+            while not self.stop_event.is_set():
+                self.tick(next_tick - t0)
+                next_tick += self.interval
+                now = time.monotonic()
+                if now > next_tick:
+                    missed = int((now - next_tick) / self.interval) + 1
+                    self.overruns += missed
+                    next_tick += missed * self.interval
+                self.stop_event.wait(max(0.0, next_tick - time.monotonic()))
+        except Exception as e:
+            self.error = e
+
+    def describe(self):
+        points = sum(rule.count for rule in self.rules)
+        return (f"규칙 {len(self.rules)}개, {points}점, {1 / self.interval:.0f} Hz | 틱 {self.ticks}회, "
+                f"계산 {self.last_duration * 1000:.1f} ms, 건너뜀 {self.overruns}회 ({'numpy' if np is not None else 'python'})")
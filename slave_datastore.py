@@ -0,0 +1,202 @@
+import threading
+from array import array
+from bisect import bisect_right
+
+AREA_KEYS = ("hr", "ir", "co", "di")
+BIT_AREAS = ("co", "di")
+DIRTY_SHIFT = 6  # 변경 표시 단위: 64주소 블록 (65536주소 = 1024블록 = 128바이트)
+
+
+def parse_span(token):
+    """ "100-199" / "100" -> (시작, 개수) """
+    lo, _, hi = token.partition("-")
+    lo, hi = int(lo), int(hi or lo)
+    if hi < lo: lo, hi = hi, lo
+    if not 0 <= lo <= hi <= 0xFFFF: raise ValueError(f"주소 범위 오류: {token}")
+    return lo, hi - lo + 1
+
+
+def parse_memory_map(text):
+    """
+    메모리 맵 문자열 -> {국번: {영역: [(시작, 개수), ...]}}
+      예) "1-3: hr 0-999 2000-2099 ir 0-99 co 0-63; 10: hr 1000-1999 di 0-15"
+    ';'로 국번 묶음을 나누고, 영역 이름(hr/ir/co/di) 뒤에 주소 구간을 나열합니다.
+    """
+    layout = {}
+    for entry in text.split(";"):
+        if not entry.strip(): continue
+        units_text, sep, areas_text = entry.partition(":")
+        if not sep: raise ValueError(f"'국번: 영역 구간' 형식이 아닙니다: {entry.strip()}")
+        units = set()
+        for tok in units_text.replace(" ", "").split(","):
+            start, count = parse_span(tok)
+            units.update(range(start, start + count))
+        if not all(0 <= u <= 247 for u in units): raise ValueError("국번은 0~247 입니다.")
+        spans, area = {}, None
+        for tok in areas_text.replace(",", " ").split():
+            if tok.lower() in AREA_KEYS:
+                area = tok.lower()
+                spans.setdefault(area, [])
+            elif area is None:
+                raise ValueError(f"영역 이름(hr/ir/co/di)이 먼저 와야 합니다: {tok}")
+            else:
+                spans[area].append(parse_span(tok))
+        for u in units:
+            for area, s in spans.items():
+                layout.setdefault(u, {}).setdefault(area, []).extend(s)
+    if not layout: raise ValueError("메모리 맵이 비어 있습니다.")
+    return layout
+
+
+def merge_spans(spans):
+    merged = []
+    for start, count in sorted(spans):
+        if merged and start <= merged[-1][0] + merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], start + count - merged[-1][0])
+        else:
+            merged.append([start, count])
+    return [(s, c) for s, c in merged]
+
+
+class RegisterArea:
+    """
+    한 영역의 희소 메모리. 설정된 주소 구간마다 연속 저장소를 하나씩 둡니다.
+    레지스터는 array('H') (레지스터당 2바이트), 비트는 8개씩 묶은 bytearray에 보관하며
+    주소 검색은 구간 시작 주소 목록의 이진 탐색으로 합니다.
+    alloc(start, count)를 주면 저장소를 직접 만들지 않고 받은 버퍼(memoryview, 'H' 또는 'B')를 씁니다.
+    set/write는 바뀐 주소 블록을 dirty 비트맵에 표시하고 version을 올립니다 (모니터 화면 갱신용).
+    """
+    def __init__(self, spans=(), bits=False, alloc=None):
+        self.bits = bits
+        self.starts, self.ends, self.segs = [], [], []
+        for start, count in merge_spans(spans):
+            self.starts.append(start)
+            self.ends.append(start + count)
+            if alloc: self.segs.append(alloc(start, count))
+            else: self.segs.append(bytearray((count + 7) // 8) if bits else array("H", bytes(2 * count)))
+        self.dirty = bytearray(((0x10000 >> DIRTY_SHIFT) + 7) // 8 if self.starts else 0)
+        self.version = 0
+
+    @property
+    def spans(self):
+        return [(s, e - s) for s, e in zip(self.starts, self.ends)]
+
+    @property
+    def size(self):
+        return sum(e - s for s, e in zip(self.starts, self.ends))
+
+    @property
+    def nbytes(self):
+        return sum(len(seg) * (1 if self.bits else 2) for seg in self.segs)
+
+    def find(self, address, count=1):
+        """ address~address+count-1 이 한 구간 안에 있으면 구간 번호, 아니면 None """
+        i = bisect_right(self.starts, address) - 1
+        if i >= 0 and address + count <= self.ends[i]: return i
+        return None
+
+    def get(self, address, count=1):
+        i = self.find(address, count)
+        if i is None: raise IndexError(f"설정되지 않은 주소: {address}+{count}")
+        seg, off = self.segs[i], address - self.starts[i]
+        if not self.bits: return seg[off:off + count].tolist()
+        return [bool(seg[b >> 3] >> (b & 7) & 1) for b in range(off, off + count)]
+
+    def set(self, address, values):
+        i = self.find(address, len(values))
+        if i is None: raise IndexError(f"설정되지 않은 주소: {address}+{len(values)}")
+        seg, off = self.segs[i], address - self.starts[i]
+        if not self.bits:
+            seg[off:off + len(values)] = array("H", (int(v) & 0xFFFF for v in values))
+        else:
+            for b, v in enumerate(values, off):
+                if v: seg[b >> 3] |= 1 << (b & 7)
+                else: seg[b >> 3] &= ~(1 << (b & 7)) & 0xFF
+        self.mark_dirty(address, len(values))
+
+    def write(self, address, data):
+        """ 레지스터 영역에 'H' 버퍼(array('H'), uint16 ndarray)를 변환 없이 복사 """
+        i = self.find(address, len(data))
+        if i is None: raise IndexError(f"설정되지 않은 주소: {address}+{len(data)}")
+        off = address - self.starts[i]
+        memoryview(self.segs[i])[off:off + len(data)] = data
+        self.mark_dirty(address, len(data))
+
+    def mark_dirty(self, address, count):
+        """ 주소 구간이 속한 블록을 변경됨으로 표시 (값을 쓴 뒤 호출) """
+        d = self.dirty
+        for blk in range(address >> DIRTY_SHIFT, ((address + count - 1) >> DIRTY_SHIFT) + 1):
+            d[blk >> 3] |= 1 << (blk & 7)
+        self.version += 1
+
+    def take_dirty(self, address, count):
+        """ 구간에 변경 표시된 블록이 있으면 True. 확인한 블록의 표시는 지움 (값을 읽기 전에 호출) """
+        if count <= 0 or not self.dirty: return False
+        d, found = self.dirty, False
+        for blk in range(address >> DIRTY_SHIFT, ((address + count - 1) >> DIRTY_SHIFT) + 1):
+            m = 1 << (blk & 7)
+            if d[blk >> 3] & m:
+                d[blk >> 3] &= ~m & 0xFF
+                found = True
+        return found
+
+    def clear(self):
+        for seg in self.segs:
+            seg[:] = bytearray(len(seg)) if self.bits else array("H", bytes(2 * len(seg)))
+        for start, end in zip(self.starts, self.ends): self.mark_dirty(start, end - start)
+
+
+class AreaBlock:
+    """ pymodbus 데이터 블록 인터페이스(validate/getValues/setValues) 어댑터 """
+    def __init__(self, area, lock=None):
+        self.area = area
+        self.lock = lock or threading.Lock()
+
+    def validate(self, address, count=1):
+        return self.area.find(address, count) is not None
+
+    def getValues(self, address, count=1):
+        with self.lock:
+            return self.area.get(address, count)
+
+    def setValues(self, address, values):
+        with self.lock:
+            self.area.set(address, values if isinstance(values, (list, tuple)) else [values])
+
+    def reset(self):
+        self.area.clear()
+
+
+class SlaveDatastore:
+    """
+    여러 국번 x 4개 영역(hr/ir/co/di)의 메모리. 설정하지 않은 영역/주소는 비어 있어
+    마스터가 요청하면 잘못된 주소(예외 02)로 응답하게 됩니다.
+    lock은 여러 구간을 한 번에 바꾸는 쪽(시뮬레이션)과 서버 응답이 중간 상태를 보지 않도록 함께 잡는 잠금입니다.
+    """
+    def __init__(self, layout, alloc=None):
+        self.lock = threading.RLock()
+        self.units = {}
+        for unit, areas in layout.items():
+            self.units[unit] = {}
+            for key in AREA_KEYS:
+                seg_alloc = (lambda start, count, unit=unit, key=key: alloc(unit, key, start, count)) if alloc else None
+                self.units[unit][key] = RegisterArea(areas.get(key, ()), bits=key in BIT_AREAS, alloc=seg_alloc)
+
+    @classmethod
+    def parse(cls, text, alloc=None):
+        return cls(parse_memory_map(text), alloc)
+
+    def area(self, unit, key):
+        areas = self.units.get(unit)
+        return areas[key] if areas else None
+
+    def get(self, unit, key, address, count=1):
+        return self.units[unit][key].get(address, count)
+
+    def set(self, unit, key, address, values):
+        self.units[unit][key].set(address, values)
+
+    def describe(self):
+        points = sum(a.size for areas in self.units.values() for a in areas.values())
+        nbytes = sum(a.nbytes for areas in self.units.values() for a in areas.values())
+        return f"국번 {len(self.units)}개, {points}점, 메모리 {nbytes / 1024:.1f} KB"
@@ -0,0 +1,124 @@
+import csv
+import struct
+from operator import itemgetter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 데이터 형식 -> (struct 코드, 레지스터 개수)
+TYPES = {
+    "int16": ("h", 1), "uint16": ("H", 1),
+    "int32": ("i", 2), "uint32": ("I", 2),
+    "int64": ("q", 4), "uint64": ("Q", 4),
+    "float32": ("f", 2), "float64": ("d", 4),
+    "bcd16": ("H", 1), "bcd32": ("I", 2),
+    "bit": ("H", 1),    # bit:<위치>[:<폭>]
+    "ascii": (None, 1), # ascii:<레지스터 개수>
+}
+
+# 바이트 순서 표기 (값의 최상위 바이트 = A)
+#   ABCD: 빅 엔디안 (기본)   CDAB: 워드 스왑   BADC: 바이트 스왑   DCBA: 리틀 엔디안
+ORDERS = ("ABCD", "CDAB", "BADC", "DCBA")
+
+
+class Tag:
+    def __init__(self, name, address, dtype="uint16", order="ABCD", scale=1.0):
+        kind, _, arg = dtype.lower().partition(":")
+        if kind not in TYPES: raise ValueError(f"{name}: 알 수 없는 형식 {dtype}")
+        order = order.upper() or "ABCD"
+        if order not in ORDERS: raise ValueError(f"{name}: 바이트 순서는 {'/'.join(ORDERS)} 중 하나입니다.")
+        self.name = name
+        self.address = int(address)
+        self.kind = kind
+        self.order = order
+        self.scale = float(scale or 1)
+        self.code, self.words = TYPES[kind]
+        self.bit, self.width = 0, 1
+        if kind == "ascii":
+            self.words = int(arg or 1)
+            self.code = f"{2 * self.words}s"
+        elif kind == "bit":
+            pos, _, width = arg.partition(":")
+            self.bit, self.width = int(pos or 0), int(width or 1)
+            if not 0 <= self.bit < 16 or self.bit + self.width > 16: raise ValueError(f"{name}: 비트 위치는 0~15 입니다.")
+
+    def byte_order(self, offset):
+        """ 이 태그의 값을 빅 엔디안(ABCD)으로 만드는 바이트 인덱스 (레지스터 블록 offset 기준) """
+        words = list(range(offset, offset + self.words))
+        if self.order in ("CDAB", "DCBA") and self.kind != "ascii": words.reverse()
+        swap = self.order in ("BADC", "DCBA")
+        return [i for w in words for i in ((2 * w + 1, 2 * w) if swap else (2 * w, 2 * w + 1))]
+
+    def convert(self, raw):
+        if self.kind == "ascii":
+            return raw.split(b"\0", 1)[0].decode("ascii", "replace").rstrip()
+        if self.kind == "bit":
+            v = (raw >> self.bit) & ((1 << self.width) - 1)
+            return bool(v) if self.width == 1 else v
+        if self.kind.startswith("bcd"):
+            digits = f"{raw:X}"
+            if not digits.isdigit(): return None  # BCD가 아닌 값
+            raw = int(digits)
+        return raw * self.scale if self.scale != 1.0 else raw
+
+
+class TagMap:
+    """
+    레지스터 블록을 형식이 있는 값으로 변환하는 태그 맵.
+    addresses: 읽어야 할 레지스터 주소 (정렬) - TagReadGroup으로 이 주소들을 읽으면
+    decode()가 값 목록을 바로 받아 {태그 이름: 값} 을 만듭니다.
+    태그별 바이트/워드 순서 변환은 미리 계산한 바이트 인덱스로 한 번에 재배열하고,
+    전체 태그를 struct.unpack 한 번으로 해석합니다.
+    """
+    def __init__(self, tags):
+        self.tags = list(tags)
+        if not self.tags: raise ValueError("태그가 없습니다.")
+        self.addresses = sorted({t.address + i for t in self.tags for i in range(t.words)})
+        pos = {a: i for i, a in enumerate(self.addresses)}
+        perm = [i for t in self.tags for i in t.byte_order(pos[t.address])]
+        self.pack = struct.Struct(f">{len(self.addresses)}H").pack
+        self.unpack = struct.Struct(">" + "".join(t.code for t in self.tags)).unpack
+        self.reorder = np.array(perm, dtype=np.intp) if np is not None else itemgetter(*perm)
+        self.plain = all(t.kind not in ("ascii", "bit") and not t.kind.startswith("bcd") and t.scale == 1.0 for t in self.tags)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        CSV 태그 맵 읽기: 이름, 주소, 형식[, 순서[, 배율]]  ('#' 줄은 주석)
+          예) Temp,100,float32,CDAB
+              Status,110,bit:3
+              Model,120,ascii:8,BADC
+        """
+        tags = []
+        with open(filename, newline="", encoding="utf-8-sig") as f:
+            for row in csv.reader(f):
+                row = [c.strip() for c in row]
+                if not row or not row[0] or row[0].startswith("#"): continue
+                if row[1].lower() in ("address", "주소"): continue  # 헤더 줄
+                tags.append(Tag(*row[:5]))
+        return cls(tags)
+
+    def __len__(self):
+        return len(self.tags)
+
+    def decode(self, values):
+        """ addresses 순서의 레지스터 값 목록 -> {태그 이름: 값} """
+        raw = self.pack(*values)
+        if np is not None:
+            buf = np.frombuffer(raw, dtype=np.uint8)[self.reorder].tobytes()
+        else:
+            buf = bytes(self.reorder(raw))
+        fields = self.unpack(buf)
+        if self.plain: return dict(zip((t.name for t in self.tags), fields))
+        return {t.name: t.convert(v) for t, v in zip(self.tags, fields)}
+
+    def touching(self, decoded, addresses):
+        """ decoded 중 주어진 레지스터 주소를 포함하는 태그만 """
+        return {t.name: decoded[t.name] for t in self.tags
+                if any(t.address + i in addresses for i in range(t.words))}
+
+    @staticmethod
+    def format(decoded):
+        return ", ".join(f"{k}={v:.6g}" if isinstance(v, float) else f"{k}={v}" for k, v in decoded.items())
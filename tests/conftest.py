@@ -0,0 +1,10 @@
+import os
+import sys
+import importlib.util
+
+# 저장소 루트가 EngTool에서 'modules' 패키지로 import 되므로 테스트에서도 같은 이름으로 등록
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if "modules" not in sys.modules:
+    spec = importlib.util.spec_from_file_location("modules", os.path.join(ROOT, "__init__.py"), submodule_search_locations=[ROOT])
+    sys.modules["modules"] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(sys.modules["modules"])
@@ -0,0 +1,156 @@
+import socket
+import struct
+import asyncio
+import threading
+
+import pytest
+
+from modules.async_master import MBAP, AsyncModbusTcpMaster, AsyncPollRunner
+from modules.modbus_poll import PollGroup, ModbusReadError
+
+
+def good(fc, addr, cnt):
+    return bytes((fc, 2 * cnt)) + struct.pack(f">{cnt}H", *range(addr, addr + cnt))
+
+
+async def start_fake(reply, port=0):
+    """ reply(n, fc, addr, cnt) -> (MBAP 길이 필드 또는 None, PDU) 또는 None(응답 안 함). n은 요청 순번 """
+    state = {"n": 0}
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                tid, _, length, unit = MBAP.unpack(await reader.readexactly(MBAP.size))
+                fc, addr, cnt = struct.unpack(">BHH", await reader.readexactly(length - 1))
+                state["n"] += 1
+                r = reply(state["n"], fc, addr, cnt)
+                if r is None: continue
+                length, pdu = r
+                writer.write(MBAP.pack(tid, 0, len(pdu) + 1 if length is None else length, unit) + pdu)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+    server = await asyncio.start_server(handle, "127.0.0.1", port)
+    return server, server.sockets[0].getsockname()[1]
+
+
+@pytest.mark.parametrize("pdu", [
+    lambda fc, addr, cnt: good(fc, addr, 1),                 # 5개 요청에 1개 응답
+    lambda fc, addr, cnt: bytes((fc, 10)) + b"\0\1",         # 바이트 수 필드와 실제 길이 불일치
+    lambda fc, addr, cnt: good(4, addr, cnt),                # 다른 기능 코드
+    lambda fc, addr, cnt: bytes((fc,)),                      # 바이트 수 없음
+])
+def test_malformed_response_raises_read_error(pdu):
+    async def run():
+        server, port = await start_fake(lambda n, fc, addr, cnt: (None, pdu(fc, addr, cnt)))
+        master = AsyncModbusTcpMaster("127.0.0.1", port, timeout=1.0)
+        try:
+            with pytest.raises(ModbusReadError):
+                await master.read("hr", 0, 5, 1)
+        finally:
+            await master.close()
+            server.close()
+    asyncio.run(run())
+
+
+def test_invalid_mbap_length_drops_connection():
+    async def run():
+        server, port = await start_fake(lambda n, fc, addr, cnt: (0 if n == 1 else None, good(fc, addr, cnt)))
+        master = AsyncModbusTcpMaster("127.0.0.1", port, timeout=1.0)
+        try:
+            with pytest.raises(ConnectionError):
+                await master.read("hr", 0, 5, 1)
+            assert await master.read("hr", 0, 3, 1) == [0, 1, 2]  # 다시 연결해서 정상 동작
+        finally:
+            await master.close()
+            server.close()
+    asyncio.run(run())
+
+
+def test_group_keeps_polling_after_bad_frame():
+    results, errors = [], []
+    ready = threading.Event()
+    box = {}
+
+    def serve():
+        async def main():
+            server, box["port"] = await start_fake(
+                lambda n, fc, addr, cnt: (None, good(fc, addr, 1) if n == 1 else good(fc, addr, cnt)))
+            box["loop"], box["stop"] = asyncio.get_running_loop(), asyncio.Event()
+            ready.set()
+            await box["stop"].wait()
+            server.close()
+        asyncio.run(main())
+    th = threading.Thread(target=serve)
+    th.start()
+    ready.wait(5)
+
+    group = PollGroup("hr", 10, 5, period=0.05)
+    def on_result(g, values, ts):
+        results.append(values)
+        if len(results) >= 3: runner.stop()
+    runner = AsyncPollRunner([("127.0.0.1", box["port"], [group])], on_result=on_result,
+                             on_error=lambda g, e: errors.append(e), timeout=1.0)
+    timer = threading.Timer(5, runner.stop)
+    timer.start()
+    runner.run()
+    timer.cancel()
+    box["loop"].call_soon_threadsafe(box["stop"].set)
+    th.join(5)
+
+    assert len(errors) == 1 and isinstance(errors[0], ModbusReadError)
+    assert results[:3] == [[10, 11, 12, 13, 14]] * 3
+    h, = runner.health()
+    assert h["name"] == f"TCP:127.0.0.1:{box['port']}" and h["connects"] == 1 and h["drops"] == 0
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_connect_backs_off_until_device_comes_up():
+    states = []
+
+    async def run():
+        port = free_port()
+        master = AsyncModbusTcpMaster("127.0.0.1", port, timeout=0.5, base_delay=0.1, jitter=0.0,
+                                      on_state=lambda m, msg: states.append((m.connected, msg)))
+        task = asyncio.get_running_loop().create_task(master.read("hr", 0, 2, 1))  # 연결될 때까지 대기
+        await asyncio.sleep(0.5)
+        assert not task.done()
+        failures = master.connect_failures
+        assert 2 <= failures <= 4  # 0, 0.1, 0.3 초 ... (재시도마다 두 배)
+        server, _ = await start_fake(lambda n, fc, addr, cnt: (None, good(fc, addr, cnt)), port)
+        try:
+            assert await asyncio.wait_for(task, 2.0) == [0, 1]
+            h = master.health()
+            assert h["connected"] and h["connects"] == 1 and h["connect_failures"] >= failures
+            assert states[-1] == (True, "연결됨") and all(not up for up, _ in states[:-1])
+        finally:
+            await master.close()
+            server.close()
+    asyncio.run(run())
+
+
+def test_repeated_timeouts_drop_half_open_connection():
+    states = []
+
+    async def run():
+        server, port = await start_fake(lambda n, fc, addr, cnt: None if n <= 2 else (None, good(fc, addr, cnt)))
+        master = AsyncModbusTcpMaster("127.0.0.1", port, timeout=0.1, max_silent=2,
+                                      on_state=lambda m, msg: states.append(msg))
+        try:
+            for _ in range(2):
+                with pytest.raises(asyncio.TimeoutError):
+                    await master.read("hr", 0, 1, 1)
+            assert not master.connected and master.health()["drops"] == 1
+            assert "half-open" in master.last_error
+            assert await master.read("hr", 5, 2, 1) == [5, 6]  # 바로 다시 연결
+            h = master.health()
+            assert h["connects"] == 2 and h["connected"]
+            assert states[-1] == "재연결됨 (누적 끊김 1회)"
+        finally:
+            await master.close()
+            server.close()
+    asyncio.run(run())
@@ -0,0 +1,67 @@
+import struct
+
+import pytest
+
+from modules.async_slave_server import handle_pdu
+from modules.slave_datastore import SlaveDatastore
+
+
+@pytest.fixture
+def ds():
+    ds = SlaveDatastore.parse("1: hr 0-999 co 0-99; 2: ir 0-9")
+    ds.set(1, "hr", 10, [0x1234, 0xABCD])
+    ds.set(1, "co", 0, [True, False, True, True, False, False, False, False, True])
+    ds.set(2, "ir", 0, [7, 8])
+    return ds
+
+
+def req(fc, addr, count, data=None):
+    pdu = struct.pack(">BHH", fc, addr, count)
+    return pdu if data is None else pdu + bytes((len(data),)) + data
+
+
+def test_reads(ds):
+    assert handle_pdu(ds, 1, req(3, 10, 3)) == bytes((3, 6, 0x12, 0x34, 0xAB, 0xCD, 0, 0))
+    assert handle_pdu(ds, 2, req(4, 0, 2)) == bytes((4, 4, 0, 7, 0, 8))
+    assert handle_pdu(ds, 1, req(1, 0, 9)) == bytes((1, 2, 0b00001101, 0b1))  # LSB 먼저
+
+
+@pytest.mark.parametrize("unit, pdu, code", [
+    (9, req(3, 0, 1), 0x0B),             # 없는 국번
+    (1, req(8, 0, 1), 0x01),             # 지원하지 않는 기능 코드
+    (1, bytes((3, 0, 0)), 0x03),         # 짧은 PDU
+    (1, req(3, 0, 0), 0x03),             # 개수 0
+    (1, req(3, 0, 126), 0x03),           # FC3 최대 125
+    (1, req(1, 0, 2001), 0x03),          # FC1 최대 2000
+    (1, req(3, 999, 2), 0x02),           # 구간 밖으로 넘어감
+    (1, req(2, 0, 1), 0x02),             # 정의되지 않은 영역 (di)
+    (2, req(4, 10, 1), 0x02),
+    (1, req(5, 0, 0x1234), 0x03),        # FC5 값은 0 / 0xFF00
+    (1, req(5, 100, 0xFF00), 0x02),
+    (1, req(6, 1000, 1), 0x02),
+    (1, req(16, 0, 2, b"\0\0"), 0x03),   # 바이트 수 불일치
+    (1, req(16, 0, 124, bytes(248)), 0x03),
+    (1, req(15, 95, 8, b"\xff"), 0x02),
+])
+def test_exceptions(ds, unit, pdu, code):
+    fc = pdu[0]
+    assert handle_pdu(ds, unit, pdu) == bytes((fc | 0x80, code))
+
+
+def test_writes(ds):
+    pdu = req(5, 3, 0x0000)
+    assert handle_pdu(ds, 1, pdu) == pdu[:5]
+    assert handle_pdu(ds, 1, req(5, 4, 0xFF00)) == req(5, 4, 0xFF00)
+    assert ds.get(1, "co", 2, 3) == [True, False, True]
+
+    assert handle_pdu(ds, 1, req(6, 500, 0xBEEF)) == req(6, 500, 0xBEEF)
+    assert ds.get(1, "hr", 500, 1) == [0xBEEF]
+
+    pdu = req(15, 90, 10, bytes((0b10100101, 0b10)))
+    assert handle_pdu(ds, 1, pdu) == pdu[:5]
+    assert ds.get(1, "co", 90, 10) == [True, False, True, False, False, True, False, True, False, True]
+
+    pdu = req(16, 998, 2, struct.pack(">2H", 1, 0xFFFF))
+    assert handle_pdu(ds, 1, pdu) == pdu[:5]
+    assert ds.get(1, "hr", 998, 2) == [1, 0xFFFF]
+    assert handle_pdu(ds, 1, req(3, 998, 2)) == bytes((3, 4, 0, 1, 0xFF, 0xFF))
@@ -0,0 +1,66 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from modules import change_filter
+from modules.change_filter import ChangeFilter, parse_deadbands
+
+MODES = ["numpy", "numpy-small-block", "python"]
+
+
+@pytest.fixture(params=MODES)
+def mode(request, monkeypatch):
+    """ numpy 배열 연산 / numpy 띠 + 파이썬 비교 (작은 블록) / 순수 파이썬 경로 """
+    if request.param != "python" and change_filter.np is None: pytest.skip("numpy 없음")
+    if request.param == "numpy": monkeypatch.setattr(change_filter, "NUMPY_MIN", 1)
+    if request.param == "numpy-small-block": monkeypatch.setattr(change_filter, "NUMPY_MIN", 10 ** 9)
+    if request.param == "python": monkeypatch.setattr(change_filter, "np", None)
+    return request.param
+
+
+def reference(new, old, default, overrides, addresses):
+    out = []
+    for i, (a, x, y) in enumerate(zip(addresses, new, old)):
+        v, pct = overrides.get(a, default)
+        if x != y and abs(x - y) > (y * v / 100.0 if pct else v): out.append(i)
+    return out
+
+
+def test_parse_deadbands():
+    assert parse_deadbands("2") == ((2.0, False), {})
+    assert parse_deadbands("0.5%; 100:5%, 101:0") == ((0.5, True), {100: (5.0, True), 101: (0.0, False)})
+    assert parse_deadbands("") == ((0.0, False), {})
+
+
+@pytest.mark.parametrize("text", ["", "3", "2%", "2, 100:5%, 101:0, 150:20"])
+def test_paths_agree_with_reference(mode, text):
+    default, overrides = parse_deadbands(text)
+    group = SimpleNamespace(addresses=list(range(90, 190)))
+    cf = ChangeFilter(default, overrides)
+    rng = random.Random(text)
+    reported = [rng.randrange(65536) for _ in group.addresses]
+    assert cf.changed(group, reported) == list(range(100))  # 첫 샘플은 전체
+    for _ in range(200):
+        cur = [min(65535, max(0, v + rng.choice((0, 0, 1, -1, 3, -5, 40, -400)))) for v in reported]
+        idx = cf.changed(group, cur)
+        assert idx == reference(cur, reported, default, overrides, group.addresses)
+        for i in idx: reported[i] = cur[i]  # 보고한 위치만 기준 값이 바뀜
+
+
+def test_percent_band_accumulates_against_last_reported(mode):
+    group = SimpleNamespace(addresses=[0])
+    cf = ChangeFilter((10.0, True))
+    cf.changed(group, [1000])
+    assert cf.changed(group, [1060]) == []
+    assert cf.changed(group, [1100]) == []  # 정확히 10%는 생략 (초과만 보고)
+    assert cf.changed(group, [1101]) == [0]
+    assert cf.changed(group, [1101]) == []
+    assert (cf.samples, cf.suppressed, cf.values_suppressed) == (5, 3, 3)
+
+
+def test_width_change_resets_group(mode):
+    group = SimpleNamespace(addresses=[0, 1, 2])
+    cf = ChangeFilter((5.0, False))
+    cf.changed(group, [0, 0])
+    assert cf.changed(group, [1, 1, 1]) == [0, 1, 2]
@@ -0,0 +1,35 @@
+import time
+import asyncio
+
+from modules import hostname_resolver
+from modules.hostname_resolver import HostnameResolver
+
+
+def test_queued_lookups_are_not_timed_out(monkeypatch):
+    # 스레드 2개, 조회 0.5초, timeout 1초: 큐에서 기다린 시간은 timeout에 포함되지 않아야 함
+    def slow_lookup(ip):
+        time.sleep(0.5)
+        return (f"host-{ip}", [], [ip])
+    monkeypatch.setattr(hostname_resolver.socket, "gethostbyaddr", slow_lookup)
+    resolver = HostnameResolver(concurrency=2, timeout=1.0)
+    ips = [f"10.0.0.{i}" for i in range(10)]
+
+    async def run():
+        return await asyncio.gather(*(resolver.resolve(ip) for ip in ips))
+    assert asyncio.run(run()) == [f"host-{ip}" for ip in ips]
+    assert all(resolver.cached(ip) == f"host-{ip}" for ip in ips)
+
+
+def test_timed_out_lookup_still_fills_cache(monkeypatch):
+    def slow_lookup(ip):
+        time.sleep(0.3)
+        return ("late-host", [], [ip])
+    monkeypatch.setattr(hostname_resolver.socket, "gethostbyaddr", slow_lookup)
+    resolver = HostnameResolver(concurrency=1, timeout=0.05)
+
+    async def run():
+        name = await resolver.resolve("10.0.0.1")
+        await asyncio.sleep(0.5)
+        return name
+    assert asyncio.run(run()) == ""
+    assert resolver.cached("10.0.0.1") == "late-host"
@@ -0,0 +1,47 @@
+import json
+import threading
+import time
+
+import pytest
+
+from modules import modbus_logger_cli
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.setattr(modbus_logger_cli.signal, "signal", lambda *a: None)  # pytest의 SIGINT 처리 유지
+    path = tmp_path / "logger.json"
+    path.write_text(json.dumps({"ip": "127.0.0.1", "groups": [{"area": "hr", "count": 4}], "output": "none"}))
+    return str(path)
+
+
+def fail_to_start(self):
+    raise RuntimeError("pymodbus 라이브러리가 필요합니다.")
+
+
+def timers():
+    return [t for t in threading.enumerate() if isinstance(t, threading.Timer) and t.is_alive()]
+
+
+@pytest.mark.parametrize("run, code", [
+    (lambda self: None, 0),    # 중지(SIGINT/SIGTERM)로 먼저 끝남
+    (fail_to_start, 1),        # 시작 오류
+])
+def test_duration_timer_does_not_outlive_session(config, monkeypatch, run, code):
+    monkeypatch.setattr(modbus_logger_cli.PollSession, "run", run)
+    before = set(timers())
+    t0 = time.monotonic()
+    assert modbus_logger_cli.main([config, "--duration", "86400"]) == code
+    deadline = time.monotonic() + 2
+    while set(timers()) - before and time.monotonic() < deadline: time.sleep(0.01)
+    assert not set(timers()) - before
+    assert time.monotonic() - t0 < 2
+
+
+def test_duration_stops_session(config, monkeypatch):
+    stopped = threading.Event()
+    monkeypatch.setattr(modbus_logger_cli.PollSession, "run", lambda self: stopped.wait(5))
+    monkeypatch.setattr(modbus_logger_cli.PollSession, "stop", lambda self: stopped.set())
+    t0 = time.monotonic()
+    assert modbus_logger_cli.main([config, "--duration", "0.1"]) == 0
+    assert stopped.is_set() and time.monotonic() - t0 < 2
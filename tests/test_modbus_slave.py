@@ -0,0 +1,25 @@
+import threading
+from types import SimpleNamespace
+
+from modules import modbus_slave
+from modules.modbus_slave import ModbusSlaveGUI
+from modules.slave_datastore import SlaveDatastore
+
+
+class CheckedDatastore(SlaveDatastore):
+    """ 잠금 없이 set()하면 기록 """
+    def set(self, unit, key, address, values):
+        self.unlocked = not self.lock._is_owned()
+        super().set(unit, key, address, values)
+
+
+def test_grid_edit_writes_under_datastore_lock(monkeypatch):
+    ds = CheckedDatastore.parse("1: hr 0-9")
+    refreshed = threading.Event()
+    app = SimpleNamespace(is_server_running=True, monitor=(1, "hr", 0, 10), datastore=ds,
+                          grid=SimpleNamespace(row_index=lambda y: 3, refresh=refreshed.set),
+                          fetch_rows=lambda row, n: [(row, 0, "0x0000")])
+    monkeypatch.setattr(modbus_slave.simpledialog, "askinteger", lambda *a, **kw: 1234)
+    ModbusSlaveGUI.on_double_click(app, SimpleNamespace(y=40))
+    assert ds.get(1, "hr", 3) == [1234] and refreshed.is_set()
+    assert ds.unlocked is False
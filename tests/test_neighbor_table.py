@@ -0,0 +1,52 @@
+import threading
+import time
+
+from modules.neighbor_table import NeighborTable
+
+
+class YieldingLock:
+    """ 잠금을 풀고 잠깐 쉬어 다른 스레드가 끼어들 틈을 만듦 """
+    def __init__(self):
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        self.lock.acquire()
+
+    def __exit__(self, *exc):
+        self.lock.release()
+        time.sleep(0.01)
+
+
+def test_concurrent_misses_refresh_once(monkeypatch):
+    nt = NeighborTable()
+    calls = []
+
+    def read():
+        calls.append(1)
+        time.sleep(0.05)  # arp -a 처럼 느린 읽기
+        return {"10.0.0.1": "00:11:22:33:44:55"}
+    monkeypatch.setattr(nt, "PROC_PATH", "/")
+    monkeypatch.setattr(nt, "_read_proc", read)
+    nt.lock = YieldingLock()
+    start = threading.Barrier(8)
+    results = []
+
+    def worker(ip):
+        start.wait()
+        results.append(nt.lookup(ip, max_age=1.0))
+    threads = [threading.Thread(target=worker, args=(f"10.1.0.{i}",)) for i in range(7)]
+    threads.append(threading.Thread(target=worker, args=("10.0.0.1",)))
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert len(calls) == 1  # 라우팅된 VLAN처럼 계속 없는 주소도 한 번만 갱신
+    assert sorted(results, key=str) == ["00:11:22:33:44:55"] + [None] * 7
+    assert nt.lookup("10.1.0.9", max_age=1.0) is None and len(calls) == 1
+
+
+def test_refresh_without_max_age_always_reads(monkeypatch):
+    nt = NeighborTable()
+    calls = []
+    monkeypatch.setattr(nt, "PROC_PATH", "/")
+    monkeypatch.setattr(nt, "_read_proc", lambda: calls.append(1) or {})
+    nt.refresh(); nt.refresh()
+    assert len(calls) == 2
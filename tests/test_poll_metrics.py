@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+from modules.async_master import AsyncPollRunner
+from modules.modbus_poll import PollGroup, ModbusReadError
+from modules.poll_metrics import LatencyHistogram, PollMetrics
+from modules.poll_session import PollSession
+
+
+def test_histogram_percentiles_within_bucket_error():
+    h = LatencyHistogram()
+    for i in range(1, 1001): h.record(i / 1000.0)  # 1ms ~ 1s
+    for p, expected in ((50, 0.5), (90, 0.9), (99, 0.99)):
+        assert abs(h.percentile(p) - expected) / expected < 0.04
+    snap = h.snapshot()
+    assert snap["count"] == 1000 and snap["min"] == 1.0 and snap["max"] == 1000.0
+
+
+def test_error_classification():
+    m, g = PollMetrics(), PollGroup("hr", 0, 1)
+    m.record_error(g, ModbusReadError("exc", code=2))
+    m.record_error(g, ModbusReadError("no response"))
+    m.record_error(g, asyncio.TimeoutError())
+    m.record_error(g, ConnectionError("reset"))
+    s = m.snapshot()
+    assert (s["errors"], s["timeouts"], s["disconnects"], s["exception_codes"]) == (4, 2, 1, {"2": 1})
+
+
+def test_async_timeouts_are_counted_as_timeouts():
+    # 요청을 받기만 하고 응답하지 않는 장치
+    ready, box = threading.Event(), {}
+
+    def serve():
+        async def handle(reader, writer):
+            try:
+                while await reader.read(256): pass
+            except ConnectionError:
+                pass
+        async def main():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            box["port"] = server.sockets[0].getsockname()[1]
+            box["loop"], box["stop"] = asyncio.get_running_loop(), asyncio.Event()
+            ready.set()
+            await box["stop"].wait()
+            server.close()
+        asyncio.run(main())
+    th = threading.Thread(target=serve)
+    th.start()
+    ready.wait(5)
+
+    logs = []
+    session = PollSession({}, on_sample=None, on_log=lambda msg, tag: logs.append((tag, msg)))
+    metrics = session.metrics
+    def on_error(group, err):
+        session.poll_error(group, err)
+        if metrics.errors >= 2: runner.stop()
+    runner = AsyncPollRunner([("127.0.0.1", box["port"], [PollGroup("hr", 0, 1, period=0.05)])],
+                             on_result=lambda *a: None, on_error=on_error, timeout=0.1)
+    timer = threading.Timer(5, runner.stop)
+    timer.start()
+    runner.run()
+    timer.cancel()
+    box["loop"].call_soon_threadsafe(box["stop"].set)
+    th.join(5)
+
+    s = metrics.snapshot()
+    assert s["errors"] >= 2 and s["timeouts"] == s["errors"] and s["disconnects"] == 0
+    assert logs[0] == ("ERR", "[HR 0+1 #1] 읽기 실패: 응답 시간 초과")  # str(TimeoutError())는 빈 문자열
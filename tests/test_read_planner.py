@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+import pytest
+
+from modules.modbus_poll import ModbusReadError
+from modules.poll_session import make_group, sample_values
+from modules.read_planner import TagReadGroup, parse_addresses, plan_reads
+
+
+class FakeClient:
+    """ 주소 = 값으로 응답하고, limit보다 큰 요청은 예외 코드 exc_code로 거부하는 장치 """
+    def __init__(self, limit=125, exc_code=2):
+        self.limit = limit
+        self.exc_code = exc_code
+        self.requests = []
+
+    def read_holding_registers(self, address, count, slave):
+        self.requests.append((address, count))
+        if count > self.limit:
+            return SimpleNamespace(isError=lambda: True, exception_code=self.exc_code)
+        return SimpleNamespace(isError=lambda: False, registers=list(range(address, address + count)))
+
+
+def test_parse_addresses():
+    assert parse_addresses("5, 0-2; 9-7, 5") == [0, 1, 2, 5, 7, 8, 9]
+    with pytest.raises(ValueError):
+        parse_addresses("65536")
+
+
+@pytest.mark.parametrize("addrs, max_count, max_gap, expected", [
+    ([0, 1, 2, 10, 11], 125, 0, [(0, 3), (10, 2)]),
+    ([0, 1, 2, 10, 11], 125, 7, [(0, 12)]),
+    ([0, 1, 2, 10, 11], 125, 6, [(0, 3), (10, 2)]),
+    (range(300), 125, 0, [(0, 125), (125, 125), (250, 50)]),
+    ([0, 100, 124, 125], 125, 200, [(0, 125), (125, 1)]),
+    ([3, 3, 1], 125, 0, [(1, 1), (3, 1)]),
+])
+def test_plan_reads(addrs, max_count, max_gap, expected):
+    assert plan_reads(addrs, max_count, max_gap) == expected
+
+
+def test_plan_reads_respects_protocol_limit():
+    group = TagReadGroup("hr", range(1000), max_count=500)
+    assert group.max_count == 125
+    assert all(count <= 125 for _, count in group.spans)
+
+
+def test_read_returns_values_in_address_order():
+    group = TagReadGroup("hr", [40, 10, 11, 300], max_gap=5)
+    assert group.read(FakeClient()) == [10, 11, 40, 300]
+
+
+def test_rejected_span_is_split_at_largest_gap_and_kept():
+    group = TagReadGroup("hr", [0, 1, 2, 50, 51], max_gap=100)
+    assert group.spans == [(0, 52)]
+    client = FakeClient(limit=10)
+    assert group.read(client) == [0, 1, 2, 50, 51]
+    assert group.spans == [(0, 3), (50, 2)]
+    assert group.splits == 1
+    client.requests.clear()
+    group.read(client)
+    assert client.requests == [(0, 3), (50, 2)]  # 나눈 계획을 다음 주기에도 사용
+
+
+def test_contiguous_span_is_halved_until_accepted():
+    group = TagReadGroup("hr", range(16))
+    assert group.read(FakeClient(limit=4)) == list(range(16))
+    assert group.spans == [(0, 4), (4, 4), (8, 4), (12, 4)]
+
+
+def test_non_split_exception_is_raised():
+    group = TagReadGroup("hr", [0, 50], max_gap=100)
+    with pytest.raises(ModbusReadError):
+        group.read(FakeClient(limit=10, exc_code=4))
+    assert group.spans == [(0, 51)]
+
+
+@pytest.mark.parametrize("count", [100, 300])
+def test_make_group_start_count_splits_on_rejection(count):
+    group = make_group("Holding Reg (4x)", unit=2, address=0, count=count)
+    assert group.name == f"HR 0+{count} #2" and group.addresses == range(count)
+    client = FakeClient(limit=50, exc_code=3)
+    assert group.read(client) == list(range(count))
+    assert all(c <= 50 for _, c in group.spans)
+    assert [a for s, c in group.spans for a in range(s, s + c)] == list(range(count))
+    assert len(client.requests) == len(group.spans) + group.splits  # 거부된 요청마다 한 번 나눔
+    client.requests.clear()
+    assert sample_values(group, group.read(client), [0, count - 1]) == {0: 0, count - 1: count - 1}
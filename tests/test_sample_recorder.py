@@ -0,0 +1,59 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from modules.sample_recorder import RecordFile, RecordReader, SampleRecorder, read_header
+
+
+def test_round_trip_and_time_index(tmp_path):
+    path = str(tmp_path / "plc.etr")
+    rf = RecordFile(path, 3, "HR 0+3 #1", chunk_size=4, flush_interval=1e9)
+    for k in range(10): rf.append(100.0 + k, [k, 65535 - k, 7])
+    rf.close()
+    rd = RecordReader(path)
+    assert (rd.width, rd.bits, rd.name) == (3, False, "HR 0+3 #1")
+    assert len(rd) == 10 and [c[1] for c in rd.index] == [4, 4, 2]
+    assert rd.time_span == (100.0, 109.0)
+    ts, vals, w = rd.read_range(103.0, 105.5)  # 청크 경계에 걸친 구간
+    assert list(ts) == [103.0, 104.0, 105.0] and w == 3
+    assert list(vals) == [3, 65532, 7, 4, 65531, 7, 5, 65530, 7]
+    assert list(rd.rows(108.5)) == [(109.0, [9, 65526, 7])]
+
+
+def test_truncated_chunk_is_ignored_and_overwritten(tmp_path):
+    path = str(tmp_path / "plc.etr")
+    rf = RecordFile(path, 2, chunk_size=2)
+    for k in range(4): rf.append(float(k), [k, k])
+    rf.close()
+    size = os.path.getsize(path)
+    with open(path, "ab") as f: f.write(b"CHNK\x05\0\0\0garbage")  # 기록 중 끊긴 청크
+    assert len(RecordReader(path)) == 4
+    rf = RecordFile(path, 2, chunk_size=2)  # 이어서 기록
+    assert os.path.getsize(path) == size
+    rf.append(4.0, [4, 4]); rf.close()
+    assert list(RecordReader(path).read_range()[0]) == [0.0, 1.0, 2.0, 3.0, 4.0]
+    with pytest.raises(ValueError):
+        RecordFile(path, 3)
+
+
+def test_bit_flag_and_bad_width(tmp_path):
+    path = str(tmp_path / "co.etr")
+    rf = RecordFile(path, 2, "코일", bits=True)
+    with pytest.raises(ValueError):
+        rf.append(0.0, [True])
+    rf.append(0.0, [True, False]); rf.close()
+    assert read_header(path) == (2, True, "코일")
+
+
+def test_groups_with_colliding_names_get_separate_files(tmp_path):
+    rec = SampleRecorder(str(tmp_path / "plc.etr"), multi=True)
+    groups = [SimpleNamespace(name=n) for n in ("HR 태그 2개 #1", "HR 태그 맵 2개 #1", "HR 0+10 #1", "HR 0+10 #1")]
+    for g in groups: rec.record(g, [1, 2], 0.0)
+    for g in groups: rec.record(g, [3, 4], 1.0)
+    paths = [rec.files[id(g)].path for g in groups]
+    assert [os.path.basename(p) for p in paths] == [
+        "plc_HR_태그_2개_1.etr", "plc_HR_태그_맵_2개_1.etr", "plc_HR_0+10_1.etr", "plc_HR_0+10_1_2.etr"]
+    assert rec.samples == 8
+    rec.close()
+    for p in paths: assert list(RecordReader(p).read_range()[1]) == [1, 2, 3, 4]
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+from modules.scan_state import ScanStateStore
+
+
+def host(ip, mac="00:11:22:33:44:55"):
+    return SimpleNamespace(ip=ip, mac=mac, latency=1.0, hostname="", ports=[], port_states={})
+
+
+def delta_scan(st, targets, alive=()):
+    """ 증분 스캔 한 번: 검사한 주소 목록 반환 """
+    st.begin_scan(False)
+    probed = list(st.delta_targets(targets, lambda ip: True))
+    st.record_alive([host(ip) for ip in probed if ip in alive])
+    for ip in probed:
+        if ip not in alive: st.record_dead(ip)
+    return probed
+
+
+def test_never_alive_addresses_are_kept_compact(tmp_path):
+    st = ScanStateStore(path=str(tmp_path / "state.json"))
+    st.begin_scan(False)
+    for i in range(256): st.record_dead(f"10.0.0.{i}")
+    assert st.hosts == {}
+    assert list(st.dead) == ["10.0.0"] and set(st.dead["10.0.0"]) == {1}
+
+
+def test_delta_rescan_skips_most_of_a_dead_range(tmp_path):
+    path = str(tmp_path / "state.json")
+    targets = [f"10.0.{i >> 8}.{i & 255}" for i in range(4096)]  # /20, 두 대만 응답
+    alive = {"10.0.3.7", "10.0.9.200"}
+    st = ScanStateStore(path=path, backoff_after=1)
+    assert len(delta_scan(st, targets, alive)) == 4096
+    st.save()
+    st = ScanStateStore(path=path, backoff_after=1).load()  # 다음 실행
+    probed = delta_scan(st, targets, alive)
+    assert probed[:2] == ["10.0.3.7", "10.0.9.200"]  # 살아있던 호스트 먼저
+    assert len(probed) < 4096 // 2 + 2 and st.skipped > 2000
+    for _ in range(30): probed = delta_scan(st, targets, alive)
+    assert len(probed) <= 4096 // 16 + 2  # 최대 간격(2^4)에 이르면 1/16만 검사
+    seen = set()
+    for _ in range(16): seen.update(delta_scan(st, targets, alive))
+    assert len(seen) == 4096  # 간격 안에서 모든 주소가 한 번은 검사됨
+
+
+def test_dead_address_that_answers_is_cleared(tmp_path):
+    st = ScanStateStore(path=str(tmp_path / "state.json"), backoff_after=1)
+    for _ in range(3): delta_scan(st, ["10.0.0.1", "10.0.0.2"])
+    assert st.dead["10.0.0"][1] > 0
+    while "10.0.0.2" not in delta_scan(st, ["10.0.0.2"], alive={"10.0.0.2"}): pass
+    assert st.dead["10.0.0"][2] == 0 and st.hosts["10.0.0.2"]["dead_streak"] == 0
+    st.dead["10.0.0"][1] = 0
+    st.record_alive([host("10.0.0.1")])
+    assert "10.0.0" not in st.dead
+
+
+def test_dead_streak_backs_off_then_forgets(tmp_path):
+    st = ScanStateStore(path=str(tmp_path / "state.json"), backoff_after=2, forget_after=4)
+    st.begin_scan(False)
+    st.record_alive([host("10.0.0.1")])
+    for n in range(1, 4):
+        st.begin_scan(False)
+        st.record_dead("10.0.0.1")
+        assert st.hosts["10.0.0.1"]["dead_streak"] == n
+    assert not st.should_probe("10.0.0.1")  # 백오프 중
+    st.begin_scan(False)
+    st.record_dead("10.0.0.1")
+    assert "10.0.0.1" not in st.hosts
+    assert st.dead["10.0.0"][1] == 4  # 삭제한 뒤에도 백오프 유지
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "state.json")
+    st = ScanStateStore(path=path)
+    st.begin_scan(False)
+    st.record_alive([host("10.0.0.9")])
+    st.save()
+    loaded = ScanStateStore(path=path).load()
+    assert loaded.scan_no == 1 and loaded.hosts["10.0.0.9"]["dead_streak"] == 0
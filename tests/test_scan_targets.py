@@ -0,0 +1,57 @@
+import ipaddress
+
+import pytest
+
+from modules.scan_targets import TargetSpec
+
+
+def int_ip(ip):
+    return int(ipaddress.IPv4Address(ip))
+
+
+def ips(spec):
+    return [ip for ip in TargetSpec.parse(spec)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("10.0.0.0/30", ["10.0.0.1", "10.0.0.2"]),         # 네트워크/브로드캐스트 제외
+    ("10.0.0.4/31", ["10.0.0.4", "10.0.0.5"]),         # /31은 두 주소 모두 (RFC 3021)
+    ("10.0.0.7/32", ["10.0.0.7"]),
+    ("10.0.0.9/24", None),                             # strict=False: 호스트 비트 무시
+    ("10.0.0.5-3", ["10.0.0.3", "10.0.0.4", "10.0.0.5"]),
+    ("10.0.0.254-10.0.1.1", ["10.0.0.254", "10.0.0.255", "10.0.1.0", "10.0.1.1"]),
+    ("10.0.0.1, 10.0.0.1; 10.0.0.2", ["10.0.0.1", "10.0.0.2"]),  # 중복/인접 합침
+])
+def test_parse(text, expected):
+    got = ips(text)
+    if expected is None: assert len(got) == 254 and got[0] == "10.0.0.1"
+    else: assert got == expected
+
+
+def test_overlapping_excludes():
+    spec = TargetSpec.parse("10.0.0.0/24 !10.0.0.10-20 !10.0.0.15-30 !10.0.0.30 !10.0.0.200-10.0.1.50 !10.0.0.1")
+    assert spec.intervals == [(int_ip("10.0.0.2"), int_ip("10.0.0.9")), (int_ip("10.0.0.31"), int_ip("10.0.0.199"))]
+    assert len(spec) == 8 + 169
+    assert "10.0.0.9" in spec and "10.0.0.10" not in spec and "10.0.0.30" not in spec and "10.0.0.31" in spec
+    assert "10.0.0.0" not in spec and "9.255.255.255" not in spec and "10.0.0.200" not in spec
+
+
+def test_exclude_cidr_is_whole_network():
+    # 제외 항목의 /31, /30은 네트워크/브로드캐스트 주소까지 모두 제외
+    assert ips("10.0.0.0/29 !10.0.0.0/30") == ["10.0.0.4", "10.0.0.5", "10.0.0.6"]
+    assert ips("10.0.0.1-6 !10.0.0.2/31 !10.0.0.6/32") == ["10.0.0.1", "10.0.0.4", "10.0.0.5"]
+
+
+def test_exclude_everything_and_errors():
+    spec = TargetSpec.parse("10.0.0.1-5 !10.0.0.0/29")
+    assert len(spec) == 0 and list(spec) == [] and "10.0.0.1" not in spec
+    with pytest.raises(ValueError):
+        TargetSpec.parse("!10.0.0.1")
+    with pytest.raises(ValueError):
+        TargetSpec.parse("10.0.0.300")
+
+
+def test_large_ranges_stay_compact():
+    spec = TargetSpec.parse("10.0.0.0/8 !10.128.0.0/9")
+    assert len(spec) == 2 ** 23 - 1 and len(spec.intervals) == 1
+    assert "10.127.255.255" in spec and "10.128.0.0" not in spec
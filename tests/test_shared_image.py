@@ -0,0 +1,89 @@
+import os
+import struct
+
+import pytest
+
+from modules import shared_image
+from modules.shared_image import ENTRY, HEADER, SharedImage
+from modules.slave_datastore import parse_memory_map
+
+LAYOUT = "1: hr 0-9 5-19 100-102 co 0-11; 3: ir 7 di 0-7"
+
+
+@pytest.fixture(params=["file", "shm"])
+def name(request, tmp_path):
+    if request.param == "file": return str(tmp_path / "regs.img")
+    if shared_image.shared_memory is None: pytest.skip("multiprocessing.shared_memory 없음")
+    return f"etshm_test_{os.getpid()}"
+
+
+def test_create_and_attach_share_memory(name):
+    owner = SharedImage.create(parse_memory_map(LAYOUT), name)
+    other = SharedImage.attach(name)  # 두 번째 핸들 (다른 프로세스에서 붙는 경우와 같음)
+    try:
+        assert other.layout == owner.layout == {1: {"hr": [(0, 20), (100, 3)], "co": [(0, 12)]},
+                                                3: {"ir": [(7, 1)], "di": [(0, 8)]}}
+        a, b = owner.datastore(), other.datastore()
+        assert a.get(1, "hr", 0, 20) == [0] * 20  # 새 이미지는 0
+        a.set(1, "hr", 18, [0x1234, 0xBEEF])
+        a.set(1, "co", 9, [True, False, True])
+        b.set(1, "hr", 101, [7])
+        b.set(3, "ir", 7, [65535])
+        assert b.get(1, "hr", 18, 2) == [0x1234, 0xBEEF] and b.get(1, "co", 8, 4) == [False, True, False, True]
+        assert a.get(1, "hr", 100, 3) == [0, 7, 0] and a.get(3, "ir", 7) == [65535]
+    finally:
+        other.close()
+        owner.close()
+
+
+def test_binary_layout(name):
+    img = SharedImage.create(parse_memory_map(LAYOUT), name)
+    try:
+        ds = img.datastore()
+        ds.set(1, "hr", 1, [0x0102])
+        ds.set(1, "co", 0, [True] + [False] * 8 + [True])
+        magic, version, n, data_size = HEADER.unpack_from(img.buf, 0)
+        assert (magic, version, n) == (b"ETSHM01\0", 1, 5)
+        rows = [ENTRY.unpack_from(img.buf, HEADER.size + i * ENTRY.size) for i in range(n)]
+        assert [r[:4] for r in rows] == [(1, 0, 0, 20), (1, 0, 100, 3), (1, 2, 0, 12), (3, 1, 7, 1), (3, 3, 0, 8)]
+        assert all(r[4] % 8 == 0 for r in rows)  # 8바이트 정렬
+        hr = rows[0][4]
+        assert struct.unpack_from("<2H", img.buf, hr) == (0, 0x0102)  # 리틀 엔디안 u16
+        co = rows[2][4]
+        assert bytes(img.buf[co:co + 2]) == bytes((0b00000001, 0b00000010))  # 주소 k -> 바이트 k//8, 비트 k%8
+        assert HEADER.size + n * ENTRY.size + data_size <= len(img.buf)  # 공유 메모리는 페이지 단위로 커질 수 있음
+    finally:
+        img.close()
+
+
+def test_create_replaces_leftover_image(name):
+    old = SharedImage.create(parse_memory_map("1: hr 0-3"), name)
+    old.datastore().set(1, "hr", 0, [9])
+    old.owner = False  # 지우지 않고 닫아 이전 실행이 남긴 이미지처럼 둠
+    old.close()
+    new = SharedImage.create(parse_memory_map("1: hr 0-7"), name)
+    other = SharedImage.attach(name)
+    try:
+        assert other.layout == {1: {"hr": [(0, 8)]}}
+        assert other.datastore().get(1, "hr", 0, 8) == [0] * 8
+    finally:
+        other.close()
+        new.close()
+
+
+@pytest.mark.parametrize("data", [b"x" * 64, b"ETSHM", b""])
+def test_attach_rejects_other_files(tmp_path, data):
+    path = tmp_path / "other.img"
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        SharedImage.attach(str(path))
+
+
+def test_view_size_check(tmp_path):
+    img = SharedImage.create(parse_memory_map("1: hr 0-9"), str(tmp_path / "regs.img"))
+    try:
+        assert len(img.view(1, "hr", 0, 10)) == 10
+        with pytest.raises(ValueError):
+            img.view(1, "hr", 0, 11)
+    finally:
+        img.close()
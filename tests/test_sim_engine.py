@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+from modules import sim_engine
+from modules.sample_recorder import RecordFile
+from modules.sim_engine import SimEngine, parse_rules
+from modules.slave_datastore import SlaveDatastore
+
+
+@pytest.fixture(params=["numpy", "python"])
+def engine(request, monkeypatch):
+    """ engine(규칙 문자열, 초기 값) -> (SimEngine, SlaveDatastore). numpy / 순수 파이썬 경로 모두 """
+    if request.param == "numpy" and sim_engine.np is None: pytest.skip("numpy 없음")
+    if request.param == "python": monkeypatch.setattr(sim_engine, "np", None)
+
+    def make(rules, init=None, memory="1: hr 0-99 co 0-15"):
+        ds = SlaveDatastore.parse(memory)
+        for (key, addr), values in (init or {}).items(): ds.set(1, key, addr, values)
+        return SimEngine(ds, parse_rules(rules)), ds
+    return make
+
+
+def test_parse_rules_errors():
+    assert [repr(r) for r in parse_rules("1 hr 0-9 sine; ; 1 co 3 step period=1")] == ["1 hr 0-9 sine", "1 co 3-3 step"]
+    for bad in ("1 hr 0-9", "1 xx 0-9 sine", "1 hr 0-9 noise", "1 hr 0-9 sine amp", "1 hr 0-9 sine foo=1",
+                "1 hr 0-9 step period=0", "1 hr 0-9 replay"):
+        with pytest.raises(ValueError):
+            parse_rules(bad)
+
+
+def test_rule_outside_memory_map(engine):
+    with pytest.raises(ValueError):
+        engine("1 hr 95-104 sine")
+    with pytest.raises(ValueError):
+        engine("2 hr 0 sine")
+
+
+def test_ramp_wraps_within_min_max(engine):
+    eng, ds = engine("1 hr 0-3 ramp step=3 min=10 max=20", {("hr", 0): [10, 18, 19, 20]})
+    eng.tick(0)
+    assert ds.get(1, "hr", 0, 4) == [13, 10, 11, 12]
+    for _ in range(10): eng.tick(0)
+    assert ds.get(1, "hr", 0, 4) == [10, 18, 19, 20]  # 11틱(3*11 = 33 = 3바퀴)이면 제자리
+
+
+def test_ramp_default_range_wraps_to_zero(engine):
+    eng, ds = engine("1 hr 0-1 ramp; 1 co 0-1 ramp", {("hr", 0): [65533, 65534], ("co", 0): [False, True]})
+    eng.tick(0)
+    assert ds.get(1, "hr", 0, 2) == [65534, 0]
+    assert ds.get(1, "co", 0, 2) == [True, False]
+
+
+def test_step_sine_and_walk_stay_in_range(engine):
+    eng, ds = engine("1 hr 0-4 sine amp=1000 offset=0 period=4; 1 hr 10-11 step lo=5 hi=7 period=2; "
+                     "1 hr 20-29 walk step=50 min=100 max=200; 1 co 0-7 step period=2",
+                     {("hr", 20): [150] * 10})
+    eng.tick(0)
+    assert ds.get(1, "hr", 0, 5) == [0, 951, 588, 0, 0]  # 음수는 0으로 제한
+    assert ds.get(1, "hr", 10, 2) == [7, 7] and ds.get(1, "co", 0, 8) == [True] * 8
+    eng.tick(1.5)
+    assert ds.get(1, "hr", 10, 2) == [5, 5] and ds.get(1, "co", 0, 8) == [False] * 8
+    for t in range(50): eng.tick(t)
+    assert all(100 <= v <= 200 for v in ds.get(1, "hr", 20, 10))
+
+
+def test_replay_csv_with_fewer_columns(engine, tmp_path):
+    path = tmp_path / "log.csv"
+    path.write_text("time,a,b\n100.0,1,2\n101.0,3,4\n102.5,5\n", encoding="utf-8")
+    eng, ds = engine(f"1 hr 0-4 replay file={path}", {("hr", 0): [9] * 5})
+    for t, expected in ((0.0, [1, 2]), (1.2, [3, 4]), (2.5, [5, 4]), (3.0, [1, 2])):  # 끝나면 처음부터
+        eng.tick(t)
+        assert ds.get(1, "hr", 0, 5) == expected + [9] * 3  # 열이 없는 레지스터는 그대로
+    eng, ds = engine(f"1 hr 0 replay file={path} speed=2")  # 규칙이 열보다 좁으면 앞 열만
+    eng.tick(0.6)
+    assert ds.get(1, "hr", 0, 2) == [3, 0]
+
+
+def test_replay_recorded_file(engine, tmp_path):
+    path = str(tmp_path / "log.etr")
+    rf = RecordFile(path, 2)
+    for k in range(3): rf.append(1000.0 + k, [k, 100 + k])
+    rf.close()
+    eng, ds = engine(f"1 hr 50-53 replay file={path}")
+    eng.tick(1.0)
+    assert ds.get(1, "hr", 50, 4) == [1, 101, 0, 0]
+
+
+def test_engine_thread_ticks_and_stops(engine):
+    eng, ds = engine("1 hr 0 ramp")
+    eng.interval = 0.01
+    eng.start()
+    time.sleep(0.1)
+    eng.stop()
+    assert not eng.is_running and eng.error is None
+    assert eng.ticks >= 3 and ds.get(1, "hr", 0) == [eng.ticks]
@@ -0,0 +1,43 @@
+from array import array
+
+import pytest
+
+from modules.slave_datastore import SlaveDatastore, parse_memory_map
+
+
+def test_parse_memory_map():
+    layout = parse_memory_map("1-2: hr 0-9 100 co 0-7; 10: ir 5-1")
+    assert layout == {1: {"hr": [(0, 10), (100, 1)], "co": [(0, 8)]},
+                      2: {"hr": [(0, 10), (100, 1)], "co": [(0, 8)]},
+                      10: {"ir": [(1, 5)]}}
+    for bad in ("", "1 hr 0-9", "1: 0-9", "300: hr 0", "1: hr 0-70000"):
+        with pytest.raises(ValueError):
+            parse_memory_map(bad)
+
+
+def test_sparse_areas_get_set():
+    ds = SlaveDatastore.parse("1: hr 0-9 5-19 100-104 co 0-12")
+    hr = ds.area(1, "hr")
+    assert hr.spans == [(0, 20), (100, 5)]  # 겹치는 구간은 합침
+    assert hr.find(18, 2) == 0 and hr.find(18, 3) is None and hr.find(50) is None
+    ds.set(1, "hr", 100, [1, 70000, -1])
+    assert ds.get(1, "hr", 100, 4) == [1, 70000 & 0xFFFF, 0xFFFF, 0]
+    ds.set(1, "co", 7, [True, True, False, True])
+    assert ds.get(1, "co", 6, 5) == [False, True, True, False, True]
+    with pytest.raises(IndexError):
+        ds.get(1, "hr", 19, 2)
+    assert ds.area(2, "hr") is None
+
+
+def test_dirty_blocks_track_writes():
+    ds = SlaveDatastore.parse("1: hr 0-9999")
+    hr = ds.area(1, "hr")
+    assert hr.version == 0 and not hr.take_dirty(0, 10000)
+    ds.set(1, "hr", 5000, [1])
+    assert hr.version == 1
+    assert not hr.take_dirty(0, 64)
+    assert hr.take_dirty(4990, 20)
+    assert not hr.take_dirty(4990, 20)  # 확인한 블록은 지워짐
+    hr.write(100, array("H", [7] * 200))  # 64주소 블록 1~4
+    assert [hr.take_dirty(a, 1) for a in (63, 64, 128, 299, 320)] == [False, True, True, True, False]
+    assert ds.get(1, "hr", 299, 2) == [7, 0]
@@ -0,0 +1,73 @@
+import struct
+
+import pytest
+
+from modules import tag_decoder
+from modules.tag_decoder import Tag, TagMap
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "python": monkeypatch.setattr(tag_decoder, "np", None)
+    elif tag_decoder.np is None: pytest.skip("numpy 없음")
+    return request.param
+
+
+def registers(code, value, order):
+    """ 값을 지정한 바이트 순서의 레지스터 목록으로 (장치가 보내는 형태) """
+    data = struct.pack(">" + code, value)
+    words = [data[i:i + 2] for i in range(0, len(data), 2)]
+    if order in ("CDAB", "DCBA"): words.reverse()
+    if order in ("BADC", "DCBA"): words = [w[::-1] for w in words]
+    return [int.from_bytes(w, "big") for w in words]
+
+
+@pytest.mark.parametrize("order", tag_decoder.ORDERS)
+@pytest.mark.parametrize("dtype, code, value", [
+    ("int16", "h", -1234), ("uint16", "H", 0xBEEF),
+    ("int32", "i", -123456789), ("uint32", "I", 0xDEADBEEF),
+    ("int64", "q", -(1 << 40) - 5), ("uint64", "Q", 0x0123456789ABCDEF),
+    ("float32", "f", 1.5), ("float64", "d", -2.25e10),
+])
+def test_numeric_types_in_every_order(backend, order, dtype, code, value):
+    tm = TagMap([Tag("v", 100, dtype, order)])
+    assert tm.addresses == list(range(100, 100 + struct.calcsize(code) // 2))
+    assert tm.decode(registers(code, value, order)) == {"v": value}
+
+
+def test_mixed_tags_decode_from_one_block(backend):
+    tm = TagMap([
+        Tag("temp", 10, "float32", "CDAB", 1),
+        Tag("status", 12, "bit:3"),
+        Tag("mode", 12, "bit:8:4"),
+        Tag("count", 20, "bcd16"),
+        Tag("total", 21, "bcd32"),
+        Tag("model", 30, "ascii:3"),
+        Tag("level", 40, "int16", "ABCD", "0.1"),
+    ])
+    assert tm.addresses == [10, 11, 12, 20, 21, 22, 30, 31, 32, 40]
+    values = registers("f", 21.5, "CDAB") + [0x0A08, 0x1234, 0x0012, 0x3456] \
+        + [0x4142, 0x4344, 0x0000] + [250]
+    decoded = tm.decode(values)
+    assert decoded == {"temp": 21.5, "status": True, "mode": 0xA, "count": 1234, "total": 123456,
+                       "model": "ABCD", "level": pytest.approx(25.0)}
+    assert tm.touching(decoded, {12}) == {"status": True, "mode": 0xA}
+
+
+def test_invalid_bcd_decodes_to_none(backend):
+    assert TagMap([Tag("c", 0, "bcd16")]).decode([0x12AF]) == {"c": None}
+
+
+def test_tag_validation():
+    with pytest.raises(ValueError): Tag("x", 0, "int24")
+    with pytest.raises(ValueError): Tag("x", 0, "int16", "ACBD")
+    with pytest.raises(ValueError): Tag("x", 0, "bit:14:4")
+
+
+def test_load_csv(tmp_path):
+    path = tmp_path / "tags.csv"
+    path.write_text("name,address,type,order,scale\n# 주석\nTemp,100,float32,CDAB\nStatus,110,bit:3\nFlow,111,uint16,,\n",
+                    encoding="utf-8")
+    tm = TagMap.load(str(path))
+    assert [t.name for t in tm.tags] == ["Temp", "Status", "Flow"]
+    assert tm.tags[2].scale == 1.0
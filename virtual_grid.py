@@ -0,0 +1,92 @@
+from tkinter import ttk
+
+
+class VirtualGrid:
+    """
+    가상화 표: 화면에 보이는 줄 수만큼의 Treeview 행(슬롯)만 만들고, 스크롤하면 슬롯 내용을 바꿉니다.
+    fetch(first, n)는 first번째부터 n개 행의 값 튜플 목록을 돌려줘야 합니다.
+    refresh()는 보이는 행만 다시 읽어 이전에 표시한 값과 다른 칸만 갱신하므로
+    전체 행 수와 관계없이 비용이 화면 크기에 비례합니다.
+    """
+    def __init__(self, master, columns, headings, widths, fetch, height=10):
+        self.fetch = fetch
+        self.row_count = 0
+        self.offset = 0      # 첫 슬롯에 표시하는 행 번호
+        self.visible = height
+        self.shown = []      # 슬롯별 표시 중인 값
+        self.frame = ttk.Frame(master)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings", height=height)
+        for col, text, width in zip(columns, headings, widths):
+            self.tree.heading(col, text=text)
+            self.tree.column(col, width=width, anchor="center")
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.yview)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.bind("<Configure>", self.on_resize)
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(seq, self.on_wheel)
+
+    def pack(self, **kw):
+        self.frame.pack(**kw)
+
+    def bind(self, seq, func):
+        self.tree.bind(seq, func)
+
+    def set_rows(self, row_count, keep_offset=False):
+        """ 전체 행 수 설정 (keep_offset이 아니면 처음으로 스크롤) """
+        self.row_count = row_count
+        self.offset = max(0, min(self.offset, row_count - self.visible)) if keep_offset else 0
+        self.refresh(force=not keep_offset)
+
+    def row_index(self, y):
+        """ 화면 y 좌표 -> 전체 행 번호 (행이 없으면 None) """
+        item = self.tree.identify_row(y)
+        return self.offset + int(item) if item else None
+
+    def refresh(self, force=False):
+        """ 보이는 행을 다시 읽고 바뀐 슬롯만 갱신 """
+        n = max(0, min(self.visible, self.row_count - self.offset))
+        if len(self.shown) != n:
+            for i in range(n, len(self.shown)): self.tree.delete(str(i))
+            for i in range(len(self.shown), n): self.tree.insert("", "end", iid=str(i), values=())
+            self.shown = (self.shown + [None] * n)[:n]
+        rows = self.fetch(self.offset, n) if n else []
+        for i, row in enumerate(rows):
+            row = tuple(row)
+            if force or self.shown[i] != row:
+                self.tree.item(str(i), values=row)
+                self.shown[i] = row
+        self.update_scrollbar()
+
+    def update_scrollbar(self):
+        if self.row_count <= 0: self.scrollbar.set(0, 1)
+        else: self.scrollbar.set(self.offset / self.row_count, min(1.0, (self.offset + self.visible) / self.row_count))
+
+    def scroll_to(self, offset):
+        offset = max(0, min(int(offset), self.row_count - self.visible))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def yview(self, *args):
+        """ 스크롤바 명령 ("moveto", f) / ("scroll", n, "units"|"pages") """
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * self.row_count)
+        elif args[0] == "scroll":
+            step = self.visible if args[2] == "pages" else 1
+            self.scroll_to(self.offset + int(args[1]) * step)
+
+    def on_wheel(self, event):
+        if event.num == 4 or event.delta > 0: self.scroll_to(self.offset - 3)
+        else: self.scroll_to(self.offset + 3)
+        return "break"
+
+    def on_resize(self, event):
+        # 첫 슬롯 위치로 머리글/행 높이를 재서 창 높이에 들어가는 줄 수로 슬롯 수 조정
+        bbox = self.tree.bbox("0") if self.shown else None
+        header, rowheight = (bbox[1], bbox[3]) if bbox else (25, 20)
+        visible = max(1, (event.height - header) // max(1, rowheight))
+        if visible != self.visible:
+            self.visible = visible
+            self.offset = max(0, min(self.offset, self.row_count - visible))
+            self.refresh()